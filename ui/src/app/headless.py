@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+import argparse
+import signal
+import sys
+from pathlib import Path
+
+SRC_DIR = Path(__file__).resolve().parents[1]
+if str(SRC_DIR) not in sys.path:
+    sys.path.insert(0, str(SRC_DIR))
+
+# QtCore, QtNetwork and QtWebSockets only: no QtGui, QtQml or QtQuick libraries are loaded.
+from PySide6.QtCore import QCoreApplication, QTimer
+
+from config.settings import load_settings
+from core.app_controller import AppController
+from core.logging_setup import configure_logging_from_settings, get_logger, shutdown_logging
+from core.radio_info import Rig
+from core.state import AppState
+from core.tracing import tracer
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Run the antenna switch controller without a UI.")
+    parser.add_argument("--config", type=Path, default=Path("config.json"), help="settings file (default: config.json)")
+    args = parser.parse_args(argv)
+
+    settings = load_settings(args.config)
+    configure_logging_from_settings(settings)
+    if settings.trace_file:
+        tracer.start(settings.trace_file, settings.trace_max_events)
+    logger = get_logger("Headless")
+
+    app = QCoreApplication(sys.argv[:1])
+    controller = AppController(settings=settings, state=AppState())
+    enabled = [rig.value for rig in Rig if controller.auto_switch.is_enabled(rig)]
+    if enabled:
+        logger.info("Auto switching enabled for rig(s) %s", ", ".join(enabled))
+    else:
+        logger.warning("autoSwitch.enabledRigs is empty; no antenna will be switched")
+
+    # Qt's event loop does not return to Python on its own, so wake it up
+    # regularly to let SIGINT/SIGTERM handlers run.
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(signum, lambda *_: app.quit())
+    wakeup = QTimer()
+    wakeup.timeout.connect(lambda: None)
+    wakeup.start(250)
+
+    controller.start()
+    exit_code = app.exec()
+    controller.stop()
+    logger.info("Stopped")
+    tracer.stop()
+    shutdown_logging()
+    return exit_code
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,5 +1,9 @@
 from __future__ import annotations
 
+import time
+
+_PROCESS_START = time.perf_counter()
+
 import os
 import sys
 from pathlib import Path
@@ -8,13 +12,18 @@ SRC_DIR = Path(__file__).resolve().parents[1]
 if str(SRC_DIR) not in sys.path:
     sys.path.insert(0, str(SRC_DIR))
 
+from PySide6.QtCore import Qt
 from PySide6.QtGui import QGuiApplication, QIcon
+from PySide6.QtQuick import QQuickWindow
 from PySide6.QtQuickControls2 import QQuickStyle
 
 from config.settings import load_settings
-from core.logging_setup import configure_logging
+from core.logging_setup import configure_logging_from_settings, get_logger, shutdown_logging
 from core.app_controller import AppController
+from core.startup_profile import StartupProfiler
 from core.state import AppState
+from core.tracing import tracer
+from core.worker import ControllerThread
 def _icon_path() -> Path:
     base_dir = Path(getattr(sys, "_MEIPASS", Path(__file__).resolve().parents[2]))
     icon_path = base_dir / "assets" / "app_icon.svg"
@@ -26,10 +35,35 @@ def _icon_path() -> Path:
 from ui.qml_app import create_qml_engine
 
 
+def _flag(argument: str, env_name: str) -> bool:
+    return argument in sys.argv or os.getenv(env_name, "") not in ("", "0")
+
+
+def _stop_controller(controller: AppController, worker: ControllerThread | None) -> None:
+    if worker is not None:
+        worker.stop()
+    else:
+        controller.stop()
+
+
 def main() -> int:
-    settings = load_settings(Path("config.json"))
-    configure_logging(settings.log_level, settings.log_console, settings.log_file)
-    controller = AppController(settings=settings, state=AppState())
+    profiler = StartupProfiler(
+        _flag("--profile-startup", "REMOTE_SWITCH_PROFILE_STARTUP"),
+        start=_PROCESS_START,
+    )
+    profiler.mark("imports")
+    # Frozen bundles always start fast: no git subprocess at runtime.
+    fast_start = bool(getattr(sys, "frozen", False)) or _flag("--fast-start", "REMOTE_SWITCH_FAST_START")
+
+    # Resolved once, so the config watcher keeps working if the cwd changes.
+    config_path = Path("config.json").resolve()
+    settings = load_settings(config_path)
+    configure_logging_from_settings(settings)
+    if settings.trace_file:
+        tracer.start(settings.trace_file, settings.trace_max_events)
+    profiler.mark("settings")
+    controller = AppController(settings=settings, state=AppState(), config_path=config_path)
+    worker = ControllerThread(controller) if settings.app_worker_thread else None
     
     # Set Material style with theme variant before creating the app
     os.environ["QT_QUICK_CONTROLS_STYLE"] = "Material"
@@ -41,15 +75,36 @@ def main() -> int:
     QQuickStyle.setStyle("Material")
     app = QGuiApplication(sys.argv)
     app.setWindowIcon(QIcon(str(_icon_path())))
-    engine = create_qml_engine(controller)
+    profiler.mark("application")
+
+    # Open the WebSocket and bind UDP first so the handshake overlaps QML
+    # loading. On the GUI thread no events are delivered before the bridge is
+    # wired up; on the worker thread the bridge seeds itself from AppState.
+    if worker is not None:
+        worker.start()
+    else:
+        controller.start()
+    profiler.mark("network started")
+
+    engine = create_qml_engine(controller, profiler=profiler, fast_start=fast_start)
     if not engine.rootObjects():
-        controller.stop()
+        _stop_controller(controller, worker)
         return 1
 
-    controller.start()
+    window = engine.rootObjects()[0]
+    if profiler.enabled and isinstance(window, QQuickWindow):
+        logger = get_logger("Startup")
+
+        def _first_frame() -> None:
+            profiler.mark("first frame")
+            profiler.report(logger)
+
+        window.frameSwapped.connect(_first_frame, Qt.ConnectionType.SingleShotConnection)
 
     exit_code = app.exec()
-    controller.stop()
+    _stop_controller(controller, worker)
+    tracer.stop()
+    shutdown_logging()
     return exit_code
 
 
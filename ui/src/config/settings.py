@@ -1,7 +1,8 @@
 from __future__ import annotations
 
 import json
-from dataclasses import dataclass
+import re
+from dataclasses import dataclass, fields
 from pathlib import Path
 from typing import Any, Dict
 
@@ -9,6 +10,9 @@ from typing import Any, Dict
 @dataclass(frozen=True)
 class AppSettings:
     theme: str
+    app_worker_thread: bool
+    app_ui_update_interval_ms: int
+    app_watch_config: bool
     rig_a_name: str
     rig_b_name: str
     antennas: dict[str, str]
@@ -16,23 +20,78 @@ class AppSettings:
     ws_port: int
     ws_auto_reconnect: bool
     ws_reconnect_interval_ms: int
+    ws_reconnect_max_interval_ms: int
+    ws_reconnect_jitter: float
     ws_max_reconnect_attempts: int
     ws_heartbeat_timeout_ms: int
+    ws_ping_interval_ms: int
+    ws_ping_misses: int
+    ws_command_timeout_ms: int
+    ws_command_retries: int
+    ws_offline_buffer_size: int
+    ws_binary_status: bool
+    bridges: list[dict[str, Any]]
     udp_host: str
     udp_port: int
+    udp_coalesce: bool
     log_level: str
     log_file: str | None
     log_console: bool
+    log_async: bool
+    log_max_bytes: int
+    log_rotate_when: str | None
+    log_backup_count: int
+    log_compress: bool
+    log_format: str
+    log_debug_rate_limit: int
     auto_rules: list[dict[str, int | str]]
+    auto_enabled_rigs: list[str]
+    auto_hysteresis_khz: float
+    auto_settle_ms: int
+    auto_max_commands_per_minute: int
+    auto_command_burst: int
+    trace_file: str | None
+    trace_max_events: int
+    metrics_host: str
+    metrics_port: int
+    metrics_ui_interval_ms: int
+    capture_file: str | None
+    telemetry_raw_samples: int
+    telemetry_minute_buckets: int
+    telemetry_quarter_hour_buckets: int
+    journal_directory: str | None
+    journal_segment_records: int
+    journal_max_segments: int
 
 
 DEFAULTS_PATH = Path(__file__).with_name("defaults.json")
+ANTENNA_NAME_KEY = re.compile(r"ant(\d+)Name")
+
+
+def _antenna_names(antennas_cfg: Dict[str, Any]) -> dict[str, str]:
+    """`antNName` entries in antenna order; antennas 0-6 always exist, gaps get their number."""
+    indices = [int(match.group(1)) for key in antennas_cfg if (match := ANTENNA_NAME_KEY.fullmatch(key))]
+    count = max([6, *indices]) + 1
+    names = {"ant0Name": str(antennas_cfg.get("ant0Name", "OFF"))}
+    for index in range(1, count):
+        names[f"ant{index}Name"] = str(antennas_cfg.get(f"ant{index}Name", index))
+    return names
 
 
 def _load_json(path: Path) -> Dict[str, Any]:
     if not path.exists():
         return {}
-    return json.loads(path.read_text(encoding="utf-8"))
+    data = json.loads(path.read_text(encoding="utf-8"))
+    if not isinstance(data, dict):
+        raise ValueError(f"{path.name}: expected an object")
+    return data
+
+
+def _section(merged: Dict[str, Any], name: str) -> Dict[str, Any]:
+    section = merged.get(name, {})
+    if not isinstance(section, dict):
+        raise ValueError(f"{name}: expected an object")
+    return section
 
 
 def load_settings(overrides_path: Path | None = None) -> AppSettings:
@@ -50,37 +109,76 @@ def load_settings(overrides_path: Path | None = None) -> AppSettings:
 
     merged = deep_merge(merged, overrides)
 
-    app_cfg = merged.get("app", {})
-    log_cfg = merged.get("logging", {})
-    ws_cfg = merged.get("wsConnection", {})
-    udp_cfg = merged.get("udpConnection", {})
-    rigs_cfg = merged.get("rigs", {})
-    antennas_cfg = merged.get("antennas", {})
-    auto_cfg = merged.get("autoSwitch", {})
+    app_cfg = _section(merged, "app")
+    log_cfg = _section(merged, "logging")
+    ws_cfg = _section(merged, "wsConnection")
+    udp_cfg = _section(merged, "udpConnection")
+    rigs_cfg = _section(merged, "rigs")
+    antennas_cfg = _section(merged, "antennas")
+    auto_cfg = _section(merged, "autoSwitch")
+    trace_cfg = _section(merged, "tracing")
+    metrics_cfg = _section(merged, "metrics")
+    capture_cfg = _section(merged, "capture")
+    telemetry_cfg = _section(merged, "telemetry")
+    journal_cfg = _section(merged, "journal")
 
     return AppSettings(
         theme=str(app_cfg.get("theme", "light")),
+        app_worker_thread=bool(app_cfg.get("workerThread", False)),
+        app_ui_update_interval_ms=int(app_cfg.get("uiUpdateIntervalMs", 16)),
+        app_watch_config=bool(app_cfg.get("watchConfig", True)),
         rig_a_name=str(rigs_cfg.get("rigAName", "A")),
         rig_b_name=str(rigs_cfg.get("rigBName", "B")),
-        antennas={
-            "ant0Name": str(antennas_cfg.get("ant0Name", "OFF")),
-            "ant1Name": str(antennas_cfg.get("ant1Name", "1")),
-            "ant2Name": str(antennas_cfg.get("ant2Name", "2")),
-            "ant3Name": str(antennas_cfg.get("ant3Name", "3")),
-            "ant4Name": str(antennas_cfg.get("ant4Name", "4")),
-            "ant5Name": str(antennas_cfg.get("ant5Name", "5")),
-            "ant6Name": str(antennas_cfg.get("ant6Name", "6")),
-        },
+        antennas=_antenna_names(antennas_cfg),
         ws_url=str(ws_cfg.get("url", "http://127.0.0.1/")),
         ws_port=int(ws_cfg.get("port", 81)),
         ws_auto_reconnect=bool(ws_cfg.get("autoReconnect", True)),
-        ws_reconnect_interval_ms=int(ws_cfg.get("reconnectIntervalMs", 3000)),
+        ws_reconnect_interval_ms=int(ws_cfg.get("reconnectIntervalMs", 1000)),
+        ws_reconnect_max_interval_ms=int(ws_cfg.get("reconnectMaxIntervalMs", 30000)),
+        ws_reconnect_jitter=float(ws_cfg.get("reconnectJitter", 0.2)),
         ws_max_reconnect_attempts=int(ws_cfg.get("maxReconnectAttempts", 0)),
         ws_heartbeat_timeout_ms=int(ws_cfg.get("heartbeatTimeoutMs", 7000)),
+        ws_ping_interval_ms=int(ws_cfg.get("pingIntervalMs", 250)),
+        ws_ping_misses=int(ws_cfg.get("pingMisses", 3)),
+        ws_command_timeout_ms=int(ws_cfg.get("commandTimeoutMs", 3000)),
+        ws_command_retries=int(ws_cfg.get("commandRetries", 2)),
+        ws_offline_buffer_size=int(ws_cfg.get("offlineBufferSize", 8)),
+        ws_binary_status=bool(ws_cfg.get("binaryStatus", True)),
+        bridges=list(ws_cfg.get("bridges", [])),
         udp_host=str(udp_cfg.get("host", "127.0.0.1")),
         udp_port=int(udp_cfg.get("port", 9000)),
+        udp_coalesce=bool(udp_cfg.get("coalesce", True)),
         log_level=str(log_cfg.get("level", "INFO")),
         log_file=log_cfg.get("file"),
         log_console=bool(log_cfg.get("console", True)),
+        log_async=bool(log_cfg.get("async", True)),
+        log_max_bytes=int(log_cfg.get("maxBytes", 10 * 1024 * 1024)),
+        log_rotate_when=log_cfg.get("rotateWhen") or None,
+        log_backup_count=int(log_cfg.get("backupCount", 5)),
+        log_compress=bool(log_cfg.get("compress", True)),
+        log_format=str(log_cfg.get("format", "text")).lower(),
+        log_debug_rate_limit=int(log_cfg.get("debugRateLimit", 20)),
         auto_rules=list(auto_cfg.get("antennaRules", [])),
+        auto_enabled_rigs=[str(rig).strip().upper() for rig in auto_cfg.get("enabledRigs", [])],
+        auto_hysteresis_khz=float(auto_cfg.get("hysteresisKhz", 0)),
+        auto_settle_ms=int(auto_cfg.get("settleMs", 0)),
+        auto_max_commands_per_minute=int(auto_cfg.get("maxCommandsPerMinute", 0)),
+        auto_command_burst=int(auto_cfg.get("commandBurst", 3)),
+        trace_file=trace_cfg.get("file") or None,
+        trace_max_events=int(trace_cfg.get("maxEvents", 200000)),
+        metrics_host=str(metrics_cfg.get("host", "127.0.0.1")),
+        metrics_port=int(metrics_cfg.get("port", 0)),
+        metrics_ui_interval_ms=int(metrics_cfg.get("uiIntervalMs", 1000)),
+        capture_file=capture_cfg.get("file") or None,
+        telemetry_raw_samples=int(telemetry_cfg.get("rawSamples", 4096)),
+        telemetry_minute_buckets=int(telemetry_cfg.get("minuteBuckets", 2880)),
+        telemetry_quarter_hour_buckets=int(telemetry_cfg.get("quarterHourBuckets", 672)),
+        journal_directory=journal_cfg.get("directory", "logs/journal") or None,
+        journal_segment_records=int(journal_cfg.get("segmentRecords", 262144)),
+        journal_max_segments=int(journal_cfg.get("maxSegments", 64)),
     )
+
+
+def changed_fields(old: AppSettings, new: AppSettings) -> list[str]:
+    """Names of the settings that differ, in declaration order."""
+    return [item.name for item in fields(AppSettings) if getattr(old, item.name) != getattr(new, item.name)]
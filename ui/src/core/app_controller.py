@@ -1,131 +1,545 @@
 from __future__ import annotations
 
+import json
+import math
+import time
 from dataclasses import dataclass
-from typing import Callable, Optional
-from urllib.parse import urlparse, urlunparse
+from functools import partial
+from pathlib import Path
+from typing import Callable
 
-from config.settings import AppSettings
+from config.settings import AppSettings, changed_fields, load_settings
+from core.auto_rules import AntennaRule, RuleError, RuleIndex
+from core.auto_switch import AutoSwitch
+from core.bridges import BridgeConnection, CommandRouter, parse_bridges
+from core.capture import CaptureWriter
+from core.command_pipeline import CommandConfig
+from core.config_watcher import ConfigWatcher
+from core.deadlines import DeadlineScheduler
+from core.events import (
+    BRIDGE_ERROR,
+    BUSY,
+    COMMAND_CONFIRMED,
+    COMMAND_FAILED,
+    COMMAND_SENT,
+    CONFIG_ERROR,
+    PRIORITY_RECORDING,
+    PRIORITY_SWITCHING,
+    RADIO_INFO,
+    SELECTION,
+    SETTINGS,
+    WS_DISCONNECTED,
+    WS_ERROR,
+    WS_MESSAGE,
+    WS_RTT,
+    WS_SEND_FAILED,
+    WS_STATUS,
+    EventBus,
+)
+from core.journal import JournalWriter, SelectionSource
 from core.logging_setup import get_logger
-from core.radio_info import RadioInfo, parse_radio_info
+from core.metrics import MetricsRegistry
+from core.radio_info import RadioInfo, RadioInfoParser, Rig, radio_nr_key
 from core.state import AppState
+from core.status_codec import BINARY_STATUS_PROTOCOL, StatusFrameError, decode_status
+from core.switch_policy import SwitchPolicy, SwitchPolicyConfig
+from core.tracing import tracer
+from core.worker import ThreadDispatcher
+from net.metrics_server import MetricsServer, MetricsServerConfig
 from net.udp_client import UdpClient, UdpConfig
-from net.websocket_client import WebSocketClient, WebSocketConfig
+from net.websocket_client import ConnectionState, WebSocketClient, WebSocketConfig
+
+
+# Read once at startup; a reload that changes them is logged as needing a restart.
+STARTUP_SETTINGS = frozenset(
+    {
+        "theme",
+        "app_worker_thread",
+        "app_ui_update_interval_ms",
+        "app_watch_config",
+        "log_level",
+        "log_file",
+        "log_console",
+        "log_async",
+        "log_max_bytes",
+        "log_rotate_when",
+        "log_backup_count",
+        "log_compress",
+        "log_format",
+        "log_debug_rate_limit",
+        "auto_enabled_rigs",
+        "trace_file",
+        "trace_max_events",
+        "metrics_host",
+        "metrics_port",
+        "metrics_ui_interval_ms",
+        "capture_file",
+        "telemetry_raw_samples",
+        "telemetry_minute_buckets",
+        "telemetry_quarter_hour_buckets",
+        "journal_directory",
+        "journal_segment_records",
+        "journal_max_segments",
+    }
+)
+POLICY_SETTINGS = ("auto_hysteresis_khz", "auto_settle_ms", "auto_max_commands_per_minute", "auto_command_burst")
+UDP_SETTINGS = ("udp_host", "udp_port", "udp_coalesce")
 
 
 @dataclass
 class AppController:
     settings: AppSettings
     state: AppState
+    config_path: Path | None = None  # watched for changes when app.watchConfig is set
 
     def __post_init__(self) -> None:
         self._logger = get_logger(self.__class__.__name__)
-        self._ws_message_listener: Optional[Callable[[str], None]] = None
-        self._ws_error_listener: Optional[Callable[[str], None]] = None
-        self._ws_disconnect_listener: Optional[Callable[[], None]] = None
-        self._ws_send_failed_listener: Optional[Callable[[str], None]] = None
-        self._udp_info_listener: Optional[Callable[[RadioInfo], None]] = None
-        ws_url = _build_ws_url(self.settings.ws_url, self.settings.ws_port)
-        self.ws_client = WebSocketClient(
-            WebSocketConfig(
-                url=ws_url,
-                auto_reconnect=self.settings.ws_auto_reconnect,
-                reconnect_interval_ms=self.settings.ws_reconnect_interval_ms,
-                max_reconnect_attempts=self.settings.ws_max_reconnect_attempts,
-                heartbeat_timeout_ms=self.settings.ws_heartbeat_timeout_ms,
-            )
+        # Everything the controller reports goes out here; see core.events for the topics.
+        self.events = EventBus()
+        self._config_watcher: ConfigWatcher | None = None
+        self._radio_parser = RadioInfoParser()
+        self._capture: CaptureWriter | None = None
+        self._journal: JournalWriter | None = None
+        self._journaled_freq: dict[Rig, tuple[int, str]] = {}
+        self.metrics = MetricsRegistry()
+        self._parse_seconds = self.metrics.histogram(
+            "udp_parse_seconds",
+            "Time to parse one RadioInfo datagram.",
+            (0.00001, 0.00005, 0.0001, 0.0005, 0.001, 0.005),
         )
-        self.ws_client.set_message_handler(self._handle_ws_message)
-        self.ws_client.set_error_handler(self._handle_ws_error)
-        self.ws_client.set_disconnect_handler(self._handle_ws_disconnected)
-        self.ws_client.set_send_failed_handler(self._handle_ws_send_failed)
-        self.udp_client = UdpClient(
-            UdpConfig(host=self.settings.udp_host, port=self.settings.udp_port)
+        self.rules = RuleIndex.compile(self.settings.auto_rules)
+        self.switch_policy = SwitchPolicy(self._switch_policy_config(self.settings))
+        # One timer serves the heartbeat, reconnect and retry deadlines of every bridge.
+        self.scheduler = DeadlineScheduler()
+        # Shared by all pipelines; a reload updates it in place.
+        self._command_config = CommandConfig(
+            timeout_ms=self.settings.ws_command_timeout_ms,
+            max_retries=self.settings.ws_command_retries,
         )
+        round_trip = self.metrics.histogram(
+            "command_round_trip_seconds", "Time from first send to the confirming bridge status."
+        )
+        self.bridges: list[BridgeConnection] = []
+        for spec in parse_bridges(self.settings):
+            bridge = BridgeConnection(
+                spec,
+                self._ws_config(self.settings, spec.url),
+                self._command_config,
+                self.scheduler,
+                round_trip,
+            )
+            bridge.ws_client.set_message_handler(partial(self._handle_ws_message, bridge=bridge))
+            bridge.ws_client.set_binary_message_handler(partial(self._handle_ws_binary_message, bridge=bridge))
+            bridge.ws_client.set_error_handler(partial(self._handle_ws_error, bridge))
+            bridge.ws_client.set_disconnect_handler(partial(self._handle_ws_disconnected, bridge))
+            bridge.ws_client.set_send_failed_handler(partial(self._handle_ws_send_failed, bridge))
+            bridge.ws_client.set_rtt_handler(partial(self._handle_ws_rtt, bridge))
+            bridge.ws_client.set_state_handler(partial(self._handle_ws_state, bridge))
+            self.bridges.append(bridge)
+        self._serving = {rig: [bridge for bridge in self.bridges if rig.value in bridge.spec.rigs] for rig in Rig}
+        self.udp_client = UdpClient(self._udp_config(self.settings))
         self.udp_client.set_message_handler(self._handle_udp_message)
+        self.udp_client.set_coalesce_key(radio_nr_key)
+        self.commands = CommandRouter(self.bridges)
+        self.commands.set_sent_listener(partial(self.events.publish, COMMAND_SENT))
+        self.commands.set_confirmed_listener(partial(self.events.publish, COMMAND_CONFIRMED))
+        self.commands.set_failed_listener(partial(self.events.publish, COMMAND_FAILED))
+        self.commands.set_busy_listener(partial(self.events.publish, BUSY))
+        self.auto_switch = AutoSwitch(self.rules, self.switch_policy, self.commands)
+        self.auto_switch.set_selection_listener(partial(self.events.publish, SELECTION))
+        self.events.subscribe(RADIO_INFO, self.auto_switch.handle_radio_info, PRIORITY_SWITCHING, name="auto switch")
+        # Ahead of auto switching (it only queues a record), so a selection follows the frequency that caused it.
+        self.events.subscribe(RADIO_INFO, self._journal_radio_info, PRIORITY_SWITCHING + 1, name="journal")
+        self.events.subscribe(SELECTION, self._journal_selection, PRIORITY_RECORDING, name="journal")
+        for rig_name in self.settings.auto_enabled_rigs:
+            if rig_name not in (Rig.A.value, Rig.B.value):
+                raise RuleError(f"autoSwitch.enabledRigs: rig must be 'A' or 'B', got {rig_name!r}")
+            self.auto_switch.set_enabled(Rig(rig_name), True)
+        self.metrics_server = MetricsServer(
+            MetricsServerConfig(host=self.settings.metrics_host, port=self.settings.metrics_port),
+            self.metrics.render,
+        )
+        self._register_metrics()
+        # Replaced by ControllerThread when the controller runs on a worker thread.
+        self.dispatcher = ThreadDispatcher()
+
+    @staticmethod
+    def _switch_policy_config(settings: AppSettings) -> SwitchPolicyConfig:
+        return SwitchPolicyConfig(
+            hysteresis_khz=settings.auto_hysteresis_khz,
+            settle_ms=settings.auto_settle_ms,
+            max_commands_per_minute=settings.auto_max_commands_per_minute,
+            command_burst=settings.auto_command_burst,
+        )
+
+    @staticmethod
+    def _ws_config(settings: AppSettings, url: str) -> WebSocketConfig:
+        return WebSocketConfig(
+            url=url,
+            auto_reconnect=settings.ws_auto_reconnect,
+            reconnect_interval_ms=settings.ws_reconnect_interval_ms,
+            reconnect_max_interval_ms=settings.ws_reconnect_max_interval_ms,
+            reconnect_jitter=settings.ws_reconnect_jitter,
+            max_reconnect_attempts=settings.ws_max_reconnect_attempts,
+            heartbeat_timeout_ms=settings.ws_heartbeat_timeout_ms,
+            ping_interval_ms=settings.ws_ping_interval_ms,
+            ping_misses=settings.ws_ping_misses,
+            offline_buffer_size=settings.ws_offline_buffer_size,
+            subprotocols=(BINARY_STATUS_PROTOCOL,) if settings.ws_binary_status else (),
+        )
+
+    @staticmethod
+    def _udp_config(settings: AppSettings) -> UdpConfig:
+        return UdpConfig(host=settings.udp_host, port=settings.udp_port, coalesce=settings.udp_coalesce)
+
+    @property
+    def ws_client(self) -> WebSocketClient:
+        """The first bridge's WebSocket (the only one unless `wsConnection.bridges` is set)."""
+        return self.bridges[0].ws_client
+
+    def _register_metrics(self) -> None:
+        # Existing counters are read at scrape time so the hot paths stay unchanged.
+        udp = self.udp_client
+        clients = [bridge.ws_client for bridge in self.bridges]
+        router = self.commands
+        parser = self._radio_parser
+
+        def ws(attribute: str) -> Callable[[], float]:
+            return lambda: sum(getattr(client, attribute) for client in clients)
+
+        def bridges(attribute: str) -> Callable[[], float]:
+            return lambda: sum(getattr(bridge, attribute) for bridge in self.bridges)
+
+        def commands(attribute: str) -> Callable[[], float]:
+            return lambda: getattr(router.stats, attribute)
+
+        counters = (
+            ("udp_datagrams_received_total", "UDP datagrams read.", lambda: udp.received),
+            ("udp_datagrams_coalesced_total", "Datagrams superseded by a newer one.", lambda: udp.coalesced),
+            ("udp_datagrams_dropped_total", "Non-RadioInfo datagrams dropped before parsing.", lambda: udp.dropped),
+            ("udp_frames_rejected_total", "Datagrams that were not RadioInfo.", lambda: parser.rejected),
+            ("udp_frames_invalid_total", "RadioInfo datagrams that failed to parse.", lambda: parser.invalid),
+            ("ws_messages_received_total", "WebSocket text and binary messages.", ws("messages_received")),
+            ("ws_binary_status_total", "Binary status frames received.", bridges("binary_frames")),
+            ("ws_status_unchanged_total", "Status frames identical to the last one.", bridges("unchanged_frames")),
+            ("ws_reconnects_total", "WebSocket reconnect attempts.", ws("reconnects")),
+            ("ws_heartbeat_timeouts_total", "Heartbeat watchdog timeouts.", ws("heartbeat_timeouts")),
+            ("ws_pings_sent_total", "WebSocket pings sent.", ws("pings_sent")),
+            ("ws_ping_timeouts_total", "Links dropped after unanswered pings.", ws("ping_timeouts")),
+            ("ws_send_failures_total", "Messages not sent while disconnected.", ws("send_failures")),
+            ("ws_buffered_total", "Commands held while disconnected.", ws("buffered")),
+            ("ws_buffer_dropped_total", "Held commands dropped because the buffer was full.", ws("buffer_dropped")),
+            (
+                "ws_disconnected_seconds_total",
+                "Time the bridge WebSockets spent disconnected.",
+                lambda: sum(client.downtime_ms for client in clients) / 1000.0,
+            ),
+            ("commands_sent_total", "Antenna commands sent, retries included.", commands("sent")),
+            ("commands_confirmed_total", "Antenna commands confirmed.", commands("confirmed")),
+            ("commands_retried_total", "Antenna command retries.", commands("retried")),
+            ("commands_failed_total", "Antenna commands given up on.", commands("failed")),
+            ("events_dropped_total", "Events dropped from full subscriber queues.", lambda: self.events.dropped),
+            ("events_subscriber_errors_total", "Exceptions raised by event subscribers.", lambda: self.events.errors),
+        )
+        for name, help_text, read in counters:
+            self.metrics.counter_callback(name, help_text, read)
+        status = self.state.ws_status
+        gauges = (
+            ("ws_connected", "Number of bridge WebSockets connected.", ws("connected")),
+            (
+                "ws_rtt_seconds",
+                "Smoothed ping round trip time to the first bridge.",
+                lambda: clients[0].rtt_ms / 1000.0,
+            ),
+            (
+                "ws_rtt_jitter_seconds",
+                "Mean deviation of the ping round trip time to the first bridge.",
+                lambda: clients[0].rtt_jitter_ms / 1000.0,
+            ),
+            ("bridge_rssi", "Last RSSI reported by the bridge (dBm).", lambda: status.get("rssi", math.nan)),
+            ("bridge_snr", "Last SNR reported by the bridge (dB).", lambda: status.get("snr", math.nan)),
+            ("bridge_lrssi", "Last RSSI reported by the mast unit (dBm).", lambda: status.get("lrssi", math.nan)),
+        )
+        for name, help_text, read in gauges:
+            self.metrics.gauge_callback(name, help_text, read)
 
     def start(self) -> None:
-        try:
-            self.ws_client.connect()
-        except Exception as exc:
-            self._logger.exception("WebSocket connection failed: %s", exc)
+        if self.settings.capture_file:
+            self.start_capture(self.settings.capture_file)
+        if self.settings.journal_directory:
+            try:
+                self._journal = JournalWriter(
+                    self.settings.journal_directory,
+                    self.settings.journal_segment_records,
+                    self.settings.journal_max_segments,
+                )
+            except OSError as exc:
+                self._logger.error("Journal disabled: %s", exc)
+        for bridge in self.bridges:
+            try:
+                bridge.ws_client.connect()
+            except Exception as exc:
+                self._logger.exception("WebSocket connection to %s failed: %s", bridge.name, exc)
 
         try:
             self.udp_client.open()
         except Exception as exc:
             self._logger.exception("UDP connection failed: %s", exc)
 
+        self.metrics_server.open()
+        if self.config_path is not None and self.settings.app_watch_config:
+            self._config_watcher = ConfigWatcher(self.config_path, self.reload_settings)
+
+    def reload_settings(self) -> list[str]:
+        """Re-read `config_path` and apply what changed; a config that fails to load changes nothing."""
+        if self.config_path is None:
+            return []
+        started = time.perf_counter()
+        try:
+            changed = self.apply_settings(load_settings(self.config_path))
+        except (OSError, ValueError, TypeError) as exc:
+            # json.JSONDecodeError, RuleError, BridgeConfigError and a section of the wrong type are ValueErrors.
+            self._logger.error("Config not reloaded: %s", exc)
+            self.events.publish(CONFIG_ERROR, str(exc))
+            return []
+        self._logger.info(
+            "Config reloaded in %.1f ms: %s",
+            (time.perf_counter() - started) * 1000.0,
+            ", ".join(changed) if changed else "no changes",
+        )
+        return changed
+
+    def apply_settings(self, settings: AppSettings) -> list[str]:
+        """Apply the settings that differ from the current ones and return their names.
+
+        Rules, switching policy, command timing and bridge/UDP options are
+        applied in place; connections are only reopened when their endpoint
+        changed. Everything is validated before anything is applied.
+        """
+        changed = changed_fields(self.settings, settings)
+        if not changed:
+            return changed
+        rules = RuleIndex.compile(settings.auto_rules) if "auto_rules" in changed else self.rules
+        specs = parse_bridges(settings)
+        restart = [name for name in changed if name in STARTUP_SETTINGS]
+        same_bridges = [spec.name for spec in specs] == [bridge.name for bridge in self.bridges]
+        if not same_bridges:
+            restart.append("bridges")
+
+        self.settings = settings
+        if rules is not self.rules:
+            self.rules = rules
+            self.auto_switch.set_rules(rules)
+        if any(name in changed for name in POLICY_SETTINGS):
+            self.switch_policy.set_config(self._switch_policy_config(settings))
+        self._command_config.timeout_ms = settings.ws_command_timeout_ms
+        self._command_config.max_retries = settings.ws_command_retries
+        if same_bridges:
+            for bridge, spec in zip(self.bridges, specs):
+                bridge.reconfigure(spec, self._ws_config(settings, spec.url))
+            self.commands.refresh()
+            self._serving = {rig: [bridge for bridge in self.bridges if rig.value in bridge.spec.rigs] for rig in Rig}
+        if any(name in changed for name in UDP_SETTINGS):
+            self.udp_client.reconfigure(self._udp_config(settings))
+        if restart:
+            self._logger.warning("Restart to apply: %s", ", ".join(restart))
+        self.events.publish(SETTINGS, settings)
+        return changed
+
+    def start_capture(self, path: str) -> None:
+        """Record UDP datagrams and WebSocket frames; `path` may contain strftime fields."""
+        self.stop_capture()
+        self._capture = CaptureWriter(time.strftime(path))
+        self.udp_client.set_capture(self._capture)
+        for bridge in self.bridges:
+            bridge.ws_client.set_capture(self._capture)
+        self._logger.info("Capturing traffic to %s", self._capture.path)
+
+    def stop_capture(self) -> None:
+        capture = self._capture
+        if capture is None:
+            return
+        self._capture = None
+        self.udp_client.set_capture(None)
+        for bridge in self.bridges:
+            bridge.ws_client.set_capture(None)
+        capture.close()
+        self._logger.info("Capture %s closed with %d records", capture.path, capture.records)
+
     def stop(self) -> None:
-        self.ws_client.close()
+        if self._config_watcher is not None:
+            self._config_watcher.dispose()
+            self._config_watcher = None
+        for bridge in self.bridges:
+            bridge.ws_client.close()
         self.udp_client.close()
+        self.metrics_server.close()
+        self.stop_capture()
+        if self._journal is not None:
+            # After the sockets, so their closing is journaled as well.
+            self._journal.close()
+            self._logger.info("Journal: %d records, %d dropped", self._journal.written, self._journal.dropped)
+            self._journal = None
+        self.events.close()
+        self.auto_switch.stop()
+        self.commands.stop()
+        stats = self.switch_policy.stats
+        self._logger.info(
+            "Auto-switch: %d rule changes, %d commands, %d switches saved "
+            "(hysteresis %d, settle %d), %d rate limited",
+            stats.rule_changes,
+            stats.commands,
+            stats.saved_actuations,
+            stats.held_by_hysteresis,
+            stats.held_by_settle,
+            stats.rate_limited,
+        )
+        commands = self.commands.stats
+        latencies = sorted(commands.latencies_ms)
+        self._logger.info(
+            "Commands: %d sent, %d confirmed, %d retried, %d failed, %d superseded; median latency %s",
+            commands.sent,
+            commands.confirmed,
+            commands.retried,
+            commands.failed,
+            commands.superseded,
+            f"{latencies[len(latencies) // 2]:.0f} ms" if latencies else "n/a",
+        )
 
-    def send_text(self, text: str) -> None:
+    def dispose(self) -> None:
+        """Stop and drop all Qt objects on the thread that owns them."""
+        self.stop()
+        for bridge in self.bridges:
+            bridge.ws_client.dispose()
+        self.udp_client.dispose()
+        self.metrics_server.dispose()
+        self.scheduler.dispose()
+
+    def send_text(self, text: str) -> bool:
+        """Send raw text to every bridge; True if at least one took it."""
+        sent = False
+        for bridge in self.bridges:
+            sent = bridge.send_text(text) or sent
+        return sent
+
+    def _handle_ws_message(self, message: str, bridge: BridgeConnection | None = None) -> None:
+        bridge = bridge or self.bridges[0]
+        self.state.last_message = message
+        self._logger.debug("WebSocket message received from %s: %s", bridge.name, message)
+        self.events.publish(WS_MESSAGE, message)
+        if message == bridge.last_frame:
+            # The periodic status often repeats the last one byte for byte.
+            bridge.unchanged_frames += 1
+            return
         try:
-            self.ws_client.send(text)
-        except Exception as exc:
-            self._logger.exception("WebSocket send failed: %s", exc)
+            data = json.loads(message)
+        except json.JSONDecodeError as exc:
+            self._logger.warning("Invalid JSON message: %s", exc)
+            return
+        if not isinstance(data, dict):
+            return
+        if "error" in data:
+            # Repeated errors are repeated negative acknowledgements, never skipped.
+            bridge.last_frame = None
+            error = str(data["error"])
+            self.events.publish(BRIDGE_ERROR, error if len(self.bridges) == 1 else f"{bridge.name}: {error}")
+            bridge.commands.handle_error(error)
+            return
+        bridge.last_frame = message
+        self._apply_status(bridge, data)
 
-    def set_ws_message_listener(self, listener: Callable[[str], None]) -> None:
-        self._ws_message_listener = listener
+    def _handle_ws_binary_message(self, payload: bytes, bridge: BridgeConnection | None = None) -> None:
+        """Binary status frame (full or delta, see core.status_codec)."""
+        bridge = bridge or self.bridges[0]
+        bridge.binary_frames += 1
+        if payload == bridge.last_frame:
+            # Also safe for deltas: applying the same changes twice changes nothing.
+            bridge.unchanged_frames += 1
+            return
+        try:
+            data = decode_status(payload)
+        except StatusFrameError as exc:
+            self._logger.warning("Invalid binary status from %s: %s", bridge.name, exc)
+            return
+        bridge.last_frame = payload
+        self._apply_status(bridge, data)
 
-    def set_ws_error_listener(self, listener: Callable[[str], None]) -> None:
-        self._ws_error_listener = listener
+    def _apply_status(self, bridge: BridgeConnection, data: dict) -> None:
+        bridge.status.update(data)
+        # The UI sees one status: antennas in UI numbering, link fields of the first bridge.
+        merged = dict(data) if bridge is self.bridges[0] else {}
+        for rig in Rig:
+            key = rig.value.lower()
+            if key in data:
+                merged[key] = self._status_antenna(rig)
+        self.state.ws_status.update(merged)
+        if merged:
+            self.events.publish(WS_STATUS, merged)
+        with tracer.span("ws status", bridge=bridge.name):
+            bridge.commands.handle_status(str(bridge.status.get("a", "")), str(bridge.status.get("b", "")))
+        if self._journal is not None:
+            self._journal.status(
+                self.bridges.index(bridge), self._status_antenna(Rig.A), self._status_antenna(Rig.B), bridge.status
+            )
 
-    def set_ws_disconnect_listener(self, listener: Callable[[], None]) -> None:
-        self._ws_disconnect_listener = listener
+    def _status_antenna(self, rig: Rig) -> str:
+        # The bridge that has the rig on one of its antennas wins; otherwise "-" only if all say off.
+        result = ""
+        for bridge in self._serving[rig]:
+            value = bridge.to_global(str(bridge.status.get(rig.value.lower(), "")))
+            if value.isdigit():
+                return value
+            if not result or result == "-":
+                result = value
+        return result
 
-    def set_ws_send_failed_listener(self, listener: Callable[[str], None]) -> None:
-        self._ws_send_failed_listener = listener
+    def _handle_ws_error(self, bridge: BridgeConnection, error: str) -> None:
+        self._logger.warning("WebSocket error from %s: %s", bridge.name, error)
+        self.events.publish(WS_ERROR, error if len(self.bridges) == 1 else f"{bridge.name}: {error}")
 
-    def set_udp_info_listener(self, listener: Callable[[RadioInfo], None]) -> None:
-        self._udp_info_listener = listener
+    def _handle_ws_disconnected(self, bridge: BridgeConnection) -> None:
+        bridge.last_frame = None  # deltas are relative to the connection they arrived on
+        bridge.commands.reset("disconnected")
+        self.events.publish(WS_DISCONNECTED)
 
-    def _handle_ws_message(self, message: str) -> None:
-        self.state.last_message = message
-        self._logger.debug("WebSocket message received: %s", message)
-        if self._ws_message_listener:
-            self._ws_message_listener(message)
+    def _handle_ws_state(self, bridge: BridgeConnection, state: ConnectionState) -> None:
+        if self._journal is not None:
+            connected = state == ConnectionState.CONNECTED
+            outage_ms = bridge.ws_client.last_outage_ms if connected else 0.0
+            self._journal.connection(self.bridges.index(bridge), connected, state.value, outage_ms)
 
-    def _handle_ws_error(self, error: str) -> None:
-        self._logger.warning("WebSocket error: %s", error)
-        if self._ws_error_listener:
-            self._ws_error_listener(error)
+    def _journal_selection(self, rig: Rig, antenna: int, rule: AntennaRule | None) -> None:
+        if self._journal is not None:
+            source = SelectionSource.MANUAL if rule is None else SelectionSource.AUTO
+            freq = self._journaled_freq.get(rig, (0, ""))[0]
+            self._journal.selection(rig.value, antenna, source, rule.position if rule else -1, freq)
 
-    def _handle_ws_disconnected(self) -> None:
-        if self._ws_disconnect_listener:
-            self._ws_disconnect_listener()
+    def _handle_ws_send_failed(self, bridge: BridgeConnection, reason: str) -> None:
+        self.events.publish(WS_SEND_FAILED, reason if len(self.bridges) == 1 else f"{bridge.name}: {reason}")
 
-    def _handle_ws_send_failed(self, reason: str) -> None:
-        if self._ws_send_failed_listener:
-            self._ws_send_failed_listener(reason)
+    def _handle_ws_rtt(self, bridge: BridgeConnection, rtt_ms: float, jitter_ms: float) -> None:
+        # Like the link fields, the UI shows the first bridge's round trip.
+        if bridge is self.bridges[0]:
+            self.events.publish(WS_RTT, rtt_ms, jitter_ms)
 
     def _handle_udp_message(self, payload: bytes) -> None:
         try:
-            xml_text = payload.decode("utf-8", errors="ignore")
-            self.state.radio_info = parse_radio_info(xml_text)
-            self._logger.debug("UDP RadioInfo parsed: %s", self.state.radio_info)
-            if self._udp_info_listener:
-                self._udp_info_listener(self.state.radio_info)
+            started = time.perf_counter()
+            with tracer.span("parse"):
+                info = self._radio_parser.parse(payload)
+            self._parse_seconds.observe(time.perf_counter() - started)
+            if info is None:
+                return
+            self.state.radio_info = info
+            self._logger.debug("UDP RadioInfo parsed: %s", info)
         except Exception as exc:
             self._logger.exception("Failed to parse UDP XML: %s", exc)
+            return
+        # Auto switching runs before the UI and anything else subscribed at a lower priority.
+        self.events.publish(RADIO_INFO, info)
 
+    def _journal_radio_info(self, info: RadioInfo) -> None:
+        if self._journal is not None and self._journaled_freq.get(info.radio) != (info.freq, info.mode):
+            self._journaled_freq[info.radio] = (info.freq, info.mode)
+            self._journal.freq(info.radio.value, info.freq, info.mode)
 
-def _build_ws_url(raw_url: str, port: int) -> str:
-    parsed = urlparse(raw_url)
-    scheme = parsed.scheme or "ws"
-    if scheme == "http":
-        scheme = "ws"
-    elif scheme == "https":
-        scheme = "wss"
-
-    hostname = parsed.hostname or raw_url
-    if hostname and ":" in hostname and hostname.startswith("["):
-        hostname = hostname.strip("[]")
-
-    netloc = hostname or "127.0.0.1"
-    if parsed.port is not None:
-        netloc = f"{netloc}:{parsed.port}"
-    else:
-        netloc = f"{netloc}:{port}"
-
-    path = parsed.path or "/"
-    return urlunparse((scheme, netloc, path, "", "", ""))
@@ -0,0 +1,155 @@
+from __future__ import annotations
+
+from bisect import bisect_right
+from dataclasses import dataclass, field
+from typing import Any, Iterable, Mapping, Optional
+
+from core.radio_info import Rig
+
+MAX_ANTENNA = 6
+
+
+class RuleError(ValueError):
+    """Raised when the auto-switch rules in the config cannot be compiled."""
+
+
+@dataclass(frozen=True)
+class AntennaRule:
+    rig: Rig
+    min_freq: int
+    max_freq: int
+    primary: int
+    secondary: int
+    mode: str | None = None
+    station_name: str | None = None
+    position: int = field(default=-1, compare=False)  # index in autoSwitch.antennaRules
+
+    def describe(self) -> str:
+        parts = [f"{self.rig.value} {self.min_freq}-{self.max_freq} kHz"]
+        if self.mode:
+            parts.append(f"mode={self.mode}")
+        if self.station_name:
+            parts.append(f"station={self.station_name}")
+        return " ".join(parts)
+
+
+_Key = tuple[Rig, Optional[str], Optional[str]]
+
+
+@dataclass(frozen=True)
+class _Segments:
+    starts: tuple[int, ...]
+    rules: tuple[AntennaRule, ...]
+
+    def find(self, freq_khz: float) -> AntennaRule | None:
+        pos = bisect_right(self.starts, freq_khz) - 1
+        if pos < 0:
+            return None
+        rule = self.rules[pos]
+        return rule if freq_khz < rule.max_freq else None
+
+
+class RuleIndex:
+    """Immutable per-rig interval index of auto-switch rules.
+
+    Rules are half-open ranges `[minFrequency, maxFrequency)` in kHz. Rules may
+    be narrowed with optional `mode` and `stationName` keys; a lookup prefers
+    the most specific match (mode and station, then mode, then station, then
+    a plain frequency rule). Each lookup is at most four dict probes and one
+    bisect, independent of how many other rig/mode groups are configured.
+    """
+
+    __slots__ = ("_segments", "_rules")
+
+    def __init__(self, segments: Mapping[_Key, _Segments], rules: tuple[AntennaRule, ...]) -> None:
+        self._segments = dict(segments)
+        self._rules = rules
+
+    @classmethod
+    def compile(cls, raw_rules: Iterable[Mapping[str, Any]]) -> "RuleIndex":
+        grouped: dict[_Key, list[AntennaRule]] = {}
+        rules = parse_rules(raw_rules)
+        for rule in rules:
+            grouped.setdefault((rule.rig, rule.mode, rule.station_name), []).append(rule)
+
+        segments: dict[_Key, _Segments] = {}
+        for key, group in grouped.items():
+            group.sort(key=lambda rule: rule.min_freq)
+            for previous, current in zip(group, group[1:]):
+                if current.min_freq < previous.max_freq:
+                    raise RuleError(
+                        f"Overlapping auto-switch rules: {previous.describe()} and {current.describe()}"
+                    )
+            segments[key] = _Segments(
+                starts=tuple(rule.min_freq for rule in group),
+                rules=tuple(group),
+            )
+        return cls(segments, tuple(rules))
+
+    @property
+    def rules(self) -> tuple[AntennaRule, ...]:
+        return self._rules
+
+    def __len__(self) -> int:
+        return len(self._rules)
+
+    def lookup(
+        self,
+        rig: Rig,
+        freq_khz: float,
+        mode: str = "",
+        station_name: str = "",
+    ) -> AntennaRule | None:
+        segments = self._segments
+        mode_key = mode.upper() or None
+        station_key = station_name.upper() or None
+        for key in (
+            (rig, mode_key, station_key),
+            (rig, mode_key, None),
+            (rig, None, station_key),
+            (rig, None, None),
+        ):
+            bucket = segments.get(key)
+            if bucket is not None:
+                rule = bucket.find(freq_khz)
+                if rule is not None:
+                    return rule
+        return None
+
+
+def parse_rules(raw_rules: Iterable[Mapping[str, Any]]) -> list[AntennaRule]:
+    """Validate each rule on its own; unlike `RuleIndex.compile`, overlapping rules are accepted."""
+    return [_parse_rule(raw, position) for position, raw in enumerate(raw_rules)]
+
+
+def _parse_rule(raw: Mapping[str, Any], position: int) -> AntennaRule:
+    where = f"autoSwitch.antennaRules[{position}]"
+    if not isinstance(raw, Mapping):
+        raise RuleError(f"{where}: expected an object")
+    rig_name = str(raw.get("rig", "")).strip().upper()
+    if rig_name not in (Rig.A.value, Rig.B.value):
+        raise RuleError(f"{where}: rig must be 'A' or 'B', got {raw.get('rig')!r}")
+    try:
+        min_freq = int(raw.get("minFrequency", 0))
+        max_freq = int(raw.get("maxFrequency", 0))
+        primary = int(raw.get("primaryAntenna", 0))
+        secondary = int(raw.get("secondaryAntenna", 0))
+    except (TypeError, ValueError) as exc:
+        raise RuleError(f"{where}: {exc}") from exc
+    if min_freq >= max_freq:
+        raise RuleError(f"{where}: minFrequency {min_freq} must be below maxFrequency {max_freq}")
+    for name, value in (("primaryAntenna", primary), ("secondaryAntenna", secondary)):
+        if not 0 <= value <= MAX_ANTENNA:
+            raise RuleError(f"{where}: {name} must be 0..{MAX_ANTENNA}, got {value}")
+    mode = str(raw.get("mode", "")).strip().upper() or None
+    station_name = str(raw.get("stationName", "")).strip().upper() or None
+    return AntennaRule(
+        rig=Rig(rig_name),
+        min_freq=min_freq,
+        max_freq=max_freq,
+        primary=primary,
+        secondary=secondary,
+        mode=mode,
+        station_name=station_name,
+        position=position,
+    )
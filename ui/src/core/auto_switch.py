@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+from typing import Callable, Optional
+
+from PySide6.QtCore import QTimer
+
+from core.auto_rules import AntennaRule, RuleIndex
+from core.command_pipeline import CommandPipeline
+from core.radio_info import RadioInfo, Rig
+from core.switch_policy import SwitchPolicy
+from core.tracing import tracer
+
+
+class AutoSwitch:
+    """Frequency-driven antenna selection shared by every frontend.
+
+    Looks up the rule for each RadioInfo frame, filters it through the
+    switching policy and submits the resulting antenna to the command
+    pipeline. The primary antenna is used unless the other rig already holds
+    (or is heading to) it, in which case the secondary one is chosen.
+    """
+
+    def __init__(self, rules: RuleIndex, policy: SwitchPolicy, commands: CommandPipeline) -> None:
+        self._rules = rules
+        self._policy = policy
+        self._commands = commands
+        self._enabled: dict[Rig, bool] = {Rig.A: False, Rig.B: False}
+        self._last_info: dict[Rig, RadioInfo] = {}
+        self._recheck_timers: dict[Rig, QTimer] = {}
+        self._on_enabled_changed: Optional[Callable[[Rig, bool], None]] = None
+        self._on_selected: Optional[Callable[[Rig, int, AntennaRule | None], None]] = None
+
+    def set_enabled_listener(self, listener: Callable[[Rig, bool], None]) -> None:
+        self._on_enabled_changed = listener
+
+    def set_selection_listener(self, listener: Callable[[Rig, int, AntennaRule | None], None]) -> None:
+        """Called for every antenna submitted, with the rule that chose it (None for a manual selection)."""
+        self._on_selected = listener
+
+    def is_enabled(self, rig: Rig) -> bool:
+        return self._enabled[rig]
+
+    def set_enabled(self, rig: Rig, enabled: bool) -> None:
+        if self._enabled[rig] == enabled:
+            return
+        self._enabled[rig] = enabled
+        self._policy.reset(rig)
+        if self._on_enabled_changed:
+            self._on_enabled_changed(rig, enabled)
+
+    def set_rules(self, rules: RuleIndex) -> None:
+        """Switch to new rules and re-evaluate the last frame of each enabled rig."""
+        self._rules = rules
+        for rig, enabled in self._enabled.items():
+            if enabled:
+                self._policy.reset(rig)
+                self._recheck(rig)
+
+    def select(self, rig: str, value: int) -> None:
+        """Manual antenna selection."""
+        if self._on_selected and rig.upper() in (Rig.A.value, Rig.B.value):
+            self._on_selected(Rig(rig.upper()), value, None)
+        self._commands.submit(rig, value)
+
+    def handle_radio_info(self, info: RadioInfo) -> None:
+        if not self._enabled[info.radio]:
+            return
+        self._last_info[info.radio] = info
+
+        with tracer.span("rule select", rig=info.radio.value, freq=info.freq):
+            decision = self._policy.evaluate(info.radio, info.freq, self.select_rule(info))
+        if decision.recheck_ms:
+            self._schedule_recheck(info.radio, decision.recheck_ms)
+        rule = decision.rule
+        if rule is None:
+            return
+
+        selected = rule.primary
+        other = self._current_antenna(Rig.B if info.radio == Rig.A else Rig.A)
+        if other == str(rule.primary):
+            selected = rule.secondary
+
+        current = self._current_antenna(info.radio)
+        if current == str(selected):
+            return
+
+        wait_ms = self._policy.acquire(info.radio)
+        if wait_ms:
+            self._schedule_recheck(info.radio, wait_ms)
+            return
+        if self._on_selected:
+            self._on_selected(info.radio, selected, rule)
+        self._commands.submit(info.radio.value, selected)
+
+    def stop(self) -> None:
+        for timer in self._recheck_timers.values():
+            timer.stop()
+        self._recheck_timers.clear()
+
+    def select_rule(self, info: RadioInfo) -> AntennaRule | None:
+        return self._rules.lookup(info.radio, info.freq, info.mode, info.station_name)
+
+    def _current_antenna(self, rig: Rig) -> str:
+        # Includes commands still in flight so decisions build on what was already asked for.
+        return self._commands.target(rig.value)
+
+    def _schedule_recheck(self, rig: Rig, delay_ms: int) -> None:
+        # Settle time and rate limiting must resolve even if N1MM stops sending frames.
+        timer = self._recheck_timers.get(rig)
+        if timer is None:
+            timer = QTimer()
+            timer.setSingleShot(True)
+            timer.timeout.connect(lambda: self._recheck(rig))
+            self._recheck_timers[rig] = timer
+        timer.start(delay_ms)
+
+    def _recheck(self, rig: Rig) -> None:
+        info = self._last_info.get(rig)
+        if info is not None:
+            self.handle_radio_info(info)
@@ -0,0 +1,276 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Callable, Iterable, Optional
+from urllib.parse import urlparse, urlunparse
+
+from config.settings import AppSettings
+from core.command_pipeline import CommandConfig, CommandPipeline, CommandStats
+from core.deadlines import DeadlineScheduler
+from core.logging_setup import get_logger
+from core.metrics import Histogram
+from core.radio_info import Rig
+from core.tracing import tracer
+from net.websocket_client import WebSocketClient, WebSocketConfig
+
+MAST_ANTENNAS = 6  # relays per mast unit (mast-unit.ino)
+RIGS = (Rig.A.value, Rig.B.value)
+
+
+class BridgeConfigError(ValueError):
+    """Raised when `wsConnection.bridges` cannot be turned into a routing table."""
+
+
+@dataclass(frozen=True)
+class BridgeSpec:
+    name: str
+    url: str
+    rigs: tuple[str, ...] = RIGS
+    antennas: tuple[int, ...] = tuple(range(1, MAST_ANTENNAS + 1))  # UI antenna number per mast relay 1..n
+
+
+def parse_bridges(settings: AppSettings) -> list[BridgeSpec]:
+    """Bridge list from the settings; without `wsConnection.bridges`, the one bridge at `url`/`port`."""
+    if not settings.bridges:
+        return [BridgeSpec("bridge", _build_ws_url(settings.ws_url, settings.ws_port))]
+    specs: list[BridgeSpec] = []
+    owners: dict[tuple[str, int], str] = {}
+    for index, raw in enumerate(settings.bridges):
+        where = f"wsConnection.bridges[{index}]"
+        if not isinstance(raw, dict):
+            raise BridgeConfigError(f"{where}: expected an object")
+        name = str(raw.get("name", f"bridge{index + 1}"))
+        if any(spec.name == name for spec in specs):
+            raise BridgeConfigError(f"{where}: duplicate name {name!r}")
+        url = _build_ws_url(str(raw.get("url", settings.ws_url)), int(raw.get("port", settings.ws_port)))
+        rigs = tuple(str(rig).upper() for rig in raw.get("rigs", RIGS))
+        for rig in rigs:
+            if rig not in RIGS:
+                raise BridgeConfigError(f"{where}.rigs: rig must be 'A' or 'B', got {rig!r}")
+        try:
+            antennas = tuple(int(antenna) for antenna in raw.get("antennas", range(1, MAST_ANTENNAS + 1)))
+        except (TypeError, ValueError) as exc:
+            raise BridgeConfigError(f"{where}.antennas: {exc}") from exc
+        if not 0 < len(antennas) <= MAST_ANTENNAS or min(antennas) < 1 or len(set(antennas)) != len(antennas):
+            raise BridgeConfigError(f"{where}.antennas: 1 to {MAST_ANTENNAS} distinct antenna numbers >= 1")
+        for rig in rigs:
+            for antenna in antennas:
+                other = owners.setdefault((rig, antenna), name)
+                if other != name:
+                    raise BridgeConfigError(f"{where}: rig {rig} antenna {antenna} already belongs to {other!r}")
+        specs.append(BridgeSpec(name, url, rigs, antennas))
+    return specs
+
+
+class BridgeConnection:
+    """One bridge: its WebSocket, command pipeline and last status.
+
+    The pipeline and the status speak the mast's antenna numbers (1..6);
+    `to_global`/`to_local` translate to and from the numbers the UI and the
+    auto-switch rules use.
+    """
+
+    def __init__(
+        self,
+        spec: BridgeSpec,
+        ws_config: WebSocketConfig,
+        command_config: CommandConfig,
+        scheduler: DeadlineScheduler,
+        round_trip: Histogram | None = None,
+    ) -> None:
+        self.spec = spec
+        self.name = spec.name
+        self._logger = get_logger(f"{self.__class__.__name__}[{spec.name}]")
+        self._to_local = {antenna: local for local, antenna in enumerate(spec.antennas, start=1)}
+        self.ws_client = WebSocketClient(ws_config, scheduler)
+        self.commands = CommandPipeline(
+            command_config, send=self._send_command, round_trip=round_trip, scheduler=scheduler
+        )
+        self.status: dict[str, Any] = {}
+        self.last_frame: str | bytes | None = None  # last status frame applied, as received
+        self.binary_frames = 0
+        self.unchanged_frames = 0
+
+    def reconfigure(self, spec: BridgeSpec, ws_config: WebSocketConfig) -> None:
+        """New rigs/antennas take effect at once; a new URL reconnects (see WebSocketClient.reconfigure)."""
+        self.spec = spec
+        self._to_local = {antenna: local for local, antenna in enumerate(spec.antennas, start=1)}
+        self.ws_client.reconfigure(ws_config)
+
+    def send_text(self, text: str, key: str | None = None) -> bool:
+        try:
+            with tracer.span("ws send", command=text, bridge=self.name):
+                return self.ws_client.send(text, key)
+        except Exception as exc:
+            self._logger.exception("WebSocket send failed: %s", exc)
+            return False
+
+    def _send_command(self, command: str) -> bool:
+        # Antenna commands survive a short outage, latest per rig (see WebSocketClient.send).
+        return self.send_text(command, key=command[:1])
+
+    def to_local(self, antenna: int) -> int | None:
+        """Mast relay for a UI antenna number; 0 (all off) maps to itself."""
+        return 0 if antenna == 0 else self._to_local.get(antenna)
+
+    def to_global(self, value: str) -> str:
+        """Status/target antenna (`-`, `1`..`6`, `NC`) as a UI antenna; unknown relays read `NC`."""
+        if not value.isdigit():
+            return value
+        local = int(value)
+        return str(self.spec.antennas[local - 1]) if 0 < local <= len(self.spec.antennas) else "NC"
+
+    def global_command(self, command: str) -> str:
+        return command[:1] + self.to_global(command[1:])
+
+
+class CommandRouter:
+    """CommandPipeline interface over the pipelines of several bridges.
+
+    A command for (rig, antenna) goes to the bridge that owns that antenna
+    for the rig. Selecting it sends "off" for the rig to the other bridges
+    serving it, so a rig is never connected on two masts; antenna 0 goes to
+    all of them. Each bridge keeps its own in-flight and retry state, so a
+    slow or offline bridge only holds up its own commands.
+    """
+
+    def __init__(self, bridges: Iterable[BridgeConnection]) -> None:
+        self._bridges = list(bridges)
+        self._logger = get_logger(self.__class__.__name__)
+        self._serving: dict[str, list[BridgeConnection]] = {}
+        self._owner: dict[tuple[str, int], BridgeConnection] = {}
+        self.refresh()
+        self._on_sent: Optional[Callable[[str], None]] = None
+        self._on_confirmed: Optional[Callable[[str, float], None]] = None
+        self._on_failed: Optional[Callable[[str, str], None]] = None
+        self._on_busy_changed: Optional[Callable[[bool], None]] = None
+        self._busy = False
+        for bridge in self._bridges:
+            pipeline = bridge.commands
+            pipeline.set_sent_listener(lambda command, bridge=bridge: self._sent(bridge, command))
+            pipeline.set_confirmed_listener(
+                lambda command, latency, bridge=bridge: self._confirmed(bridge, command, latency)
+            )
+            pipeline.set_failed_listener(lambda command, reason, bridge=bridge: self._failed(bridge, command, reason))
+            pipeline.set_busy_listener(lambda _busy: self._update_busy())
+
+    def refresh(self) -> None:
+        """Rebuild the routing table after a bridge's rigs or antennas changed."""
+        self._serving = {rig: [bridge for bridge in self._bridges if rig in bridge.spec.rigs] for rig in RIGS}
+        self._owner = {
+            (rig, antenna): bridge
+            for bridge in self._bridges
+            for rig in bridge.spec.rigs
+            for antenna in bridge.spec.antennas
+        }
+
+    def set_sent_listener(self, listener: Callable[[str], None]) -> None:
+        self._on_sent = listener
+
+    def set_confirmed_listener(self, listener: Callable[[str, float], None]) -> None:
+        self._on_confirmed = listener
+
+    def set_failed_listener(self, listener: Callable[[str, str], None]) -> None:
+        self._on_failed = listener
+
+    def set_busy_listener(self, listener: Callable[[bool], None]) -> None:
+        self._on_busy_changed = listener
+
+    @property
+    def busy(self) -> bool:
+        return any(bridge.commands.busy for bridge in self._bridges)
+
+    @property
+    def stats(self) -> CommandStats:
+        """Totals over all bridges."""
+        if len(self._bridges) == 1:
+            return self._bridges[0].commands.stats
+        total = CommandStats()
+        for bridge in self._bridges:
+            stats = bridge.commands.stats
+            total.sent += stats.sent
+            total.confirmed += stats.confirmed
+            total.retried += stats.retried
+            total.failed += stats.failed
+            total.superseded += stats.superseded
+            total.latencies_ms.extend(stats.latencies_ms)
+        return total
+
+    def target(self, rig: str) -> str:
+        """Antenna the rig is heading to, as a UI antenna number (see CommandPipeline.target)."""
+        rig = rig.upper()
+        fallback = ""
+        for bridge in self._serving.get(rig, ()):
+            target = bridge.to_global(bridge.commands.target(rig))
+            if target.isdigit():
+                return target
+            if not fallback or fallback == "-":
+                fallback = target
+        return fallback
+
+    def submit(self, rig: str, value: int) -> None:
+        rig = rig.upper()
+        serving = self._serving.get(rig, [])
+        if value == 0:
+            for bridge in serving:
+                bridge.commands.submit(rig, 0)
+            return
+        owner = self._owner.get((rig, value))
+        if owner is None:
+            self._logger.warning("No bridge switches antenna %d for rig %s", value, rig)
+            return
+        for bridge in serving:
+            if bridge is not owner and bridge.commands.target(rig) not in ("-", ""):
+                bridge.commands.submit(rig, 0)
+        owner.commands.submit(rig, owner.to_local(value))
+
+    def stop(self) -> None:
+        for bridge in self._bridges:
+            bridge.commands.stop()
+
+    def _sent(self, bridge: BridgeConnection, command: str) -> None:
+        if self._on_sent:
+            self._on_sent(self._describe(bridge, command))
+
+    def _confirmed(self, bridge: BridgeConnection, command: str, latency_ms: float) -> None:
+        if self._on_confirmed:
+            self._on_confirmed(self._describe(bridge, command), latency_ms)
+
+    def _failed(self, bridge: BridgeConnection, command: str, reason: str) -> None:
+        # A command given up on must not go out when the bridge comes back.
+        bridge.ws_client.discard(command[:1])
+        if self._on_failed:
+            self._on_failed(self._describe(bridge, command), reason)
+
+    def _update_busy(self) -> None:
+        busy = self.busy
+        if busy != self._busy:
+            self._busy = busy
+            if self._on_busy_changed:
+                self._on_busy_changed(busy)
+
+    def _describe(self, bridge: BridgeConnection, command: str) -> str:
+        command = bridge.global_command(command)
+        return command if len(self._bridges) == 1 else f"{command} ({bridge.name})"
+
+
+def _build_ws_url(raw_url: str, port: int) -> str:
+    parsed = urlparse(raw_url)
+    scheme = parsed.scheme or "ws"
+    if scheme == "http":
+        scheme = "ws"
+    elif scheme == "https":
+        scheme = "wss"
+
+    hostname = parsed.hostname or raw_url
+    if hostname and ":" in hostname and hostname.startswith("["):
+        hostname = hostname.strip("[]")
+
+    netloc = hostname or "127.0.0.1"
+    if parsed.port is not None:
+        netloc = f"{netloc}:{parsed.port}"
+    else:
+        netloc = f"{netloc}:{port}"
+
+    path = parsed.path or "/"
+    return urlunparse((scheme, netloc, path, "", "", ""))
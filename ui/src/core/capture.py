@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+import mmap
+import struct
+import time
+from enum import IntEnum
+from pathlib import Path
+from typing import BinaryIO, Iterator, NamedTuple
+
+MAGIC = b"RSCAP\x00\x01\x00"
+_HEADER = struct.Struct("<8sQd")  # magic, monotonic start (ns), wall-clock start (s)
+_RECORD = struct.Struct("<QBI")  # ns since start, kind, payload length
+
+
+class CaptureError(ValueError):
+    pass
+
+
+class RecordKind(IntEnum):
+    UDP_IN = 1
+    WS_IN = 2
+    WS_OUT = 3
+    WS_IN_BINARY = 4
+
+
+class CaptureRecord(NamedTuple):
+    t_ns: int
+    kind: RecordKind
+    payload: bytes
+
+
+class CaptureWriter:
+    """Appends UDP datagrams and WebSocket frames to a capture file.
+
+    File layout: a fixed header followed by records of
+    `<u64 ns since start><u8 kind><u32 length><payload>`, little endian.
+    Records are only ever appended, so a capture cut short by a crash is
+    still readable up to its last complete record.
+    """
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._start_ns = time.monotonic_ns()
+        self._file: BinaryIO | None = self.path.open("wb")
+        self._file.write(_HEADER.pack(MAGIC, self._start_ns, time.time()))
+        self.records = 0
+
+    def write(self, kind: RecordKind, payload: bytes) -> None:
+        if self._file is None:
+            return
+        self._file.write(_RECORD.pack(time.monotonic_ns() - self._start_ns, kind, len(payload)))
+        self._file.write(payload)
+        self.records += 1
+
+    def write_udp(self, payload: bytes) -> None:
+        self.write(RecordKind.UDP_IN, payload)
+
+    def write_ws_in(self, message: str) -> None:
+        self.write(RecordKind.WS_IN, message.encode("utf-8"))
+
+    def write_ws_in_binary(self, payload: bytes) -> None:
+        self.write(RecordKind.WS_IN_BINARY, payload)
+
+    def write_ws_out(self, message: str) -> None:
+        self.write(RecordKind.WS_OUT, message.encode("utf-8"))
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class CaptureReader:
+    """Memory-maps a capture file and iterates over its records."""
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        with self.path.open("rb") as handle:
+            size = self.path.stat().st_size
+            if size < _HEADER.size:
+                raise CaptureError(f"{self.path}: too short for a capture header")
+            self._map = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, _, self.wall_start = _HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC:
+            self._map.close()
+            raise CaptureError(f"{self.path}: not a capture file")
+
+    def __iter__(self) -> Iterator[CaptureRecord]:
+        data = self._map
+        offset = _HEADER.size
+        end = len(data)
+        while offset + _RECORD.size <= end:
+            t_ns, kind, length = _RECORD.unpack_from(data, offset)
+            offset += _RECORD.size
+            if offset + length > end:
+                break  # truncated last record
+            yield CaptureRecord(t_ns, RecordKind(kind), data[offset : offset + length])
+            offset += length
+
+    def close(self) -> None:
+        self._map.close()
+
+    def __enter__(self) -> CaptureReader:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
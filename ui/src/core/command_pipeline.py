@@ -0,0 +1,274 @@
+from __future__ import annotations
+
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from functools import partial
+from typing import Callable, Optional
+
+from core.deadlines import DeadlineScheduler
+from core.logging_setup import get_logger
+from core.metrics import Histogram
+from core.tracing import tracer
+
+
+@dataclass
+class CommandConfig:
+    timeout_ms: int = 3000  # wait this long for a status that reflects the command
+    max_retries: int = 2  # resend attempts after the first send; then give up
+
+
+@dataclass
+class CommandStats:
+    sent: int = 0
+    confirmed: int = 0
+    retried: int = 0
+    failed: int = 0
+    superseded: int = 0
+    latencies_ms: deque[float] = field(default_factory=lambda: deque(maxlen=256))
+
+    @property
+    def last_latency_ms(self) -> float | None:
+        return self.latencies_ms[-1] if self.latencies_ms else None
+
+
+@dataclass
+class _InFlight:
+    command: str
+    target: str
+    first_sent_at: float  # latency is measured from the first attempt
+    attempts: int = 1
+    trace_event: int = 0
+    trace_sent_us: int = 0
+
+
+def antenna_target(value: int) -> str:
+    """Status value the bridge reports for antenna `value` ("-" = all off)."""
+    return "-" if value == 0 else str(value)
+
+
+class CommandPipeline:
+    """Tracks antenna commands until a bridge status confirms them.
+
+    Each rig has at most one command in flight plus one latest-wins pending
+    slot. A command is confirmed when a status frame reports the requested
+    antenna for its rig; otherwise it is resent after `timeout_ms`, up to
+    `max_retries` times. Whatever was decided last for a rig is sent next.
+    """
+
+    def __init__(
+        self,
+        config: CommandConfig,
+        send: Callable[[str], bool],
+        clock: Optional[Callable[[], float]] = None,
+        round_trip: Histogram | None = None,
+        scheduler: DeadlineScheduler | None = None,
+    ) -> None:
+        self._config = config
+        self._scheduler = scheduler or DeadlineScheduler()
+        self._round_trip = round_trip
+        self._send = send
+        self._clock = clock or (lambda: time.monotonic() * 1000.0)
+        self._logger = get_logger(self.__class__.__name__)
+        self._in_flight: dict[str, _InFlight] = {}
+        self._pending: dict[str, str] = {}
+        self._pending_events: dict[str, int] = {}  # trace event per pending slot, only while tracing
+        self._status: dict[str, str] = {"A": "", "B": ""}
+        self._on_sent: Optional[Callable[[str], None]] = None
+        self._on_confirmed: Optional[Callable[[str, float], None]] = None
+        self._on_failed: Optional[Callable[[str, str], None]] = None
+        self._on_busy_changed: Optional[Callable[[bool], None]] = None
+        self.stats = CommandStats()
+
+    def set_sent_listener(self, listener: Callable[[str], None]) -> None:
+        self._on_sent = listener
+
+    def set_confirmed_listener(self, listener: Callable[[str, float], None]) -> None:
+        self._on_confirmed = listener
+
+    def set_failed_listener(self, listener: Callable[[str, str], None]) -> None:
+        self._on_failed = listener
+
+    def set_busy_listener(self, listener: Callable[[bool], None]) -> None:
+        self._on_busy_changed = listener
+
+    @property
+    def busy(self) -> bool:
+        return bool(self._in_flight)
+
+    def target(self, rig: str) -> str:
+        """Antenna the rig is heading to: pending, else in flight, else reported."""
+        rig = rig.upper()
+        pending = self._pending.get(rig)
+        if pending is not None:
+            return pending
+        entry = self._in_flight.get(rig)
+        if entry is not None:
+            return entry.target
+        return self._status.get(rig, "")
+
+    def submit(self, rig: str, value: int) -> None:
+        rig = rig.upper()
+        target = antenna_target(value)
+        # Auto decisions carry the datagram's event; manual selections start their own.
+        event = (tracer.current or tracer.new_event()) if tracer.enabled else 0
+        if rig in self._in_flight:
+            if rig in self._pending:
+                self.stats.superseded += 1
+            if self._in_flight[rig].target == target:
+                self._pending.pop(rig, None)
+                self._pending_events.pop(rig, None)
+            else:
+                self._pending[rig] = target
+                if event:
+                    self._pending_events[rig] = event
+            return
+        if self._status.get(rig) == target:
+            return
+        self._dispatch(rig, target, event=event)
+
+    def handle_status(self, a: str, b: str) -> None:
+        self._status["A"] = a
+        self._status["B"] = b
+        for rig in tuple(self._in_flight):
+            entry = self._in_flight[rig]
+            if self._status[rig] == entry.target:
+                self._complete(rig, entry)
+
+    def handle_error(self, reason: str) -> None:
+        """Negative acknowledgement from the bridge (e.g. "Mast Offline")."""
+        for rig in tuple(self._in_flight):
+            self._retry_or_fail(rig, reason)
+
+    def reset(self, reason: str) -> None:
+        """Drop everything in flight, e.g. after the WebSocket disconnects."""
+        was_busy = self.busy
+        for rig, entry in tuple(self._in_flight.items()):
+            self._stop_timer(rig)
+            self.stats.failed += 1
+            if self._on_failed:
+                self._on_failed(entry.command, reason)
+        self._in_flight.clear()
+        self._pending.clear()
+        self._pending_events.clear()
+        if was_busy:
+            self._notify_busy()
+
+    def stop(self) -> None:
+        """Stop retry timers without reporting anything (application shutdown)."""
+        for rig in self._in_flight:
+            self._stop_timer(rig)
+
+    def _dispatch(self, rig: str, target: str, retry_of: _InFlight | None = None, event: int = 0) -> None:
+        command = f"{rig}{target}"
+        was_busy = self.busy
+        if retry_of is None:
+            entry = _InFlight(command, target, self._clock(), trace_event=event)
+            if event:
+                entry.trace_sent_us = tracer.now_us()
+        else:
+            entry = _InFlight(
+                command,
+                target,
+                retry_of.first_sent_at,
+                retry_of.attempts + 1,
+                retry_of.trace_event,
+                retry_of.trace_sent_us,
+            )
+        self._in_flight[rig] = entry
+        self.stats.sent += 1
+        with tracer.activate(entry.trace_event):
+            if self._on_sent:
+                self._on_sent(command)
+            sent = self._send(command)
+        if not sent:
+            self._in_flight.pop(rig, None)
+            self._pending.pop(rig, None)
+            self._pending_events.pop(rig, None)
+            self.stats.failed += 1
+            if self._on_failed:
+                self._on_failed(command, "not sent")
+            if was_busy != self.busy:
+                self._notify_busy()
+            return
+        self._start_timer(rig)
+        if not was_busy:
+            self._notify_busy()
+
+    def _complete(self, rig: str, entry: _InFlight) -> None:
+        self._stop_timer(rig)
+        del self._in_flight[rig]
+        latency = self._clock() - entry.first_sent_at
+        self.stats.confirmed += 1
+        self.stats.latencies_ms.append(latency)
+        if self._round_trip is not None:
+            self._round_trip.observe(latency / 1000.0)
+        self._logger.info("Command %s confirmed in %.0f ms (attempt %d)", entry.command, latency, entry.attempts)
+        if entry.trace_event:
+            self._trace_confirmed(entry)
+        with tracer.activate(entry.trace_event):
+            if self._on_confirmed:
+                self._on_confirmed(entry.command, latency)
+        self._send_next(rig)
+
+    def _trace_confirmed(self, entry: _InFlight) -> None:
+        # The round trip covers the bridge, the LoRa link and the relay; "switch" spans the whole event.
+        now = tracer.now_us()
+        tracer.async_span(
+            "bridge round trip",
+            entry.trace_event,
+            entry.trace_sent_us,
+            now,
+            command=entry.command,
+            attempts=entry.attempts,
+        )
+        origin = tracer.origin_us(entry.trace_event)
+        if origin is not None:
+            tracer.async_span("switch", entry.trace_event, origin, now, command=entry.command)
+
+    def _send_next(self, rig: str) -> None:
+        pending = self._pending.pop(rig, None)
+        event = self._pending_events.pop(rig, 0)
+        if pending is not None and pending != self._status.get(rig):
+            self._dispatch(rig, pending, event=event)
+        elif not self.busy:
+            self._notify_busy()
+
+    def _retry_or_fail(self, rig: str, reason: str) -> None:
+        entry = self._in_flight.get(rig)
+        if entry is None:
+            return
+        self._stop_timer(rig)
+        del self._in_flight[rig]
+        pending = self._pending.pop(rig, None)
+        event = self._pending_events.pop(rig, 0)
+        if pending is not None:
+            # A newer decision exists; send that instead of repeating the old one.
+            self.stats.superseded += 1
+            if pending != self._status.get(rig):
+                self._dispatch(rig, pending, event=event)
+                return
+        elif entry.attempts <= self._config.max_retries:
+            self.stats.retried += 1
+            self._logger.warning("Command %s not confirmed (%s); retrying", entry.command, reason)
+            self._dispatch(rig, entry.target, retry_of=entry)
+            return
+        else:
+            self.stats.failed += 1
+            self._logger.warning("Command %s failed after %d attempts: %s", entry.command, entry.attempts, reason)
+            if self._on_failed:
+                self._on_failed(entry.command, reason)
+        if not self.busy:
+            self._notify_busy()
+
+    def _start_timer(self, rig: str) -> None:
+        if self._config.timeout_ms <= 0:
+            return
+        self._scheduler.schedule((id(self), rig), self._config.timeout_ms, partial(self._retry_or_fail, rig, "timeout"))
+
+    def _stop_timer(self, rig: str) -> None:
+        self._scheduler.cancel((id(self), rig))
+
+    def _notify_busy(self) -> None:
+        if self._on_busy_changed:
+            self._on_busy_changed(self.busy)
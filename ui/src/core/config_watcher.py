@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Callable
+
+from PySide6.QtCore import QFileSystemWatcher, QTimer
+
+from core.logging_setup import get_logger
+
+
+class ConfigWatcher:
+    """Calls `on_change` after the config file's content changes.
+
+    Editors save in bursts and often replace the file instead of writing it,
+    so the directory is watched as well, the file is re-added after it
+    reappears and changes are debounced. Writes that leave the content as it
+    was (a touch, a save without edits) do not count.
+
+    Create and dispose it on the thread that runs `on_change`.
+    """
+
+    def __init__(self, path: Path, on_change: Callable[[], None], debounce_ms: int = 200) -> None:
+        self._path = path.resolve()
+        self._on_change = on_change
+        self._logger = get_logger(self.__class__.__name__)
+        self._content = self._read()
+        self._watcher = QFileSystemWatcher()
+        self._watcher.addPath(str(self._path.parent))
+        self._watch_file()
+        self._watcher.fileChanged.connect(self._schedule)
+        self._watcher.directoryChanged.connect(self._schedule)
+        self._timer = QTimer()
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(debounce_ms)
+        self._timer.timeout.connect(self._check)
+        self.changes = 0
+
+    @property
+    def path(self) -> Path:
+        return self._path
+
+    def dispose(self) -> None:
+        self._timer.stop()
+        self._watcher.removePaths(self._watcher.files() + self._watcher.directories())
+
+    def _watch_file(self) -> None:
+        if str(self._path) not in self._watcher.files() and self._path.exists():
+            self._watcher.addPath(str(self._path))
+
+    def _schedule(self, _path: str) -> None:
+        self._timer.start()
+
+    def _read(self) -> bytes | None:
+        try:
+            return self._path.read_bytes()
+        except OSError:
+            return None
+
+    def _check(self) -> None:
+        self._watch_file()
+        content = self._read()
+        if content is None or content == self._content:
+            return
+        self._content = content
+        self.changes += 1
+        self._logger.info("Config file changed: %s", self._path)
+        self._on_change()
@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import heapq
+import itertools
+import math
+import time
+from typing import Callable, Hashable, Optional
+
+from PySide6.QtCore import QTimer
+
+
+class DeadlineScheduler:
+    """Runs callbacks at deadlines, all served by one QTimer.
+
+    Heartbeat, reconnect and command-retry deadlines of every bridge share
+    one scheduler, so adding a bridge adds heap entries rather than timers.
+    `schedule` replaces any deadline already set for its key. Pushing a
+    deadline later (a heartbeat reset on every message) only updates a dict
+    entry; the heap entry is re-queued when it comes due.
+
+    The QTimer is created on first use, on the thread that uses it.
+    """
+
+    def __init__(self, clock: Optional[Callable[[], float]] = None) -> None:
+        self._clock = clock or (lambda: time.monotonic() * 1000.0)
+        self._deadlines: dict[Hashable, tuple[float, Callable[[], None]]] = {}
+        self._heap: list[tuple[float, int, Hashable]] = []
+        self._sequence = itertools.count()
+        self._timer: QTimer | None = None
+        self.fired = 0
+
+    def schedule(self, key: Hashable, delay_ms: float, callback: Callable[[], None]) -> None:
+        due = self._clock() + delay_ms
+        current = self._deadlines.get(key)
+        self._deadlines[key] = (due, callback)
+        if current is None or due < current[0]:
+            # Every key has a heap entry at or before its deadline.
+            heapq.heappush(self._heap, (due, next(self._sequence), key))
+            if self._heap[0][0] == due:
+                self._arm()
+
+    def cancel(self, key: Hashable) -> None:
+        self._deadlines.pop(key, None)
+
+    def pending(self, key: Hashable) -> bool:
+        return key in self._deadlines
+
+    def dispose(self) -> None:
+        """Drop all deadlines and the timer; must run on the thread that used it."""
+        self._deadlines.clear()
+        self._heap.clear()
+        if self._timer is not None:
+            self._timer.stop()
+            self._timer = None
+
+    def _arm(self) -> None:
+        while self._heap and self._heap[0][2] not in self._deadlines:
+            heapq.heappop(self._heap)  # cancelled
+        if not self._heap:
+            if self._timer is not None:
+                self._timer.stop()
+            return
+        if self._timer is None:
+            self._timer = QTimer()
+            self._timer.setSingleShot(True)
+            self._timer.timeout.connect(self._fire)
+        delay = max(0, math.ceil(self._heap[0][0] - self._clock()))
+        self._timer.start(delay)
+
+    def _fire(self) -> None:
+        now = self._clock()
+        heap = self._heap
+        while heap and heap[0][0] <= now:
+            _, _, key = heapq.heappop(heap)
+            entry = self._deadlines.get(key)
+            if entry is None:
+                continue
+            due, callback = entry
+            if due > now:
+                heapq.heappush(heap, (due, next(self._sequence), key))  # moved later since queued
+                continue
+            del self._deadlines[key]
+            self.fired += 1
+            callback()
+        self._arm()
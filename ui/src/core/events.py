@@ -0,0 +1,231 @@
+from __future__ import annotations
+
+import threading
+from collections import deque
+from typing import TYPE_CHECKING, Any, Callable, Generic, Optional, ParamSpec
+
+from core.logging_setup import get_logger
+from core.tracing import tracer
+
+if TYPE_CHECKING:
+    from config.settings import AppSettings
+    from core.auto_rules import AntennaRule
+    from core.radio_info import RadioInfo, Rig
+
+P = ParamSpec("P")
+
+# Subscribers with a higher priority are called first; equal ones in subscription order.
+PRIORITY_SWITCHING = 100  # anything that decides on a relay command
+PRIORITY_DEFAULT = 0
+PRIORITY_RECORDING = -100  # journal and logging, after everything that affects the antennas
+
+
+class Topic(Generic[P]):
+    """An event kind; `P` is what its subscribers are called with."""
+
+    __slots__ = ("name",)
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+
+    def __repr__(self) -> str:
+        return f"Topic({self.name!r})"
+
+
+class Subscription:
+    """A subscriber called inline on the publishing thread; `cancel()` unsubscribes it."""
+
+    def __init__(self, bus: EventBus, topic: Topic, callback: Callable[..., Any], priority: int, name: str) -> None:
+        self.topic = topic
+        self.callback = callback
+        self.priority = priority
+        self.name = name
+        self.errors = 0
+        self._bus = bus
+
+    @property
+    def deliver(self) -> Callable[..., Any]:
+        return self.callback
+
+    @property
+    def dropped(self) -> int:
+        return 0
+
+    def cancel(self) -> None:
+        self._bus.unsubscribe(self)
+
+    def close(self, timeout_s: float = 2.0) -> None:
+        pass
+
+
+class QueuedSubscription(Subscription):
+    """A subscriber called on its own thread from a bounded queue.
+
+    Publishing only appends to the queue. When the subscriber falls behind
+    and the queue is full, the oldest event is dropped and counted in
+    `dropped`. `close()` delivers what is still queued, then stops the
+    thread. The callback must be safe to call from that thread.
+    """
+
+    def __init__(
+        self,
+        bus: EventBus,
+        topic: Topic,
+        callback: Callable[..., Any],
+        priority: int,
+        name: str,
+        queue_size: int,
+    ) -> None:
+        super().__init__(bus, topic, callback, priority, name)
+        self._logger = get_logger(f"{self.__class__.__name__}[{name}]")
+        self._queue: deque[tuple[Callable[..., Any], tuple]] = deque(maxlen=queue_size)
+        self._ready = threading.Condition()
+        self._closed = False
+        self._dropped = 0
+        self._thread = threading.Thread(target=self._run, name=f"events-{name}", daemon=True)
+        self._thread.start()
+
+    @property
+    def deliver(self) -> Callable[..., Any]:
+        return self._put
+
+    @property
+    def dropped(self) -> int:
+        return self._dropped
+
+    @property
+    def pending(self) -> int:
+        return len(self._queue)
+
+    def close(self, timeout_s: float = 2.0) -> None:
+        with self._ready:
+            self._closed = True
+            self._ready.notify()
+        if self._thread is not threading.current_thread():
+            self._thread.join(timeout_s)
+            if self._thread.is_alive():
+                self._logger.warning("Subscriber still busy after %.1f s; %d events left", timeout_s, self.pending)
+
+    def _put(self, *args: Any) -> None:
+        with self._ready:
+            if self._closed:
+                return
+            if len(self._queue) == self._queue.maxlen:
+                self._dropped += 1
+            # Carry the trace event across the thread hop.
+            self._queue.append((tracer.bind(self.callback), args))
+            self._ready.notify()
+
+    def _run(self) -> None:
+        while True:
+            with self._ready:
+                while not self._queue and not self._closed:
+                    self._ready.wait()
+                if not self._queue:
+                    return
+                callback, args = self._queue.popleft()
+            try:
+                callback(*args)
+            except Exception as exc:
+                self.errors += 1
+                self._logger.exception("Subscriber of %s failed: %s", self.topic.name, exc)
+
+
+class EventBus:
+    """Publishes controller events to any number of subscribers.
+
+    Each topic keeps its subscribers sorted by priority in a tuple that is
+    replaced, never modified, when someone subscribes or unsubscribes, so
+    `publish` takes no lock and subscribing is safe from any thread. A
+    subscriber that raises is logged and counted; the others still run.
+    Inline subscribers delay everything published after them, so anything
+    slow (a disk writer, a network exporter) should subscribe with a
+    `queue_size`.
+    """
+
+    def __init__(self) -> None:
+        self._logger = get_logger(self.__class__.__name__)
+        self._lock = threading.Lock()
+        self._subscriptions: dict[Topic, list[Subscription]] = {}
+        self._routes: dict[Topic, tuple[tuple[Callable[..., Any], Subscription], ...]] = {}
+
+    def subscribe(
+        self,
+        topic: Topic[P],
+        callback: Callable[P, Any],
+        priority: int = PRIORITY_DEFAULT,
+        queue_size: int = 0,
+        name: Optional[str] = None,
+    ) -> Subscription:
+        """Call `callback` for every event of `topic`.
+
+        With `queue_size` 0 it is called inline by `publish`; otherwise on a
+        thread of its own through a queue of that many events (see
+        QueuedSubscription).
+        """
+        name = name or getattr(callback, "__qualname__", repr(callback))
+        if queue_size > 0:
+            subscription: Subscription = QueuedSubscription(self, topic, callback, priority, name, queue_size)
+        else:
+            subscription = Subscription(self, topic, callback, priority, name)
+        with self._lock:
+            self._subscriptions.setdefault(topic, []).append(subscription)
+            self._route(topic)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            subscriptions = self._subscriptions.get(subscription.topic, [])
+            if subscription not in subscriptions:
+                return
+            subscriptions.remove(subscription)
+            self._route(subscription.topic)
+        subscription.close()
+
+    def publish(self, topic: Topic[P], *args: Any) -> None:
+        for deliver, subscription in self._routes.get(topic, ()):
+            try:
+                deliver(*args)
+            except Exception as exc:
+                subscription.errors += 1
+                self._logger.exception("Subscriber %s of %s failed: %s", subscription.name, topic.name, exc)
+
+    def subscriptions(self, topic: Topic | None = None) -> list[Subscription]:
+        """Subscribers of `topic` (of all topics if None), in call order."""
+        routes = self._routes.values() if topic is None else [self._routes.get(topic, ())]
+        return [subscription for route in routes for _, subscription in route]
+
+    @property
+    def dropped(self) -> int:
+        return sum(subscription.dropped for subscription in self.subscriptions())
+
+    @property
+    def errors(self) -> int:
+        return sum(subscription.errors for subscription in self.subscriptions())
+
+    def close(self, timeout_s: float = 2.0) -> None:
+        """Drain and stop the queued subscribers; inline ones stay subscribed."""
+        for subscription in self.subscriptions():
+            subscription.close(timeout_s)
+
+    def _route(self, topic: Topic) -> None:
+        ordered = sorted(self._subscriptions[topic], key=lambda subscription: -subscription.priority)
+        self._routes[topic] = tuple((subscription.deliver, subscription) for subscription in ordered)
+
+
+# Events of AppController, in the order they are listed in the README.
+RADIO_INFO: Topic[[RadioInfo]] = Topic("radio_info")  # every parsed RadioInfo frame
+WS_MESSAGE: Topic[[str]] = Topic("ws_message")  # every text frame from a bridge, before parsing
+WS_STATUS: Topic[[dict]] = Topic("ws_status")  # merged status fields that a frame changed
+BRIDGE_ERROR: Topic[[str]] = Topic("bridge_error")  # `{"error": ...}` frame from a bridge
+WS_ERROR: Topic[[str]] = Topic("ws_error")
+WS_DISCONNECTED: Topic[[]] = Topic("ws_disconnected")
+WS_SEND_FAILED: Topic[[str]] = Topic("ws_send_failed")
+WS_RTT: Topic[[float, float]] = Topic("ws_rtt")  # round trip and jitter (ms) to the first bridge
+COMMAND_SENT: Topic[[str]] = Topic("command_sent")
+COMMAND_CONFIRMED: Topic[[str, float]] = Topic("command_confirmed")  # command, latency (ms)
+COMMAND_FAILED: Topic[[str, str]] = Topic("command_failed")  # command, reason
+BUSY: Topic[[bool]] = Topic("busy")  # commands in flight or not
+SELECTION: Topic[[Rig, int, AntennaRule | None]] = Topic("selection")  # antenna submitted; rule None = manual
+SETTINGS: Topic[[AppSettings]] = Topic("settings")  # applied after a reload
+CONFIG_ERROR: Topic[[str]] = Topic("config_error")
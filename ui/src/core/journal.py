@@ -0,0 +1,430 @@
+from __future__ import annotations
+
+import mmap
+import queue
+import struct
+import threading
+import time
+from bisect import bisect_left
+from enum import IntEnum
+from pathlib import Path
+from typing import BinaryIO, Callable, Iterable, Iterator, NamedTuple, Optional, Union
+
+from core.logging_setup import get_logger
+from core.status_codec import antenna_byte, antenna_text
+
+MAGIC = b"RSJRNL\x00\x01"
+RECORD_SIZE = 32
+_HEADER = struct.Struct("<8sdI12x")  # magic, wall-clock start (s), record size; padded to one record
+SEGMENT_SUFFIX = ".rsj"
+
+
+class JournalError(ValueError):
+    pass
+
+
+class JournalKind(IntEnum):
+    FREQ = 1
+    SELECTION = 2
+    STATUS = 3
+    CONNECTION = 4
+
+
+class SelectionSource(IntEnum):
+    MANUAL = 0
+    AUTO = 1
+
+
+# Every record is `<f64 wall-clock time><u8 kind>` and a kind-specific body, padded to RECORD_SIZE.
+_FREQ = struct.Struct("<dBcI8s10x")  # rig, frequency (kHz), mode
+_SELECTION = struct.Struct("<dBcBBhI14x")  # rig, antenna, source, rule position (-1 = none), frequency (kHz)
+# bridge, antenna of rig A and B, rssi, snr, lrssi, pwr, cmds, i2cs, unknown antennas (bit 0 = A, bit 1 = B)
+_STATUS = struct.Struct("<dBBBBhbhBBBB11x")
+_CONNECTION = struct.Struct("<dBBB12sI5x")  # bridge, connected (0/1), state name, outage before connecting (ms)
+_TIME = struct.Struct("<d")
+assert all(layout.size == RECORD_SIZE for layout in (_HEADER, _FREQ, _SELECTION, _STATUS, _CONNECTION))
+
+
+class FreqRecord(NamedTuple):
+    t: float
+    rig: str
+    freq: int
+    mode: str
+
+
+class SelectionRecord(NamedTuple):
+    t: float
+    rig: str
+    antenna: int
+    source: SelectionSource
+    rule: int
+    freq: int
+
+
+class StatusRecord(NamedTuple):
+    """Bridge status; `a`/`b` are the rigs' antennas over all bridges, in UI numbering.
+
+    `?` means no bridge reported the rig's antenna.
+    """
+
+    t: float
+    bridge: int
+    a: str
+    b: str
+    rssi: int
+    snr: int
+    lrssi: int
+    pwr: int
+    cmds: int
+    i2cs: int
+
+
+class ConnectionRecord(NamedTuple):
+    t: float
+    bridge: int
+    connected: bool
+    state: str
+    outage_ms: int
+
+
+JournalRecord = Union[FreqRecord, SelectionRecord, StatusRecord, ConnectionRecord]
+RECORD_TYPES: dict[JournalKind, type] = {
+    JournalKind.FREQ: FreqRecord,
+    JournalKind.SELECTION: SelectionRecord,
+    JournalKind.STATUS: StatusRecord,
+    JournalKind.CONNECTION: ConnectionRecord,
+}
+
+
+_KINDS = {record_type: kind for kind, record_type in RECORD_TYPES.items()}
+
+
+def record_kind(record: JournalRecord) -> JournalKind:
+    return _KINDS[type(record)]
+
+
+def _decode(data: bytes | mmap.mmap, offset: int) -> JournalRecord:
+    kind = data[offset + 8]
+    if kind == JournalKind.FREQ:
+        t, _, rig, freq, mode = _FREQ.unpack_from(data, offset)
+        return FreqRecord(t, rig.decode(), freq, mode.rstrip(b"\0").decode("ascii", "replace"))
+    if kind == JournalKind.SELECTION:
+        t, _, rig, antenna, source, rule, freq = _SELECTION.unpack_from(data, offset)
+        return SelectionRecord(t, rig.decode(), antenna, SelectionSource(source), rule, freq)
+    if kind == JournalKind.STATUS:
+        t, _, bridge, a, b, rssi, snr, lrssi, pwr, cmds, i2cs, unknown = _STATUS.unpack_from(data, offset)
+        a_text = "?" if unknown & 1 else antenna_text(a)
+        b_text = "?" if unknown & 2 else antenna_text(b)
+        return StatusRecord(t, bridge, a_text, b_text, rssi, snr, lrssi, pwr, cmds, i2cs)
+    if kind == JournalKind.CONNECTION:
+        t, _, bridge, connected, state, outage_ms = _CONNECTION.unpack_from(data, offset)
+        return ConnectionRecord(t, bridge, bool(connected), state.rstrip(b"\0").decode("ascii", "replace"), outage_ms)
+    raise JournalError(f"unknown record kind {kind}")
+
+
+def _clamp(value: float, low: int, high: int) -> int:
+    return max(low, min(high, int(value)))
+
+
+class JournalWriter:
+    """Appends fixed-size event records to segment files in a directory.
+
+    The record methods can be called from any thread: they pack the record
+    and queue it. A background thread writes batches, flushes them (so
+    readers see them at once), starts a new segment every `segment_records`
+    records and deletes the oldest segments beyond `max_segments`
+    (0 = keep all); one that cannot be deleted yet is tried again at the
+    next segment. A write error is logged and later records are dropped.
+    """
+
+    def __init__(self, directory: str | Path, segment_records: int = 262144, max_segments: int = 64) -> None:
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._segment_records = max(1, segment_records)
+        self._max_segments = max(0, max_segments)
+        self._logger = get_logger(self.__class__.__name__)
+        self._queue: queue.SimpleQueue[bytes | None] = queue.SimpleQueue()
+        self._file: BinaryIO | None = None
+        self._in_segment = 0
+        self._closed = False
+        self.records = 0
+        self.written = 0
+        self.dropped = 0
+        self.segments = 0
+        self._thread = threading.Thread(target=self._run, name="journal", daemon=True)
+        self._thread.start()
+
+    def freq(self, rig: str, freq_khz: int, mode: str, t: float | None = None) -> None:
+        self._put(
+            _FREQ.pack(
+                time.time() if t is None else t,
+                JournalKind.FREQ,
+                rig.encode()[:1],
+                _clamp(freq_khz, 0, 0xFFFFFFFF),
+                mode.encode("ascii", "replace")[:8],
+            )
+        )
+
+    def selection(
+        self, rig: str, antenna: int, source: SelectionSource, rule: int, freq_khz: int, t: float | None = None
+    ) -> None:
+        self._put(
+            _SELECTION.pack(
+                time.time() if t is None else t,
+                JournalKind.SELECTION,
+                rig.encode()[:1],
+                _clamp(antenna, 0, 0xFF),
+                source,
+                _clamp(rule, -1, 0x7FFF),
+                _clamp(freq_khz, 0, 0xFFFFFFFF),
+            )
+        )
+
+    def status(self, bridge: int, a: str, b: str, status: dict, t: float | None = None) -> None:
+        """`status` as the bridge sends it; `a`/`b` the rigs' antennas in UI numbering, "" if unknown."""
+        self._put(
+            _STATUS.pack(
+                time.time() if t is None else t,
+                JournalKind.STATUS,
+                bridge,
+                antenna_byte(a),
+                antenna_byte(b),
+                _clamp(status.get("rssi", 0), -0x8000, 0x7FFF),
+                _clamp(status.get("snr", 0), -0x80, 0x7F),
+                _clamp(status.get("lrssi", 0), -0x8000, 0x7FFF),
+                _clamp(status.get("pwr", 0), 0, 0xFF),
+                _clamp(status.get("cmds", 0), 0, 0xFF),
+                _clamp(status.get("i2cs", 0), 0, 0xFF),
+                (not a) | (not b) << 1,
+            )
+        )
+
+    def connection(
+        self, bridge: int, connected: bool, state: str, outage_ms: float = 0.0, t: float | None = None
+    ) -> None:
+        self._put(
+            _CONNECTION.pack(
+                time.time() if t is None else t,
+                JournalKind.CONNECTION,
+                bridge,
+                connected,
+                state.encode("ascii", "replace")[:12],
+                _clamp(outage_ms, 0, 0xFFFFFFFF),
+            )
+        )
+
+    def close(self) -> None:
+        """Write what is queued and stop the writer thread."""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(None)
+        self._thread.join()
+
+    def _put(self, record: bytes) -> None:
+        if not self._closed:
+            self._queue.put(record)
+            self.records += 1
+
+    def _run(self) -> None:
+        stop = False
+        while not stop:
+            batch = [self._queue.get()]
+            try:
+                while len(batch) < 4096:
+                    batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                pass
+            if batch[-1] is None:
+                batch.pop()
+                stop = True
+            self._write([record for record in batch if record is not None])
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _write(self, records: list[bytes]) -> None:
+        if self.dropped:
+            self.dropped += len(records)
+            return
+        while records:
+            try:
+                if self._file is None or self._in_segment >= self._segment_records:
+                    self._open_segment(_TIME.unpack_from(records[0])[0])
+                chunk = records[: self._segment_records - self._in_segment]
+                self._file.write(b"".join(chunk))
+                self._file.flush()
+            except OSError as exc:
+                self._logger.error("Journal write failed, journal stopped: %s", exc)
+                self.dropped += len(records)
+                return
+            records = records[len(chunk) :]
+            self._in_segment += len(chunk)
+            self.written += len(chunk)
+
+    def _open_segment(self, t: float) -> None:
+        if self._file is not None:
+            self._file.close()
+        stem = time.strftime("journal-%Y%m%d-%H%M%S", time.localtime(t))
+        path = self.directory / f"{stem}{SEGMENT_SUFFIX}"
+        serial = 1
+        while path.exists():
+            path = self.directory / f"{stem}-{serial}{SEGMENT_SUFFIX}"
+            serial += 1
+        self._file = path.open("wb")
+        self._file.write(_HEADER.pack(MAGIC, t, RECORD_SIZE))
+        self._in_segment = 0
+        self.segments += 1
+        self._logger.info("Journal segment %s", path)
+        if self._max_segments:
+            for old in segment_paths(self.directory)[: -self._max_segments]:
+                try:
+                    old.unlink(missing_ok=True)
+                except OSError as exc:
+                    # E.g. Windows refuses while a reader has the segment mapped; retried at the next segment.
+                    self._logger.warning("Journal segment %s not deleted: %s", old, exc)
+
+
+def segment_paths(directory: str | Path) -> list[Path]:
+    """Segment files of a journal directory, oldest (last written) first."""
+    return sorted(Path(directory).glob(f"journal-*{SEGMENT_SUFFIX}"), key=lambda path: path.stat().st_mtime)
+
+
+class _Segment:
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        with path.open("rb") as handle:
+            size = path.stat().st_size
+            if size < _HEADER.size:
+                raise JournalError(f"{path}: too short for a journal header")
+            self.map = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.start, record_size = _HEADER.unpack_from(self.map, 0)
+        if magic != MAGIC or record_size != RECORD_SIZE:
+            self.map.close()
+            raise JournalError(f"{path}: not a journal segment")
+        # A record cut short by a crash is ignored.
+        self.count = (size - _HEADER.size) // RECORD_SIZE
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __getitem__(self, index: int) -> float:
+        return _TIME.unpack_from(self.map, _HEADER.size + index * RECORD_SIZE)[0]
+
+    def offset(self, index: int) -> int:
+        return _HEADER.size + index * RECORD_SIZE
+
+
+class JournalReader:
+    """Memory-maps the segments of a journal directory and reads time ranges.
+
+    Records in a segment are in time order, so a range is found with a
+    binary search over the mapped timestamps; only the pages that are read
+    are loaded. Segments are mapped at their size when the reader opens, so
+    records written afterwards need a new reader.
+    """
+
+    def __init__(self, directory: str | Path) -> None:
+        self.directory = Path(directory)
+        self._logger = get_logger(self.__class__.__name__)
+        self._segments: list[_Segment] = []
+        for path in segment_paths(self.directory):
+            try:
+                self._segments.append(_Segment(path))
+            except (OSError, JournalError, ValueError) as exc:
+                self._logger.warning("Skipping journal segment %s: %s", path, exc)
+        self._segments.sort(key=lambda segment: segment.start)
+
+    def __len__(self) -> int:
+        return sum(segment.count for segment in self._segments)
+
+    def records(
+        self, start: float | None = None, end: float | None = None, kinds: Iterable[JournalKind] | None = None
+    ) -> Iterator[JournalRecord]:
+        """Records with `start <= t < end`, oldest first."""
+        wanted = None if kinds is None else {int(kind) for kind in kinds}
+        for position, segment in enumerate(self._segments):
+            following = self._segments[position + 1] if position + 1 < len(self._segments) else None
+            if start is not None and following is not None and following.start <= start:
+                continue
+            if end is not None and segment.start >= end:
+                break
+            first = bisect_left(segment, start) if start is not None else 0
+            last = bisect_left(segment, end) if end is not None else segment.count
+            data = segment.map
+            for index in range(first, last):
+                offset = segment.offset(index)
+                if wanted is None or data[offset + 8] in wanted:
+                    yield _decode(data, offset)
+
+    def latest(
+        self, before: float, kind: JournalKind, match: Optional[Callable[[JournalRecord], bool]] = None
+    ) -> JournalRecord | None:
+        """The last record of `kind` before `before` (and accepted by `match`), searching backwards."""
+        for segment in reversed(self._segments):
+            if segment.start >= before:
+                continue
+            data = segment.map
+            for index in range(bisect_left(segment, before) - 1, -1, -1):
+                offset = segment.offset(index)
+                if data[offset + 8] == kind:
+                    record = _decode(data, offset)
+                    if match is None or match(record):
+                        return record
+        return None
+
+    def buffers(self) -> Iterator[tuple[mmap.mmap, int, int]]:
+        """`(map, offset of the first record, record count)` per segment, oldest first.
+
+        For bulk readers that decode whole segments at once, e.g. with a
+        NumPy structured dtype. Views into a map must be released before
+        `close()`.
+        """
+        for segment in self._segments:
+            yield segment.map, _HEADER.size, segment.count
+
+    def close(self) -> None:
+        for segment in self._segments:
+            segment.map.close()
+        self._segments.clear()
+
+    def __enter__(self) -> JournalReader:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+
+def antenna_usage(
+    reader: JournalReader, rig: str, start: float, end: float, min_khz: int = 0, max_khz: int = 0xFFFFFFFF
+) -> dict[str, float]:
+    """Seconds each antenna was on `rig` while its frequency was in `[min_khz, max_khz)`.
+
+    Antennas are as in the status (`-` = off); `?` covers time while a
+    bridge was not connected, no bridge reported the rig's antenna or
+    before the first status.
+    """
+    usage: dict[str, float] = {}
+    freq_record = reader.latest(start, JournalKind.FREQ, lambda record: record.rig == rig)
+    status_record = reader.latest(start, JournalKind.STATUS)
+    connection = reader.latest(start, JournalKind.CONNECTION)
+    freq = freq_record.freq if freq_record else None
+    antenna = "?"
+    if status_record and (connection is None or connection.connected or connection.t < status_record.t):
+        antenna = status_record.a if rig == "A" else status_record.b
+    since = start
+    for record in reader.records(start, end, (JournalKind.FREQ, JournalKind.STATUS, JournalKind.CONNECTION)):
+        if isinstance(record, FreqRecord) and record.rig != rig:
+            continue
+        if freq is not None and min_khz <= freq < max_khz:
+            usage[antenna] = usage.get(antenna, 0.0) + record.t - since
+        since = record.t
+        if isinstance(record, FreqRecord):
+            freq = record.freq
+        elif isinstance(record, StatusRecord):
+            antenna = record.a if rig == "A" else record.b
+        elif not record.connected:
+            antenna = "?"
+    if freq is not None and min_khz <= freq < max_khz:
+        usage[antenna] = usage.get(antenna, 0.0) + end - since
+    return usage
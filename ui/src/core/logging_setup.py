@@ -1,11 +1,136 @@
 from __future__ import annotations
 
+import atexit
+import gzip
+import json
 import logging
+import logging.handlers
+import os
+import queue
+import shutil
+import threading
 from pathlib import Path
-from typing import Iterable
+from typing import TYPE_CHECKING, Iterable
 
+if TYPE_CHECKING:
+    from config.settings import AppSettings
 
-def configure_logging(level: str, console: bool = True, file_path: str | None = None) -> None:
+LOG_FORMAT = "%(asctime)s [%(levelname)s] %(name)s: %(message)s"
+
+_listener: logging.handlers.QueueListener | None = None
+
+
+class JsonLinesFormatter(logging.Formatter):
+    """One compact JSON object per record."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": round(record.created, 6),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry, separators=(",", ":"), ensure_ascii=False)
+
+
+class RateLimitFilter(logging.Filter):
+    """Caps DEBUG records per message template to `per_second`.
+
+    The per-message debug lines (one per datagram or WebSocket frame) share a
+    template, so a VFO sweep collapses into a few lines per second. The next
+    record that passes carries the number of suppressed ones. Templates not
+    logged for over a second are forgotten, together with a count that no
+    record has reported yet. Records arrive from every thread that logs, so
+    the windows are guarded by a lock.
+    """
+
+    def __init__(self, per_second: int) -> None:
+        super().__init__()
+        self._per_second = per_second
+        # (logger, template) -> [window start, passed, suppressed, last record]
+        self._windows: dict[tuple[str, object], list] = {}
+        self._swept = 0.0
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno > logging.DEBUG:
+            return True
+        key = (record.name, record.msg)
+        now = record.created
+        with self._lock:
+            window = self._windows.get(key)
+            if window is None or now - window[0] >= 1.0:
+                suppressed = window[2] if window is not None else 0
+                self._windows[key] = [now, 1, 0, now]
+                passed = True
+            else:
+                suppressed = 0
+                window[3] = now
+                passed = window[1] < self._per_second
+                window[1 if passed else 2] += 1
+            if now - self._swept >= 1.0:
+                self._sweep(now)
+        if suppressed:
+            # Plain text, not `%d`: getMessage() leaves the template alone while args is empty.
+            record.msg = f"{record.msg} (+{suppressed} similar suppressed)"
+        return passed
+
+    def _sweep(self, now: float) -> None:
+        self._swept = now
+        idle = [key for key, window in self._windows.items() if now - window[3] > 1.0]
+        for key in idle:
+            del self._windows[key]
+
+
+def _gzip_namer(name: str) -> str:
+    return f"{name}.gz"
+
+
+def _gzip_rotator(source: str, dest: str) -> None:
+    with open(source, "rb") as src, gzip.open(dest, "wb") as dst:
+        shutil.copyfileobj(src, dst)
+    os.remove(source)
+
+
+def _file_handler(
+    path: Path,
+    max_bytes: int,
+    rotate_when: str | None,
+    backup_count: int,
+    compress: bool,
+) -> logging.Handler:
+    if rotate_when:
+        handler: logging.FileHandler = logging.handlers.TimedRotatingFileHandler(
+            path, when=rotate_when, backupCount=backup_count, encoding="utf-8"
+        )
+    elif max_bytes > 0:
+        handler = logging.handlers.RotatingFileHandler(
+            path, maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8"
+        )
+    else:
+        return logging.FileHandler(path, encoding="utf-8")
+    if compress:
+        handler.namer = _gzip_namer
+        handler.rotator = _gzip_rotator
+    return handler
+
+
+def configure_logging(
+    level: str,
+    console: bool = True,
+    file_path: str | None = None,
+    *,
+    use_queue: bool = False,
+    max_bytes: int = 0,
+    rotate_when: str | None = None,
+    backup_count: int = 5,
+    compress: bool = False,
+    json_lines: bool = False,
+    debug_rate_limit: int = 0,
+) -> None:
+    global _listener
     handlers: list[logging.Handler] = []
 
     if console:
@@ -16,14 +141,55 @@ def configure_logging(level: str, console: bool = True, file_path: str | None =
         if not path.is_absolute():
             path = Path.cwd() / path
         path.parent.mkdir(parents=True, exist_ok=True)
-        handlers.append(logging.FileHandler(path, encoding="utf-8"))
+        handlers.append(_file_handler(path, max_bytes, rotate_when, backup_count, compress))
+
+    formatter = JsonLinesFormatter() if json_lines else logging.Formatter(LOG_FORMAT)
+    for handler in handlers:
+        handler.setFormatter(formatter)
 
-    logging.basicConfig(
-        level=level.upper(),
-        format="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
-        handlers=handlers or None,
+    front: list[logging.Handler] = handlers
+    if use_queue and handlers:
+        # Records are queued on the calling (GUI) thread; formatting, disk
+        # writes and rotation happen on the listener thread.
+        shutdown_logging()
+        log_queue: queue.SimpleQueue = queue.SimpleQueue()
+        _listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+        _listener.start()
+        atexit.register(shutdown_logging)
+        queue_handler = logging.handlers.QueueHandler(log_queue)
+        # prepare() merges args into the message; the real format is applied by the listener.
+        queue_handler.setFormatter(logging.Formatter("%(message)s"))
+        front = [queue_handler]
+
+    if debug_rate_limit > 0:
+        for handler in front:
+            handler.addFilter(RateLimitFilter(debug_rate_limit))
+
+    logging.basicConfig(level=level.upper(), handlers=front or None, force=True)
+
+
+def configure_logging_from_settings(settings: AppSettings) -> None:
+    configure_logging(
+        settings.log_level,
+        settings.log_console,
+        settings.log_file,
+        use_queue=settings.log_async,
+        max_bytes=settings.log_max_bytes,
+        rotate_when=settings.log_rotate_when,
+        backup_count=settings.log_backup_count,
+        compress=settings.log_compress,
+        json_lines=settings.log_format == "jsonl",
+        debug_rate_limit=settings.log_debug_rate_limit,
     )
 
 
+def shutdown_logging() -> None:
+    """Flush and stop the background log writer, if one is running."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
 def get_logger(name: str) -> logging.Logger:
     return logging.getLogger(name)
@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+import math
+from bisect import bisect_left
+from typing import Callable, Iterable, Union
+
+# Seconds; covers parse times (µs) up to bridge round trips (seconds).
+DEFAULT_BUCKETS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Counter:
+    """Monotonic counter owned by one thread; `inc` is a plain attribute add."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, help_text: str) -> None:
+        self.name = name
+        self.help = help_text
+        self.value = 0
+
+    def inc(self, amount: int = 1) -> None:
+        self.value += amount
+
+    def read(self) -> float:
+        return self.value
+
+
+class Gauge:
+    kind = "gauge"
+
+    def __init__(self, name: str, help_text: str) -> None:
+        self.name = name
+        self.help = help_text
+        self.value = 0.0
+
+    def set(self, value: float) -> None:
+        self.value = value
+
+    def read(self) -> float:
+        return self.value
+
+
+class CallbackMetric:
+    """Counter or gauge read from existing state at scrape time; free on the hot path."""
+
+    def __init__(self, kind: str, name: str, help_text: str, read: Callable[[], float]) -> None:
+        self.kind = kind
+        self.name = name
+        self.help = help_text
+        self.read = read
+
+
+class Histogram:
+    """Fixed-bucket histogram.
+
+    `observe` bumps one slot of a preallocated list, so it takes no lock and
+    allocates nothing beyond the float sum. Buckets are made cumulative only
+    when rendered.
+    """
+
+    kind = "histogram"
+
+    def __init__(self, name: str, help_text: str, buckets: Iterable[float] = DEFAULT_BUCKETS) -> None:
+        self.name = name
+        self.help = help_text
+        self.buckets = tuple(sorted(buckets))
+        self._counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self._counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def read(self) -> float:
+        """Mean of the observations, 0 if none."""
+        return self.sum / self.count if self.count else 0.0
+
+    def cumulative(self) -> list[tuple[float, int]]:
+        counts = list(self._counts)
+        total = 0
+        result = []
+        for bound, count in zip((*self.buckets, math.inf), counts):
+            total += count
+            result.append((bound, total))
+        return result
+
+
+Metric = Union[Counter, Gauge, CallbackMetric, Histogram]
+
+
+class MetricsRegistry:
+    """Named metrics with Prometheus text rendering.
+
+    Metrics are updated by the thread that owns the component (GUI or
+    controller thread) and only read by scrapes, so no locking is needed.
+    """
+
+    def __init__(self, prefix: str = "remote_switch_") -> None:
+        self._prefix = prefix
+        self._metrics: dict[str, Metric] = {}
+
+    def counter(self, name: str, help_text: str) -> Counter:
+        return self._add(Counter(self._prefix + name, help_text))
+
+    def gauge(self, name: str, help_text: str) -> Gauge:
+        return self._add(Gauge(self._prefix + name, help_text))
+
+    def histogram(self, name: str, help_text: str, buckets: Iterable[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._add(Histogram(self._prefix + name, help_text, buckets))
+
+    def counter_callback(self, name: str, help_text: str, read: Callable[[], float]) -> CallbackMetric:
+        return self._add(CallbackMetric("counter", self._prefix + name, help_text, read))
+
+    def gauge_callback(self, name: str, help_text: str, read: Callable[[], float]) -> CallbackMetric:
+        return self._add(CallbackMetric("gauge", self._prefix + name, help_text, read))
+
+    def snapshot(self) -> dict[str, float]:
+        """Current value per metric name, without the prefix; histograms report their mean."""
+        cut = len(self._prefix)
+        return {name[cut:]: _read(metric) for name, metric in self._metrics.items()}
+
+    def render(self) -> str:
+        """Prometheus text exposition format 0.0.4."""
+        lines: list[str] = []
+        for name, metric in self._metrics.items():
+            lines.append(f"# HELP {name} {metric.help}")
+            lines.append(f"# TYPE {name} {metric.kind}")
+            if isinstance(metric, Histogram):
+                for bound, count in metric.cumulative():
+                    lines.append(f'{name}_bucket{{le="{_format(bound)}"}} {count}')
+                lines.append(f"{name}_sum {_format(metric.sum)}")
+                lines.append(f"{name}_count {metric.count}")
+            else:
+                lines.append(f"{name} {_format(_read(metric))}")
+        return "\n".join(lines) + "\n"
+
+    def _add(self, metric: Metric) -> Metric:
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric already registered: {metric.name}")
+        self._metrics[metric.name] = metric
+        return metric
+
+
+def _read(metric: Metric) -> float:
+    try:
+        return float(metric.read())
+    except (TypeError, ValueError):
+        return math.nan
+
+
+def _format(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if math.isnan(value):
+        return "NaN"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
@@ -1,7 +1,11 @@
 from __future__ import annotations
 
+from collections import OrderedDict
 from dataclasses import dataclass
 from enum import Enum
+import re
+from typing import Callable
+from xml.sax.saxutils import unescape
 import xml.etree.ElementTree as ET
 
 
@@ -14,8 +18,8 @@ class Rig(str, Enum):
 class RadioInfo:
     station_name: str
     radio_nr: int
-    freq: int
-    tx_freq: int
+    freq: float  # kHz
+    tx_freq: float
     mode: str
     op_call: str
     is_running: bool
@@ -46,7 +50,7 @@ def _to_bool(value: str) -> bool:
     return value.strip().lower() in TRUE_VALUES
 
 
-def parse_radio_info(xml_payload: str) -> RadioInfo:
+def parse_radio_info(xml_payload: str | bytes) -> RadioInfo:
     root = ET.fromstring(xml_payload)
 
     def text(name: str, default: str = "") -> str:
@@ -68,3 +72,154 @@ def parse_radio_info(xml_payload: str) -> RadioInfo:
         is_stereo=_to_bool(text("IsStereo", "false")),
         active_radio_nr=int(text("ActiveRadioNr", "0")),
     )
+
+
+_ROOT_RE = re.compile(
+    rb"(?:\xef\xbb\xbf)?\s*(?:<\?.*?\?>\s*)?(?:<!--.*?-->\s*)*<([A-Za-z_][\w.:-]*)",
+    re.DOTALL,
+)
+_TRUE_BYTES = frozenset(value.encode() for value in TRUE_VALUES)
+
+
+def _bytes_text(raw: bytes) -> str:
+    value = raw.decode("utf-8", errors="ignore").strip()
+    return unescape(value) if "&" in value else value
+
+
+def _bytes_int(raw: bytes) -> int:
+    return int(raw) if raw.strip() else 0
+
+
+def _bytes_bool(raw: bytes) -> bool:
+    return raw.strip().lower() in _TRUE_BYTES
+
+
+def _bytes_freq(raw: bytes) -> float:
+    return _bytes_int(raw) / 100
+
+
+# N1MM element name -> (RadioInfo field, converter).
+_FIELDS: dict[bytes, tuple[str, Callable[[bytes], object]]] = {
+    b"StationName": ("station_name", _bytes_text),
+    b"RadioNr": ("radio_nr", _bytes_int),
+    b"Freq": ("freq", _bytes_freq),
+    b"TXFreq": ("tx_freq", _bytes_freq),
+    b"Mode": ("mode", _bytes_text),
+    b"OpCall": ("op_call", _bytes_text),
+    b"IsRunning": ("is_running", _bytes_bool),
+    b"FocusEntry": ("focus_entry", _bytes_int),
+    b"Antenna": ("antenna", _bytes_int),
+    b"Rotors": ("rotors", _bytes_text),
+    b"FocusRadioNr": ("focus_radio_nr", _bytes_int),
+    b"IsStereo": ("is_stereo", _bytes_bool),
+    b"ActiveRadioNr": ("active_radio_nr", _bytes_int),
+}
+
+# Only the elements we map are matched; the rest of the frame is skipped by the regex engine.
+_ELEMENT_RE = re.compile(rb"<(" + b"|".join(_FIELDS) + rb")\s*(?:/>|>([^<]*)<)")
+
+_FIELD_DEFAULTS: dict[str, object] = {
+    "station_name": "",
+    "radio_nr": 0,
+    "freq": 0.0,
+    "tx_freq": 0.0,
+    "mode": "",
+    "op_call": "",
+    "is_running": False,
+    "focus_entry": 0,
+    "antenna": 0,
+    "rotors": "",
+    "focus_radio_nr": 0,
+    "is_stereo": False,
+    "active_radio_nr": 0,
+}
+
+
+def sniff_root_tag(payload: bytes) -> str | None:
+    """Return the root element name of an XML datagram without parsing it."""
+    match = _ROOT_RE.match(payload)
+    if match is None:
+        return None
+    return match.group(1).decode("ascii", errors="ignore")
+
+
+def parse_radio_info_bytes(payload: bytes) -> RadioInfo | None:
+    """Parse an N1MM RadioInfo datagram straight from bytes.
+
+    Returns None for other N1MM packet types (ContactInfo, spots, ...).
+    Raises ValueError if a RadioInfo packet carries malformed values.
+    """
+    root = _ROOT_RE.match(payload)
+    if root is None or root.group(1) != b"RadioInfo":
+        return None
+    if b"&#" in payload or b"<![CDATA[" in payload:
+        # Character references and CDATA (e.g. a non-ASCII station name) are left to ElementTree.
+        try:
+            return parse_radio_info(payload)
+        except ET.ParseError as exc:
+            raise ValueError(f"malformed RadioInfo: {exc}") from exc
+
+    values = dict(_FIELD_DEFAULTS)
+    for tag, raw in _ELEMENT_RE.findall(payload, root.end()):
+        name, convert = _FIELDS[tag]
+        values[name] = convert(raw)
+    return RadioInfo(**values)
+
+
+class RadioInfoParser:
+    """Bytes-level RadioInfo parser with a small repeat-payload cache.
+
+    While a VFO is spinning N1MM repeats identical RadioInfo frames; those are
+    answered from the cache without touching the XML again.
+    """
+
+    def __init__(self, cache_size: int = 8) -> None:
+        self._cache: OrderedDict[bytes, RadioInfo] = OrderedDict()
+        self._cache_size = max(0, cache_size)
+        self.parsed = 0
+        self.cache_hits = 0
+        self.rejected = 0
+        self.invalid = 0
+
+    def parse(self, payload: bytes) -> RadioInfo | None:
+        cached = self._cache.get(payload)
+        if cached is not None:
+            self._cache.move_to_end(payload)
+            self.cache_hits += 1
+            return cached
+
+        try:
+            info = parse_radio_info_bytes(payload)
+        except ValueError:
+            # A RadioInfo frame with a field that does not parse, e.g. a bad <Freq>.
+            self.invalid += 1
+            raise
+        if info is None:
+            self.rejected += 1
+            return None
+
+        self.parsed += 1
+        if self._cache_size:
+            self._cache[payload] = info
+            if len(self._cache) > self._cache_size:
+                self._cache.popitem(last=False)
+        return info
+
+    def clear(self) -> None:
+        self._cache.clear()
+
+
+_RADIO_NR_RE = re.compile(rb"<RadioNr>\s*(\d+)\s*<")
+
+
+def radio_nr_key(payload: bytes) -> int | None:
+    """Return the RadioNr of a RadioInfo datagram, or None for other packets.
+
+    Used as the UDP coalescing key, so it only looks at the root tag and the
+    RadioNr element instead of parsing the whole frame.
+    """
+    root = _ROOT_RE.match(payload)
+    if root is None or root.group(1) != b"RadioInfo":
+        return None
+    match = _RADIO_NR_RE.search(payload, root.end())
+    return int(match.group(1)) if match else 0
@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+import logging
+import time
+
+
+class StartupProfiler:
+    """Collects named marks relative to process start and logs a timeline.
+
+    Marks are cheap enough to leave in place when the profiler is disabled.
+    """
+
+    def __init__(self, enabled: bool, start: float | None = None) -> None:
+        self.enabled = enabled
+        self._start = start if start is not None else time.perf_counter()
+        self._marks: list[tuple[str, float]] = []
+        self._reported = False
+
+    def mark(self, name: str) -> None:
+        if self.enabled:
+            self._marks.append((name, time.perf_counter()))
+
+    def format(self) -> str:
+        lines = ["Startup timeline:"]
+        previous = self._start
+        for name, stamp in self._marks:
+            lines.append(
+                f"  {name:<18} {(stamp - self._start) * 1000:8.1f} ms  (+{(stamp - previous) * 1000:.1f} ms)"
+            )
+            previous = stamp
+        return "\n".join(lines)
+
+    def report(self, logger: logging.Logger) -> None:
+        if not self.enabled or self._reported:
+            return
+        self._reported = True
+        logger.info("%s", self.format())
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Optional
 
 from core.radio_info import RadioInfo
@@ -11,3 +11,4 @@ class AppState:
     connected: bool = False
     last_message: str = ""
     radio_info: Optional[RadioInfo] = None
+    ws_status: dict = field(default_factory=dict)  # merged bridge status frames
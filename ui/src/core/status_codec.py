@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import struct
+from typing import Any, Mapping
+
+# Offered as a WebSocket subprotocol; a bridge that accepts it sends status as binary frames.
+BINARY_STATUS_PROTOCOL = "remote-switch.status.v1"
+
+FULL = 0x53  # "S": every field present
+DELTA = 0x44  # "D": only the fields that changed since the previous frame on this connection
+
+# Field order and mask bits match ui.ws_status.WsField.
+_FIELDS = (
+    ("a", "B"),
+    ("b", "B"),
+    ("cmds", "B"),
+    ("i2cs", "B"),
+    ("rssi", "h"),
+    ("snr", "b"),
+    ("lrssi", "h"),
+    ("pwr", "B"),
+)
+ALL_FIELDS = (1 << len(_FIELDS)) - 1
+_ANTENNA_FIELDS = ("a", "b")
+_OFF = 0
+_NOT_CONNECTED = 0xFF
+
+_layouts: dict[int, tuple[struct.Struct, tuple[str, ...]]] = {}
+
+
+class StatusFrameError(ValueError):
+    """Raised for a binary status frame that does not follow the layout."""
+
+
+def _layout(mask: int) -> tuple[struct.Struct, tuple[str, ...]]:
+    layout = _layouts.get(mask)
+    if layout is None:
+        present = [(name, code) for bit, (name, code) in enumerate(_FIELDS) if mask & (1 << bit)]
+        layout = (struct.Struct(">" + "".join(code for _, code in present)), tuple(name for name, _ in present))
+        _layouts[mask] = layout
+    return layout
+
+
+def antenna_byte(value: Any) -> int:
+    """Status antenna (`-`, `1`..`254`, `NC`) as one byte."""
+    text = str(value)
+    if text == "-":
+        return _OFF
+    return int(text) if text.isdigit() else _NOT_CONNECTED
+
+
+def antenna_text(value: int) -> str:
+    if value == _OFF:
+        return "-"
+    return "NC" if value == _NOT_CONNECTED else str(value)
+
+
+def encode_status(status: Mapping[str, Any], previous: Mapping[str, Any] | None = None) -> bytes:
+    """Full frame for `status`, or a delta against `previous`.
+
+    `<u8 kind><u8 mask><fields in mask order>`, big endian: `a`/`b` as u8
+    (0 = `-`, 255 = `NC`), `cmds`/`i2cs`/`pwr` u8, `rssi`/`lrssi` i16,
+    `snr` i8.
+    """
+    if previous is None:
+        kind, mask = FULL, ALL_FIELDS
+    else:
+        kind, mask = DELTA, 0
+        for bit, (name, _) in enumerate(_FIELDS):
+            if status[name] != previous.get(name):
+                mask |= 1 << bit
+    layout, names = _layout(mask)
+    values = [antenna_byte(status[name]) if name in _ANTENNA_FIELDS else int(status[name]) for name in names]
+    return bytes((kind, mask)) + layout.pack(*values)
+
+
+def decode_status(frame: bytes) -> dict[str, Any]:
+    """Fields carried by a binary status frame, with `a`/`b` as in the JSON status."""
+    if len(frame) < 2 or frame[0] not in (FULL, DELTA):
+        raise StatusFrameError(f"not a status frame: {frame[:2].hex()}")
+    kind, mask = frame[0], frame[1]
+    if kind == FULL and mask != ALL_FIELDS:
+        raise StatusFrameError(f"full frame with field mask {mask:#04x}")
+    layout, names = _layout(mask)
+    if len(frame) != 2 + layout.size:
+        raise StatusFrameError(f"{len(frame)} bytes for field mask {mask:#04x}, expected {2 + layout.size}")
+    data = dict(zip(names, layout.unpack_from(frame, 2)))
+    for name in _ANTENNA_FIELDS:
+        if name in data:
+            data[name] = antenna_text(data[name])
+    return data
@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+from core.auto_rules import AntennaRule
+from core.radio_info import Rig
+
+
+@dataclass(frozen=True)
+class SwitchPolicyConfig:
+    hysteresis_khz: float = 0.0  # stay on the active rule this far past its edges
+    settle_ms: int = 0  # a new rule must hold this long before it is committed
+    max_commands_per_minute: int = 0  # token refill rate per rig; 0 = unlimited
+    command_burst: int = 3  # token bucket capacity per rig
+
+
+@dataclass
+class SwitchPolicyStats:
+    evaluations: int = 0
+    rule_changes: int = 0
+    commands: int = 0
+    held_by_hysteresis: int = 0
+    held_by_settle: int = 0
+    rate_limited: int = 0
+
+    @property
+    def saved_actuations(self) -> int:
+        """Rule changes that never turned into a relay command (and LoRa round trip)."""
+        return self.held_by_hysteresis + self.held_by_settle
+
+
+@dataclass(frozen=True)
+class SwitchDecision:
+    rule: AntennaRule | None  # rule that should be in force for the rig right now
+    recheck_ms: int = 0  # > 0: evaluate again after this delay even without new frames
+
+
+@dataclass
+class _RigState:
+    active: AntennaRule | None = None
+    candidate: AntennaRule | None = None
+    pending_since: float | None = None
+    tokens: float = 0.0
+    refilled_at: float = 0.0
+    rate_blocked: bool = False
+
+
+class SwitchPolicy:
+    """Boundary hysteresis, settle time and per-rig rate limiting for auto switching.
+
+    `evaluate` filters the rule lookup result and returns the rule that should
+    be in force; `acquire` must be granted before a command is sent.
+    """
+
+    def __init__(
+        self,
+        config: SwitchPolicyConfig,
+        clock: Optional[Callable[[], float]] = None,
+    ) -> None:
+        self._config = config
+        self._clock = clock or (lambda: time.monotonic() * 1000.0)
+        self._rigs: dict[Rig, _RigState] = {}
+        self.stats = SwitchPolicyStats()
+
+    @property
+    def config(self) -> SwitchPolicyConfig:
+        return self._config
+
+    def set_config(self, config: SwitchPolicyConfig) -> None:
+        """Takes effect from the next frame; committed rules and token buckets are kept."""
+        self._config = config
+
+    def reset(self, rig: Rig) -> None:
+        """Forget the committed rule, e.g. after the user takes manual control."""
+        state = self._rigs.get(rig)
+        if state is not None:
+            state.active = None
+            state.candidate = None
+            state.pending_since = None
+
+    def evaluate(self, rig: Rig, freq_khz: float, rule: AntennaRule | None) -> SwitchDecision:
+        now = self._clock()
+        state = self._state(rig, now)
+        self.stats.evaluations += 1
+        active = state.active
+
+        if rule is not None and rule == active:
+            state.candidate = rule
+            state.pending_since = None
+            return SwitchDecision(active)
+
+        hysteresis = self._config.hysteresis_khz
+        if (
+            active is not None
+            and hysteresis > 0
+            and active.min_freq - hysteresis <= freq_khz < active.max_freq + hysteresis
+        ):
+            if rule != state.candidate:
+                self.stats.held_by_hysteresis += 1
+            state.candidate = rule
+            state.pending_since = None
+            return SwitchDecision(active)
+
+        if rule is None:
+            # Outside every rule auto switching leaves the antenna alone, e.g. a manual selection.
+            state.active = None
+            state.candidate = None
+            state.pending_since = None
+            return SwitchDecision(None)
+
+        if rule != state.candidate:
+            if state.pending_since is not None:
+                # The previous candidate never settled, so its switch was saved.
+                self.stats.held_by_settle += 1
+            state.candidate = rule
+            state.pending_since = now
+        elif state.pending_since is None:
+            state.pending_since = now
+
+        remaining = self._config.settle_ms - (now - state.pending_since)
+        if remaining > 0:
+            return SwitchDecision(active, recheck_ms=int(remaining) + 1)
+
+        state.active = rule
+        state.pending_since = None
+        self.stats.rule_changes += 1
+        return SwitchDecision(rule)
+
+    def acquire(self, rig: Rig) -> int:
+        """Take a command token for `rig`.
+
+        Returns 0 when the command may be sent, otherwise the delay in ms
+        until the next token is available.
+        """
+        rate = self._config.max_commands_per_minute
+        if rate <= 0:
+            self.stats.commands += 1
+            return 0
+
+        now = self._clock()
+        state = self._state(rig, now)
+        per_ms = rate / 60000.0
+        capacity = max(1, self._config.command_burst)
+        state.tokens = min(capacity, state.tokens + (now - state.refilled_at) * per_ms)
+        state.refilled_at = now
+        if state.tokens >= 1.0:
+            state.tokens -= 1.0
+            state.rate_blocked = False
+            self.stats.commands += 1
+            return 0
+
+        if not state.rate_blocked:
+            state.rate_blocked = True
+            self.stats.rate_limited += 1
+        return int((1.0 - state.tokens) / per_ms) + 1
+
+    def _state(self, rig: Rig, now: float) -> _RigState:
+        state = self._rigs.get(rig)
+        if state is None:
+            state = _RigState(tokens=float(max(1, self._config.command_burst)), refilled_at=now)
+            self._rigs[rig] = state
+        return state
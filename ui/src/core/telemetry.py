@@ -0,0 +1,182 @@
+from __future__ import annotations
+
+import math
+from array import array
+from typing import Callable, Optional, Sequence
+
+# Bridge status fields kept in the history, in column order.
+FIELDS = ("rssi", "snr", "lrssi", "pwr", "cmds", "i2cs")
+
+
+class RingSeries:
+    """Fixed-capacity series of timestamped rows in preallocated arrays.
+
+    Appending to a full series drops the oldest row. Rows are addressed
+    oldest first; nothing is copied on append or read.
+    """
+
+    def __init__(self, capacity: int, columns: int) -> None:
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self.capacity = capacity
+        self.columns = columns
+        self._times = array("d", [math.nan]) * capacity
+        self._values = array("d", [math.nan]) * (capacity * columns)
+        self._start = 0
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    @property
+    def full(self) -> bool:
+        return self._count == self.capacity
+
+    def append(self, t: float, row: Sequence[float]) -> None:
+        if self.full:
+            self.drop_oldest()
+        slot = (self._start + self._count) % self.capacity
+        self._times[slot] = t
+        base = slot * self.columns
+        self._values[base : base + self.columns] = array("d", row)
+        self._count += 1
+
+    def drop_oldest(self) -> None:
+        if self._count:
+            self._start = (self._start + 1) % self.capacity
+            self._count -= 1
+
+    def time(self, index: int) -> float:
+        return self._times[self._slot(index)]
+
+    def value(self, index: int, column: int) -> float:
+        return self._values[self._slot(index) * self.columns + column]
+
+    def _slot(self, index: int) -> int:
+        if not 0 <= index < self._count:
+            raise IndexError(index)
+        return (self._start + index) % self.capacity
+
+
+class TelemetryLevel:
+    """One resolution of the history.
+
+    The raw level stores every sample, one column per field. A bucketed
+    level stores one row per `width_s` bucket, stamped with the bucket start:
+    the mean of every field, then the minimums, then the maximums.
+    """
+
+    def __init__(self, name: str, capacity: int, width_s: float = 0.0) -> None:
+        self.name = name
+        self.width_s = width_s
+        self.series = RingSeries(capacity, len(FIELDS) * (3 if width_s else 1))
+        self._on_append: Optional[Callable[[Callable[[], None]], None]] = None
+        self._bucket: float | None = None
+        self._held: list[float] | None = None
+        self._count = 0
+        self._sum = [0.0] * len(FIELDS)
+        self._min = [math.inf] * len(FIELDS)
+        self._max = [-math.inf] * len(FIELDS)
+
+    @property
+    def bucketed(self) -> bool:
+        return self.width_s > 0
+
+    def set_append_listener(self, listener: Callable[[Callable[[], None]], None]) -> None:
+        """`listener(append)` must call `append()`; lets a Qt model wrap it in begin/end calls."""
+        self._on_append = listener
+
+    def record(self, t: float, values: Sequence[float]) -> None:
+        if not self.bucketed:
+            self._append(t, values)
+            return
+        self.advance(t)
+        self._accumulate(values)
+        self._held = list(values)
+
+    def advance(self, t: float) -> None:
+        """Close the buckets that ended before `t`; without new samples they repeat the last value."""
+        if not self.bucketed:
+            return
+        start = math.floor(t / self.width_s) * self.width_s
+        if self._bucket is None:
+            self._bucket = start
+            return
+        if self._bucket < start and self._count:
+            self._close()
+            self._bucket += self.width_s
+            self._reset()
+        if self._held is None:
+            self._bucket = max(self._bucket, start)
+            return
+        # Filling a gap longer than the series would only overwrite itself.
+        self._bucket = max(self._bucket, start - self.series.capacity * self.width_s)
+        while self._bucket < start:
+            self._accumulate(self._held)
+            self._close()
+            self._bucket += self.width_s
+            self._reset()
+        if not self._count:
+            self._accumulate(self._held)
+
+    def interrupt(self) -> None:
+        """Stop repeating the last value, e.g. while the bridge is disconnected."""
+        self._held = None
+
+    def _accumulate(self, values: Sequence[float]) -> None:
+        self._count += 1
+        for column, value in enumerate(values):
+            self._sum[column] += value
+            if value < self._min[column]:
+                self._min[column] = value
+            if value > self._max[column]:
+                self._max[column] = value
+
+    def _reset(self) -> None:
+        self._count = 0
+        self._sum = [0.0] * len(FIELDS)
+        self._min = [math.inf] * len(FIELDS)
+        self._max = [-math.inf] * len(FIELDS)
+
+    def _close(self) -> None:
+        row = [total / self._count for total in self._sum] + self._min + self._max
+        self._append(self._bucket, row)
+
+    def _append(self, t: float, row: Sequence[float]) -> None:
+        def append() -> None:
+            self.series.append(t, row)
+
+        if self._on_append:
+            self._on_append(append)
+        else:
+            append()
+
+
+class TelemetryHistory:
+    """Link quality and power history of the bridge in fixed memory.
+
+    Samples go into a raw series and into 1 min and 15 min buckets with
+    min/max/mean. All series are preallocated, so memory does not grow
+    with run time. Between samples a bucketed level assumes the last value
+    still holds (the bridge only reports changes reliably), until
+    `interrupt()` says the link is down.
+    """
+
+    def __init__(self, raw_samples: int = 4096, minute_buckets: int = 2880, quarter_hour_buckets: int = 672) -> None:
+        self.raw = TelemetryLevel("raw", raw_samples)
+        self.minute = TelemetryLevel("minute", minute_buckets, 60.0)
+        self.quarter_hour = TelemetryLevel("quarterHour", quarter_hour_buckets, 900.0)
+        self.levels = (self.raw, self.minute, self.quarter_hour)
+
+    def record(self, t: float, values: Sequence[float]) -> None:
+        """`values` in FIELDS order; `t` in seconds since the epoch."""
+        for level in self.levels:
+            level.record(t, values)
+
+    def advance(self, t: float) -> None:
+        for level in self.levels:
+            level.advance(t)
+
+    def interrupt(self) -> None:
+        for level in self.levels:
+            level.interrupt()
@@ -0,0 +1,187 @@
+from __future__ import annotations
+
+import itertools
+import json
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Iterator
+
+from PySide6.QtCore import QThread
+
+from core.logging_setup import get_logger
+
+_MAX_ORIGINS = 1024
+
+
+class _NullSpan:
+    def __enter__(self) -> None:
+        return None
+
+    def __exit__(self, *exc: object) -> None:
+        return None
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class Tracer:
+    """Collects spans correlated by event ID and writes them as a Chrome trace.
+
+    An event starts at a UDP datagram (or a manual selection) and is carried
+    through parsing, rule selection, the WebSocket send, the bridge round trip
+    and the UI update. Open the file in https://ui.perfetto.dev or
+    chrome://tracing. Thread-track spans show Python-side work; the async
+    "bridge round trip" and "switch" tracks show the time spent waiting on the
+    bridge, LoRa link and relays.
+
+    While disabled, `span()` returns a shared no-op context manager and the
+    other methods return immediately.
+    """
+
+    def __init__(self) -> None:
+        self.enabled = False
+        self._path: Path | None = None
+        self._events: deque[dict[str, Any]] = deque()
+        self._ids = itertools.count(1)
+        self._origins: OrderedDict[int, int] = OrderedDict()
+        self._threads: dict[int, str] = {}
+        self._local = threading.local()
+        self._pid = os.getpid()
+        self._logger = get_logger(self.__class__.__name__)
+
+    def start(self, path: str | Path, max_events: int = 200_000) -> None:
+        self._path = Path(path)
+        self._events = deque(maxlen=max_events)
+        self._origins.clear()
+        self._threads.clear()
+        self.enabled = True
+        self._logger.info("Tracing to %s", self._path)
+
+    def stop(self) -> None:
+        """Disable tracing and write the collected events."""
+        if not self.enabled:
+            return
+        self.enabled = False
+        path = self._path
+        if path is None:
+            return
+        metadata = [
+            {"name": "thread_name", "ph": "M", "pid": self._pid, "tid": tid, "args": {"name": name}}
+            for tid, name in self._threads.items()
+        ]
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with path.open("w", encoding="utf-8") as handle:
+            json.dump(
+                {"traceEvents": metadata + list(self._events), "displayTimeUnit": "ms"},
+                handle,
+                separators=(",", ":"),
+            )
+        self._logger.info("Wrote %d trace events to %s", len(self._events), path)
+
+    @staticmethod
+    def now_us() -> int:
+        return time.perf_counter_ns() // 1000
+
+    # Event IDs
+
+    def new_event(self, origin_us: int | None = None) -> int:
+        """Allocate an event ID whose origin is `origin_us` (default: now)."""
+        if not self.enabled:
+            return 0
+        event = next(self._ids)
+        self._origins[event] = origin_us if origin_us is not None else self.now_us()
+        if len(self._origins) > _MAX_ORIGINS:
+            self._origins.popitem(last=False)
+        return event
+
+    @property
+    def current(self) -> int:
+        """Event being handled on this thread, 0 if none."""
+        return getattr(self._local, "event", 0)
+
+    def activate(self, event: int) -> Any:
+        """Context manager making `event` the current event on this thread."""
+        if not self.enabled:
+            return _NULL_SPAN
+        return self._activate(event)
+
+    @contextmanager
+    def _activate(self, event: int) -> Iterator[None]:
+        previous = self.current
+        self._local.event = event
+        try:
+            yield
+        finally:
+            self._local.event = previous
+
+    def bind(self, func: Callable[..., Any]) -> Callable[..., Any]:
+        """Wrap `func` so it runs with this thread's current event active."""
+        event = self.current
+        if not self.enabled or not event:
+            return func
+
+        def bound(*args: Any) -> Any:
+            with self._activate(event):
+                return func(*args)
+
+        return bound
+
+    # Recording
+
+    def span(self, name: str, **args: Any) -> Any:
+        """Context manager timing a stage of the current event."""
+        if not self.enabled:
+            return _NULL_SPAN
+        return self._span(name, args)
+
+    @contextmanager
+    def _span(self, name: str, args: dict[str, Any]) -> Iterator[None]:
+        start = self.now_us()
+        try:
+            yield
+        finally:
+            self.complete(name, start, self.now_us(), **args)
+
+    def complete(self, name: str, start_us: int, end_us: int, **args: Any) -> None:
+        if not self.enabled:
+            return
+        event = self.current
+        if event:
+            args["event"] = event
+        self._events.append(
+            {
+                "name": name,
+                "cat": "switch",
+                "ph": "X",
+                "ts": start_us,
+                "dur": end_us - start_us,
+                "pid": self._pid,
+                "tid": self._tid(),
+                "args": args,
+            }
+        )
+
+    def async_span(self, name: str, event: int, start_us: int, end_us: int, **args: Any) -> None:
+        """Span on its own track, for waits that overlap other work."""
+        if not self.enabled or not event:
+            return
+        args["event"] = event
+        common = {"name": name, "cat": "switch", "id": event, "pid": self._pid, "tid": self._tid()}
+        self._events.append({**common, "ph": "b", "ts": start_us, "args": args})
+        self._events.append({**common, "ph": "e", "ts": end_us})
+
+    def origin_us(self, event: int) -> int | None:
+        return self._origins.get(event)
+
+    def _tid(self) -> int:
+        tid = threading.get_ident()
+        if tid not in self._threads:
+            self._threads[tid] = QThread.currentThread().objectName() or threading.current_thread().name
+        return tid
+
+
+tracer = Tracer()
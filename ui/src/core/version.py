@@ -38,7 +38,12 @@ def _read_embedded_hash(repo_root: Path) -> str | None:
     return None
 
 
-def get_version() -> str:
+def get_version(allow_git: bool = True) -> str:
+    """Return the app version with a short commit hash.
+
+    With `allow_git=False` (fast start, frozen builds) no subprocess is run;
+    only APP_GIT_COMMIT and the embedded version.txt are consulted.
+    """
     env_hash = os.getenv("APP_GIT_COMMIT")
     if env_hash:
         return f"{BASE_VERSION}+{env_hash}"
@@ -48,7 +53,7 @@ def get_version() -> str:
     if embedded_hash:
         return f"{BASE_VERSION}+{embedded_hash}"
 
-    short_hash = _git_short_hash(repo_root)
+    short_hash = _git_short_hash(repo_root) if allow_git else None
     if not short_hash:
         return f"{BASE_VERSION}+unknown"
     return f"{BASE_VERSION}+{short_hash}"
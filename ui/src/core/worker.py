@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+import threading
+from functools import partial
+from typing import Any, Callable, Hashable, Optional
+
+from PySide6.QtCore import QObject, QThread, QTimer
+
+from core.logging_setup import get_logger
+from core.tracing import tracer
+
+
+class ThreadDispatcher:
+    """Runs callables on the thread that owns `context`.
+
+    Without a context every call runs inline, so single-threaded setups pay
+    nothing. With a context, calls from other threads are queued to the
+    context's event loop.
+    """
+
+    def __init__(self, context: QObject | None = None) -> None:
+        self._context = context
+        self._latest: dict[Hashable, tuple[Callable[..., Any], tuple]] = {}
+        self._posted: set[Hashable] = set()
+
+    @property
+    def threaded(self) -> bool:
+        return self._context is not None
+
+    def call(self, func: Callable[..., Any], *args: Any) -> None:
+        context = self._context
+        if context is None or context.thread() is QThread.currentThread():
+            func(*args)
+        else:
+            # Carry the trace event across the thread hop.
+            QTimer.singleShot(0, context, partial(tracer.bind(func), *args))
+
+    def queued(self, func: Callable[..., Any]) -> Callable[..., None]:
+        """Wrap `func` so every call is delivered, in order, on the context thread."""
+        if self._context is None:
+            return func
+        return lambda *args: self.call(func, *args)
+
+    def coalesced(
+        self,
+        func: Callable[..., Any],
+        key: Optional[Callable[..., Hashable]] = None,
+    ) -> Callable[..., None]:
+        """Wrap `func` so only the newest arguments per key are delivered.
+
+        Calls made while a delivery is still queued just replace its
+        arguments; the receiver sees at most one call per key per turn of
+        its event loop.
+        """
+        if self._context is None:
+            return func
+        base = object()
+
+        def wrapper(*args: Any) -> None:
+            slot = (base, key(*args)) if key is not None else base
+            self._latest[slot] = (tracer.bind(func), args)
+            if slot not in self._posted:
+                self._posted.add(slot)
+                QTimer.singleShot(0, self._context, partial(self._deliver, slot))
+
+        return wrapper
+
+    def merged(self, func: Callable[[dict], Any]) -> Callable[[dict], None]:
+        """Wrap `func` so dicts sent while a delivery is queued are merged into it.
+
+        For partial updates such as status deltas: unlike `coalesced`, a
+        field only present in an earlier dict is not lost when a newer one
+        arrives in the same turn of the event loop.
+        """
+        if self._context is None:
+            return func
+        lock = threading.Lock()
+        pending: dict = {}
+        bound: list[Callable[[dict], Any]] = [func]
+
+        def deliver() -> None:
+            with lock:
+                data = dict(pending)
+                pending.clear()
+            if data:
+                bound[0](data)
+
+        def wrapper(data: dict) -> None:
+            with lock:
+                post = not pending
+                pending.update(data)
+                bound[0] = tracer.bind(func)
+            if post:
+                QTimer.singleShot(0, self._context, deliver)
+
+        return wrapper
+
+    def _deliver(self, slot: Hashable) -> None:
+        # Clear the flag before reading so a concurrent update re-posts rather than being lost.
+        self._posted.discard(slot)
+        latest = self._latest.pop(slot, None)
+        if latest is not None:
+            func, args = latest
+            func(*args)
+
+
+class ControllerThread:
+    """Runs an AppController's sockets, parsing and auto switching on a QThread.
+
+    The controller's Qt objects (sockets, timers) are created lazily by
+    `start()`, which runs on the worker thread, so they live there too.
+    """
+
+    def __init__(self, controller) -> None:
+        self._controller = controller
+        self._logger = get_logger(self.__class__.__name__)
+        self._thread = QThread()
+        self._thread.setObjectName("controller")
+        self._context = QObject()
+        self._context.moveToThread(self._thread)
+        controller.dispatcher = ThreadDispatcher(self._context)
+
+    def start(self) -> None:
+        self._thread.start()
+        self._controller.dispatcher.call(self._controller.start)
+        self._logger.info("Controller running on worker thread")
+
+    def stop(self, timeout_ms: int = 2000) -> None:
+        if not self._thread.isRunning():
+            return
+        done = threading.Event()
+
+        def _stop() -> None:
+            try:
+                # Sockets and timers belong to this thread and must be destroyed here.
+                self._controller.dispose()
+            finally:
+                done.set()
+
+        self._controller.dispatcher.call(_stop)
+        if not done.wait(timeout_ms / 1000):
+            self._logger.warning("Controller did not stop within %d ms", timeout_ms)
+        self._thread.quit()
+        self._thread.wait(timeout_ms)
@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Callable
+
+from PySide6.QtNetwork import QHostAddress, QTcpServer, QTcpSocket
+
+from core.logging_setup import get_logger
+
+_MAX_REQUEST_BYTES = 8192
+
+
+@dataclass
+class MetricsServerConfig:
+    host: str = "127.0.0.1"
+    port: int = 0  # 0 = disabled
+
+
+class MetricsServer:
+    """Minimal HTTP endpoint serving `GET /metrics` in Prometheus text format.
+
+    Runs on the thread that calls `open()`, the same one that updates the
+    metrics, so scrapes never race the counters.
+    """
+
+    def __init__(self, config: MetricsServerConfig, render: Callable[[], str]) -> None:
+        self._config = config
+        self._render = render
+        self._server: QTcpServer | None = None
+        self._buffers: dict[QTcpSocket, bytearray] = {}
+        self._logger = get_logger(self.__class__.__name__)
+
+    def open(self) -> None:
+        if self._config.port <= 0:
+            return
+        if self._server is None:
+            self._server = QTcpServer()
+            self._server.newConnection.connect(self._handle_new_connection)
+        if not self._server.listen(QHostAddress(self._config.host), self._config.port):
+            self._logger.error(
+                "Metrics endpoint failed on %s:%s: %s",
+                self._config.host,
+                self._config.port,
+                self._server.errorString(),
+            )
+        else:
+            self._logger.info("Metrics on http://%s:%s/metrics", self._config.host, self._config.port)
+
+    def close(self) -> None:
+        for socket in tuple(self._buffers):
+            socket.abort()
+        self._buffers.clear()
+        if self._server is not None:
+            self._server.close()
+
+    def dispose(self) -> None:
+        """Close and release the server; must run on the thread that created it."""
+        self.close()
+        self._server = None
+
+    def _handle_new_connection(self) -> None:
+        while self._server is not None and self._server.hasPendingConnections():
+            socket = self._server.nextPendingConnection()
+            self._buffers[socket] = bytearray()
+            socket.readyRead.connect(lambda socket=socket: self._handle_ready_read(socket))
+            socket.disconnected.connect(lambda socket=socket: self._forget(socket))
+
+    def _handle_ready_read(self, socket: QTcpSocket) -> None:
+        buffer = self._buffers.get(socket)
+        if buffer is None:
+            return
+        buffer += bytes(socket.readAll().data())
+        if b"\r\n\r\n" not in buffer and b"\n\n" not in buffer:
+            if len(buffer) > _MAX_REQUEST_BYTES:
+                self._respond(socket, "413 Payload Too Large", "request too large\n")
+            return
+        parts = bytes(buffer).split(b"\r\n", 1)[0].split()
+        method, path = (parts[0], parts[1]) if len(parts) >= 2 else (b"", b"")
+        if method != b"GET":
+            self._respond(socket, "405 Method Not Allowed", "only GET is supported\n")
+        elif path.split(b"?", 1)[0] != b"/metrics":
+            self._respond(socket, "404 Not Found", "try /metrics\n")
+        else:
+            self._respond(socket, "200 OK", self._render(), "text/plain; version=0.0.4; charset=utf-8")
+
+    def _respond(self, socket: QTcpSocket, status: str, body: str, content_type: str = "text/plain") -> None:
+        payload = body.encode("utf-8")
+        header = (
+            f"HTTP/1.1 {status}\r\nContent-Type: {content_type}\r\n"
+            f"Content-Length: {len(payload)}\r\nConnection: close\r\n\r\n"
+        ).encode("ascii")
+        self._buffers.pop(socket, None)
+        socket.write(header + payload)
+        socket.disconnectFromHost()
+
+    def _forget(self, socket: QTcpSocket) -> None:
+        self._buffers.pop(socket, None)
+        socket.deleteLater()
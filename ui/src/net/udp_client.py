@@ -1,11 +1,14 @@
 from __future__ import annotations
 
+import logging
 from dataclasses import dataclass
-from typing import Callable, Optional
+from typing import Callable, Hashable, Optional
 
 from PySide6.QtNetwork import QHostAddress, QUdpSocket
 
+from core.capture import CaptureWriter
 from core.logging_setup import get_logger
+from core.tracing import tracer
 
 
 @dataclass
@@ -13,6 +16,7 @@ class UdpConfig:
     host: str
     port: int
     enabled: bool = True
+    coalesce: bool = False  # keep only the newest datagram per coalesce key per drain
 
 
 class UdpClient:
@@ -20,11 +24,28 @@ class UdpClient:
         self._config = config
         self._socket: QUdpSocket | None = None
         self._on_message: Optional[Callable[[bytes], None]] = None
+        self._coalesce_key: Optional[Callable[[bytes], Hashable | None]] = None
+        self._latest: dict[Hashable, bytes] = {}
+        self._capture: CaptureWriter | None = None
         self._logger = get_logger(self.__class__.__name__)
+        self.received = 0
+        self.coalesced = 0
+        self.dropped = 0
 
     def set_message_handler(self, handler: Callable[[bytes], None]) -> None:
         self._on_message = handler
 
+    def set_coalesce_key(self, key: Callable[[bytes], Hashable | None]) -> None:
+        """Set the function that maps a datagram to its coalescing slot.
+
+        Datagrams for which the key is None are dropped in coalescing mode.
+        """
+        self._coalesce_key = key
+
+    def set_capture(self, capture: CaptureWriter | None) -> None:
+        """Record every datagram as received, before coalescing."""
+        self._capture = capture
+
     def open(self) -> None:
         if not self._config.enabled:
             return
@@ -37,6 +58,15 @@ class UdpClient:
         else:
             self._logger.info("UDP listening on %s:%s", self._config.host, self._config.port)
 
+    def reconfigure(self, config: UdpConfig) -> None:
+        """Apply new settings; the socket is only rebound if the address changed."""
+        old, self._config = self._config, config
+        if (config.host, config.port, config.enabled) == (old.host, old.port, old.enabled) or self._socket is None:
+            return
+        self._socket.close()
+        self._latest.clear()
+        self.open()
+
     def send(self, payload: bytes) -> None:
         self._logger.debug("UDP send ignored (listen-only mode)")
 
@@ -44,17 +74,87 @@ class UdpClient:
         if self._socket is not None:
             self._socket.close()
 
+    def dispose(self) -> None:
+        """Close and release the socket; must run on the thread that created it."""
+        self.close()
+        self._socket = None
+
     def _handle_ready_read(self) -> None:
         if self._socket is None:
             return
+        if self._config.coalesce and self._coalesce_key is not None:
+            self._drain_coalesced()
+            return
+        debug = self._logger.isEnabledFor(logging.DEBUG)
+        trace = tracer.enabled
+        capture = self._capture
         while self._socket.hasPendingDatagrams():
+            if trace:
+                started = tracer.now_us()
             datagram = self._socket.receiveDatagram()
             data = bytes(datagram.data())
+            self.received += 1
+            if capture is not None:
+                capture.write_udp(data)
+            if debug:
+                self._logger.debug(
+                    "UDP datagram received from %s:%s (%d bytes)",
+                    datagram.senderAddress().toString(),
+                    datagram.senderPort(),
+                    len(data),
+                )
+            if self._on_message:
+                if trace:
+                    self._dispatch_traced(data, started, started, 1)
+                else:
+                    self._on_message(data)
+
+    def _drain_coalesced(self) -> None:
+        # The slot dict is reused across drains; only the newest frame per key survives.
+        socket = self._socket
+        latest = self._latest
+        key_for = self._coalesce_key
+        capture = self._capture
+        trace = tracer.enabled
+        if trace:
+            started = tracer.now_us()
+        count = 0
+        while socket.hasPendingDatagrams():
+            data = bytes(socket.receiveDatagram().data())
+            count += 1
+            if capture is not None:
+                capture.write_udp(data)
+            key = key_for(data)
+            if key is None:
+                self.dropped += 1
+                continue
+            if key in latest:
+                self.coalesced += 1
+            latest[key] = data
+        self.received += count
+
+        if self._logger.isEnabledFor(logging.DEBUG):
             self._logger.debug(
-                "UDP datagram received from %s:%s (%d bytes)",
-                datagram.senderAddress().toString(),
-                datagram.senderPort(),
-                len(data),
+                "UDP drain: %d datagrams, %d dispatched (coalesced %d, dropped %d total)",
+                count,
+                len(latest),
+                self.coalesced,
+                self.dropped,
             )
+        try:
             if self._on_message:
-                self._on_message(data)
+                if trace:
+                    drained = tracer.now_us()
+                    for data in latest.values():
+                        self._dispatch_traced(data, started, drained, count)
+                else:
+                    for data in latest.values():
+                        self._on_message(data)
+        finally:
+            latest.clear()
+
+    def _dispatch_traced(self, data: bytes, started_us: int, received_us: int, datagrams: int) -> None:
+        # Every dispatched frame starts a trace event; its origin is when the read began.
+        with tracer.activate(tracer.new_event(started_us)):
+            tracer.complete("udp receive", started_us, max(received_us, tracer.now_us()), datagrams=datagrams)
+            self._on_message(data)
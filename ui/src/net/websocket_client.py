@@ -1,12 +1,18 @@
 from __future__ import annotations
 
+import math
+import random
+import time
 from dataclasses import dataclass
-from typing import Callable, Optional
+from enum import Enum
+from typing import Callable, Hashable, Optional
 
+from core.capture import CaptureWriter
+from core.deadlines import DeadlineScheduler
 from core.logging_setup import get_logger
 
-from PySide6.QtCore import QUrl, QTimer
-from PySide6.QtWebSockets import QWebSocket
+from PySide6.QtCore import QByteArray, QUrl
+from PySide6.QtWebSockets import QWebSocket, QWebSocketHandshakeOptions
 
 
 @dataclass
@@ -14,28 +20,94 @@ class WebSocketConfig:
     url: str
     enabled: bool = True
     auto_reconnect: bool = True
-    reconnect_interval_ms: int = 3000
+    reconnect_interval_ms: int = 1000  # backoff before the second attempt; the first is immediate
+    reconnect_max_interval_ms: int = 30000
+    reconnect_jitter: float = 0.2  # each delay is shortened by up to this fraction
     max_reconnect_attempts: int = 0  # 0 = unlimited
     heartbeat_timeout_ms: int = 7000  # 0 = disabled, expect messages every ~5s
+    ping_interval_ms: int = 250  # WebSocket ping period; 0 = disabled
+    ping_misses: int = 3  # unanswered pings in a row before the link is declared dead
+    offline_buffer_size: int = 8  # keyed messages held while disconnected; 0 = drop them
+    subprotocols: tuple[str, ...] = ()  # offered in the handshake, see `subprotocol`
+
+
+class ConnectionState(str, Enum):
+    IDLE = "idle"  # connect() not called yet
+    CONNECTING = "connecting"
+    CONNECTED = "connected"
+    BACKOFF = "backoff"  # waiting for the next reconnect attempt
+    CLOSED = "closed"  # closed on purpose
+    FAILED = "failed"  # max_reconnect_attempts used up
 
 
 class WebSocketClient:
-    def __init__(self, config: WebSocketConfig) -> None:
+    """QWebSocket with a reconnect state machine, heartbeats and an offline buffer.
+
+    After an unexpected disconnect the first reconnect is tried at once, then
+    with exponential backoff from `reconnect_interval_ms` up to
+    `reconnect_max_interval_ms`, jittered so that clients do not retry in
+    step. While connected, WebSocket pings measure the round trip time and
+    `ping_misses` unanswered pings in a row drop the link; the bridge's
+    status messages are still watched by the slower heartbeat timeout.
+    Messages sent with a key while the socket is down are held, newest
+    per key, and sent as soon as it connects again.
+    """
+
+    def __init__(
+        self,
+        config: WebSocketConfig,
+        scheduler: DeadlineScheduler | None = None,
+        clock: Optional[Callable[[], float]] = None,
+    ) -> None:
         self._config = config
+        self._clock = clock or (lambda: time.monotonic() * 1000.0)
+        self._random = random.Random()
+        # Reconnect and heartbeat deadlines; shared with other clients when a scheduler is passed in.
+        self._owns_scheduler = scheduler is None
+        self._scheduler = scheduler or DeadlineScheduler()
+        self._reconnect_key = (id(self), "reconnect")
+        self._heartbeat_key = (id(self), "heartbeat")
+        self._ping_key = (id(self), "ping")
         self._on_message: Optional[Callable[[str], None]] = None
+        self._on_binary_message: Optional[Callable[[bytes], None]] = None
         self._on_error: Optional[Callable[[str], None]] = None
         self._on_disconnect: Optional[Callable[[], None]] = None
         self._on_send_failed: Optional[Callable[[str], None]] = None
+        self._on_state_changed: Optional[Callable[[ConnectionState], None]] = None
+        self._on_rtt: Optional[Callable[[float, float], None]] = None
         self._logger = get_logger(self.__class__.__name__)
         self._socket: QWebSocket | None = None
-        self._reconnect_timer: QTimer | None = None
-        self._heartbeat_timer: QTimer | None = None
         self._reconnect_attempts: int = 0
         self._intentional_close: bool = False
+        self._capture: CaptureWriter | None = None
+        self._offline: dict[Hashable, str] = {}
+        self._state = ConnectionState.IDLE
+        self._down_since: float | None = None
+        self._downtime_ms = 0.0
+        self.last_outage_ms = 0.0
+        self._ping_sequence = 0
+        self._pings: dict[int, float] = {}  # unanswered ping -> send time
+        self._missed_pings = 0
+        self.rtt_ms = math.nan  # smoothed round trip time (RFC 6298 SRTT)
+        self.rtt_jitter_ms = math.nan  # mean deviation of the round trip time (RTTVAR)
+        self.last_rtt_ms = math.nan
+        self.connected = False
+        self.messages_received = 0
+        self.reconnects = 0
+        self.heartbeat_timeouts = 0
+        self.pings_sent = 0
+        self.pongs_received = 0
+        self.ping_timeouts = 0
+        self.send_failures = 0
+        self.buffered = 0
+        self.buffer_dropped = 0
 
     def set_message_handler(self, handler: Callable[[str], None]) -> None:
         self._on_message = handler
 
+    def set_binary_message_handler(self, handler: Callable[[bytes], None]) -> None:
+        self._on_binary_message = handler
+
     def set_error_handler(self, handler: Callable[[str], None]) -> None:
         self._on_error = handler
 
@@ -45,68 +117,198 @@ class WebSocketClient:
     def set_send_failed_handler(self, handler: Callable[[str], None]) -> None:
         self._on_send_failed = handler
 
+    def set_state_handler(self, handler: Callable[[ConnectionState], None]) -> None:
+        self._on_state_changed = handler
+
+    def set_rtt_handler(self, handler: Callable[[float, float], None]) -> None:
+        """Called with (rtt_ms, jitter_ms) after every pong, and with NaNs when the connection ends."""
+        self._on_rtt = handler
+
+    @property
+    def subprotocol(self) -> str:
+        """Subprotocol the server accepted from `subprotocols`; empty if none (or not connected)."""
+        return self._socket.subprotocol() if self._socket is not None and self.connected else ""
+
+    @property
+    def state(self) -> ConnectionState:
+        return self._state
+
+    @property
+    def disconnected_ms(self) -> float:
+        """Length of the current outage; 0 while connected."""
+        return 0.0 if self._down_since is None else self._clock() - self._down_since
+
+    @property
+    def downtime_ms(self) -> float:
+        """Total time spent disconnected since the first connect(), current outage included."""
+        return self._downtime_ms + self.disconnected_ms
+
+    @property
+    def offline_messages(self) -> list[str]:
+        return list(self._offline.values())
+
+    def set_capture(self, capture: CaptureWriter | None) -> None:
+        """Record every text frame received and sent."""
+        self._capture = capture
+
     def connect(self) -> None:
         if not self._config.enabled:
             return
         self._intentional_close = False
         self._reconnect_attempts = 0
+        if self._down_since is None and not self.connected:
+            self._down_since = self._clock()
         if self._socket is None:
             self._socket = QWebSocket()
             self._connect_signal("textMessageReceived", self._handle_text_message)
+            self._connect_signal("binaryMessageReceived", self._handle_binary_message)
             self._connect_signal("connected", self._handle_connected)
             self._connect_signal("disconnected", self._handle_disconnected)
             self._connect_signal("errorOccurred", self._handle_error)
+            self._connect_signal("pong", self._handle_pong)
         self._logger.info("Opening WebSocket: %s", self._config.url)
-        self._socket.open(QUrl(self._config.url))
+        self._set_state(ConnectionState.CONNECTING)
+        self._open()
+
+    def send(self, message: str, key: Hashable | None = None) -> bool:
+        """Send now, or hold a keyed message until the socket reconnects.
 
-    def send(self, message: str) -> None:
+        A held message replaces the one held under the same key; True means
+        sent or held.
+        """
         if not self._config.enabled:
-            return
+            return False
         if self._socket is not None and self._socket.isValid():
-            self._logger.debug("Sending WebSocket message: %s", message)
-            self._socket.sendTextMessage(message)
-        else:
-            self._logger.warning("WebSocket not connected; message not sent")
-            if self._on_send_failed:
-                self._on_send_failed("not connected")
+            self._write(message)
+            return True
+        if key is not None and self._buffering:
+            self._hold(key, message)
+            return True
+        self._logger.warning("WebSocket not connected; message not sent")
+        self.send_failures += 1
+        if self._on_send_failed:
+            self._on_send_failed("not connected")
+        return False
+
+    def reconfigure(self, config: WebSocketConfig) -> None:
+        """Apply new settings; only a new URL or subprotocol list reopens the connection."""
+        old, self._config = self._config, config
+        if (config.url, config.subprotocols) != (old.url, old.subprotocols):
+            if self._state in (ConnectionState.IDLE, ConnectionState.CLOSED):
+                return
+            self._logger.info("WebSocket endpoint changed to %s; reconnecting", config.url)
+            self._intentional_close = True
+            self._stop_reconnect_timer()
+            if self._socket is not None:
+                self._socket.abort()
+            self.connect()
+            return
+        if not self.connected:
+            return
+        if config.heartbeat_timeout_ms != old.heartbeat_timeout_ms:
+            self._stop_heartbeat_timer()
+            self._start_heartbeat_timer()
+        if config.ping_interval_ms != old.ping_interval_ms:
+            self._scheduler.cancel(self._ping_key)
+            self._start_pinging()
+
+    def discard(self, key: Hashable) -> None:
+        """Drop the message held under `key`, e.g. when its command was given up on."""
+        self._offline.pop(key, None)
 
     def close(self) -> None:
         self._intentional_close = True
+        self._offline.clear()
         self._stop_reconnect_timer()
         self._stop_heartbeat_timer()
+        self._stop_pinging()
         if self._socket is not None:
             self._socket.close()
+        if self._state != ConnectionState.IDLE:
+            self._set_state(ConnectionState.CLOSED)
+
+    def dispose(self) -> None:
+        """Close and release the Qt objects; must run on the thread that created them."""
+        self.close()
+        self._socket = None
+        if self._owns_scheduler:
+            self._scheduler.dispose()
+
+    @property
+    def _buffering(self) -> bool:
+        return self._config.offline_buffer_size > 0 and self._state in (
+            ConnectionState.CONNECTING,
+            ConnectionState.BACKOFF,
+        )
+
+    def _write(self, message: str) -> None:
+        self._logger.debug("Sending WebSocket message: %s", message)
+        self._socket.sendTextMessage(message)
+        if self._capture is not None:
+            self._capture.write_ws_out(message)
+
+    def _hold(self, key: Hashable, message: str) -> None:
+        # Re-inserting moves the key to the end: the buffer is flushed oldest decision first.
+        self._offline.pop(key, None)
+        self._offline[key] = message
+        self.buffered += 1
+        if len(self._offline) > self._config.offline_buffer_size:
+            dropped = self._offline.pop(next(iter(self._offline)))
+            self.buffer_dropped += 1
+            self._logger.warning("Offline buffer full; dropped %s", dropped)
+        self._logger.info("WebSocket not connected; %s held until reconnect", message)
+
+    def _flush_offline(self) -> None:
+        held, self._offline = self._offline, {}
+        if held:
+            self._logger.info("Sending %d message(s) held while disconnected", len(held))
+        for message in held.values():
+            self._write(message)
+
+    def _backoff_ms(self) -> float:
+        """Delay before the next reconnect attempt: 0, then base * 2^n up to the cap, jittered."""
+        attempts = self._reconnect_attempts
+        if attempts == 0:
+            return 0.0
+        base = max(0, self._config.reconnect_interval_ms)
+        cap = max(base, self._config.reconnect_max_interval_ms)
+        delay = min(cap, base * 2 ** min(attempts - 1, 30))
+        jitter = min(max(self._config.reconnect_jitter, 0.0), 1.0)
+        return delay * (1.0 - jitter * self._random.random())
+
+    def _set_state(self, state: ConnectionState) -> None:
+        if state == self._state:
+            return
+        self._logger.debug("WebSocket state %s -> %s", self._state.value, state.value)
+        self._state = state
+        if self._on_state_changed:
+            self._on_state_changed(state)
 
     def _start_reconnect_timer(self) -> None:
-        if self._reconnect_timer is None:
-            self._reconnect_timer = QTimer()
-            self._reconnect_timer.setSingleShot(True)
-            self._reconnect_timer.timeout.connect(self._attempt_reconnect)
-        self._reconnect_timer.start(self._config.reconnect_interval_ms)
+        delay = self._backoff_ms()
+        self._set_state(ConnectionState.BACKOFF)
+        self._scheduler.schedule(self._reconnect_key, delay, self._attempt_reconnect)
 
     def _stop_reconnect_timer(self) -> None:
-        if self._reconnect_timer is not None:
-            self._reconnect_timer.stop()
+        self._scheduler.cancel(self._reconnect_key)
 
     def _start_heartbeat_timer(self) -> None:
         if self._config.heartbeat_timeout_ms <= 0:
             return
-        if self._heartbeat_timer is None:
-            self._heartbeat_timer = QTimer()
-            self._heartbeat_timer.setSingleShot(True)
-            self._heartbeat_timer.timeout.connect(self._handle_heartbeat_timeout)
-        self._heartbeat_timer.start(self._config.heartbeat_timeout_ms)
+        self._scheduler.schedule(
+            self._heartbeat_key, self._config.heartbeat_timeout_ms, self._handle_heartbeat_timeout
+        )
 
     def _stop_heartbeat_timer(self) -> None:
-        if self._heartbeat_timer is not None:
-            self._heartbeat_timer.stop()
+        self._scheduler.cancel(self._heartbeat_key)
 
     def _reset_heartbeat_timer(self) -> None:
-        if self._config.heartbeat_timeout_ms > 0 and self._heartbeat_timer is not None:
-            self._heartbeat_timer.start(self._config.heartbeat_timeout_ms)
+        if self.connected:
+            self._start_heartbeat_timer()
 
     def _handle_heartbeat_timeout(self) -> None:
         self._logger.warning("Heartbeat timeout - no message received in %d ms", self._config.heartbeat_timeout_ms)
+        self.heartbeat_timeouts += 1
         if self._socket is not None and self._socket.isValid():
             self._socket.close()  # This will trigger _handle_disconnected and auto-reconnect
 
@@ -116,30 +318,130 @@ class WebSocketClient:
         max_attempts = self._config.max_reconnect_attempts
         if max_attempts > 0 and self._reconnect_attempts >= max_attempts:
             self._logger.warning("Max reconnect attempts (%d) reached", max_attempts)
+            self._offline.clear()
+            self._set_state(ConnectionState.FAILED)
             return
         self._reconnect_attempts += 1
+        self.reconnects += 1
         self._logger.info("Reconnecting (attempt %d)...", self._reconnect_attempts)
         if self._socket is not None:
+            self._set_state(ConnectionState.CONNECTING)
+            self._open()
+
+    def _start_pinging(self) -> None:
+        if self._config.ping_interval_ms > 0:
+            self._scheduler.schedule(self._ping_key, 0, self._ping)
+
+    def _stop_pinging(self) -> None:
+        self._scheduler.cancel(self._ping_key)
+        self._pings.clear()
+        self._missed_pings = 0
+        if not math.isnan(self.rtt_ms):
+            self.rtt_ms = self.rtt_jitter_ms = math.nan
+            if self._on_rtt:
+                self._on_rtt(self.rtt_ms, self.rtt_jitter_ms)
+
+    def _ping(self) -> None:
+        if not self.connected or self._socket is None:
+            return
+        if self._pings:
+            self._missed_pings += 1
+            if self._missed_pings >= self._config.ping_misses:
+                self._logger.warning(
+                    "Link dead - %d pings unanswered (%d ms apart)", self._missed_pings, self._config.ping_interval_ms
+                )
+                self.ping_timeouts += 1
+                # abort() rather than close(): a closing handshake would wait on the dead peer.
+                self._socket.abort()
+                return
+            if len(self._pings) >= self._config.ping_misses:
+                del self._pings[min(self._pings)]
+        self._ping_sequence += 1
+        self._pings[self._ping_sequence] = self._clock()
+        self.pings_sent += 1
+        self._socket.ping(QByteArray(str(self._ping_sequence).encode()))
+        self._scheduler.schedule(self._ping_key, self._config.ping_interval_ms, self._ping)
+
+    def _handle_pong(self, _elapsed_ms: int, payload: QByteArray) -> None:
+        self.pongs_received += 1
+        self._missed_pings = 0
+        try:
+            sequence = int(bytes(payload.data()))
+        except ValueError:
+            return
+        sent_at = self._pings.pop(sequence, None)
+        if sent_at is None:
+            return
+        # Pongs come back in order; older pings still open were lost.
+        for older in [seq for seq in self._pings if seq < sequence]:
+            del self._pings[older]
+        rtt = self._clock() - sent_at
+        self.last_rtt_ms = rtt
+        if math.isnan(self.rtt_ms):
+            self.rtt_ms = rtt
+            self.rtt_jitter_ms = rtt / 2
+        else:
+            self.rtt_jitter_ms += (abs(self.rtt_ms - rtt) - self.rtt_jitter_ms) / 4
+            self.rtt_ms += (rtt - self.rtt_ms) / 8
+        if self._on_rtt:
+            self._on_rtt(self.rtt_ms, self.rtt_jitter_ms)
+
+    def _open(self) -> None:
+        if self._config.subprotocols:
+            options = QWebSocketHandshakeOptions()
+            options.setSubprotocols(list(self._config.subprotocols))
+            self._socket.open(QUrl(self._config.url), options)
+        else:
             self._socket.open(QUrl(self._config.url))
 
+    def _handle_binary_message(self, message) -> None:
+        payload = bytes(message.data())
+        self.messages_received += 1
+        if self._capture is not None:
+            self._capture.write_ws_in_binary(payload)
+        self._reset_heartbeat_timer()
+        if self._on_binary_message:
+            self._on_binary_message(payload)
+
     def _handle_text_message(self, message: str) -> None:
         self._logger.debug("WebSocket text message received: %s", message)
+        self.messages_received += 1
+        if self._capture is not None:
+            self._capture.write_ws_in(message)
         self._reset_heartbeat_timer()
         if self._on_message:
             self._on_message(message)
 
     def _handle_connected(self) -> None:
-        self._logger.info("WebSocket connected")
+        protocol = self._socket.subprotocol() if self._socket is not None else ""
+        self._logger.info("WebSocket connected%s", f" ({protocol})" if protocol else "")
+        self.connected = True
         self._reconnect_attempts = 0
+        if self._down_since is not None:
+            self.last_outage_ms = self._clock() - self._down_since
+            self._downtime_ms += self.last_outage_ms
+            self._down_since = None
         self._start_heartbeat_timer()
+        self._start_pinging()
+        self._set_state(ConnectionState.CONNECTED)
+        self._flush_offline()
 
     def _handle_disconnected(self) -> None:
-        self._logger.info("WebSocket disconnected")
+        was_connected = self.connected
+        if was_connected:
+            self._logger.info("WebSocket disconnected")
+            self._down_since = self._clock()
+        self.connected = False
         self._stop_heartbeat_timer()
-        if self._on_disconnect:
-            self._on_disconnect()
+        self._stop_pinging()
         if self._config.auto_reconnect and not self._intentional_close:
             self._start_reconnect_timer()
+        elif not self._intentional_close:
+            self._offline.clear()
+            self._set_state(ConnectionState.CLOSED)
+        # A failed (re)connect attempt also ends here; listeners only hear about lost connections.
+        if was_connected and self._on_disconnect:
+            self._on_disconnect()
 
     def _handle_error(self, error) -> None:
         message = str(error)
@@ -0,0 +1,238 @@
+from __future__ import annotations
+
+from typing import Any, Iterable, Mapping
+
+from PySide6.QtCore import QAbstractListModel, QByteArray, QModelIndex, QObject, Property, Qt, Signal
+
+
+def antenna_from_status(value: str) -> int | None:
+    """Bridge status antenna (`-`, `1`..`6`, `NC`) -> antenna number, None if unknown."""
+    if value == "-":
+        return 0
+    return int(value) if value.isdigit() else None
+
+
+class AntennaMatrixModel(QAbstractListModel):
+    """One row per (rig, antenna) cell, rig-major, for a QML Repeater/Grid.
+
+    The interlock state of every cell (selected, reserved by another rig,
+    selectable) is computed here. An input change recomputes only the cells
+    it can affect and emits `dataChanged` for the rows and roles that
+    differ, so QML does not carry one binding per neighbouring button.
+    """
+
+    RigRole = Qt.ItemDataRole.UserRole + 1
+    AntennaRole = Qt.ItemDataRole.UserRole + 2
+    NameRole = Qt.ItemDataRole.UserRole + 3
+    SelectedRole = Qt.ItemDataRole.UserRole + 4
+    ReservedRole = Qt.ItemDataRole.UserRole + 5
+    SelectableRole = Qt.ItemDataRole.UserRole + 6
+
+    _STATE_ROLES = (SelectedRole, ReservedRole, SelectableRole)
+
+    antennaCountChanged = Signal()
+
+    def __init__(self, rigs: Iterable[str], antenna_names: Iterable[str], parent: QObject | None = None) -> None:
+        super().__init__(parent)
+        self._rigs = list(rigs)
+        self._names = list(antenna_names)
+        self._selected: dict[str, int | None] = {rig: None for rig in self._rigs}
+        self._auto = {rig: False for rig in self._rigs}
+        self._interactive = False
+        self._cells = [self._cell_state(row) for row in range(len(self._rigs) * len(self._names))]
+        self.updated_rows = 0
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._cells)
+
+    def roleNames(self) -> dict[int, QByteArray]:
+        return {
+            self.RigRole: QByteArray(b"rig"),
+            self.AntennaRole: QByteArray(b"antenna"),
+            self.NameRole: QByteArray(b"name"),
+            self.SelectedRole: QByteArray(b"selected"),
+            self.ReservedRole: QByteArray(b"reserved"),
+            self.SelectableRole: QByteArray(b"selectable"),
+        }
+
+    def data(self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole) -> Any:
+        row = index.row()
+        if not index.isValid() or not 0 <= row < len(self._cells):
+            return None
+        rig_index, antenna = divmod(row, len(self._names))
+        if role == self.RigRole:
+            return self._rigs[rig_index]
+        if role == self.AntennaRole:
+            return antenna
+        if role in (self.NameRole, Qt.ItemDataRole.DisplayRole):
+            return self._names[antenna]
+        if role in self._STATE_ROLES:
+            return self._cells[row][self._STATE_ROLES.index(role)]
+        return None
+
+    rigCount = Property(int, lambda self: len(self._rigs), constant=True)
+    antennaCount = Property(int, lambda self: len(self._names), notify=antennaCountChanged)
+
+    def set_antenna_names(self, names: Iterable[str]) -> None:
+        """Renames buttons in place; a different number of antennas rebuilds the model."""
+        names = list(names)
+        if len(names) != len(self._names):
+            self.beginResetModel()
+            self._names = names
+            self._cells = [self._cell_state(row) for row in range(len(self._rigs) * len(self._names))]
+            self.endResetModel()
+            self.antennaCountChanged.emit()
+            return
+        for antenna, (old, new) in enumerate(zip(self._names, names)):
+            if old != new:
+                self._names[antenna] = new
+                for row in self._antenna_rows(antenna):
+                    self.dataChanged.emit(self.index(row), self.index(row), [self.NameRole])
+
+    def set_selection(self, selection: Mapping[str, str]) -> None:
+        """Applies bridge status antennas, e.g. `{"A": "3", "B": "-"}`."""
+        rows: set[int] = set()
+        for rig, value in selection.items():
+            old = self._selected.get(rig, -1)
+            antenna = antenna_from_status(value)
+            if old == -1 or old == antenna:
+                continue
+            self._selected[rig] = antenna
+            # The old and new antenna change state on every rig (reservation);
+            # under auto switching the rig's whole row does (only its antenna is selectable).
+            rows.update(self._antenna_rows(old))
+            rows.update(self._antenna_rows(antenna))
+            if self._auto[rig]:
+                rows.update(self._rig_rows(rig))
+        if rows:
+            self._refresh(sorted(rows))
+
+    def set_auto(self, rig: str, enabled: bool) -> None:
+        if rig in self._auto and self._auto[rig] != enabled:
+            self._auto[rig] = enabled
+            self._refresh(self._rig_rows(rig))
+
+    def set_interactive(self, interactive: bool) -> None:
+        """False while a command is in flight or the bridge is not OK."""
+        if self._interactive != interactive:
+            self._interactive = interactive
+            self._refresh(range(len(self._cells)))
+
+    def _antenna_rows(self, antenna: int | None) -> range:
+        if antenna is None:
+            return range(0)
+        return range(antenna, len(self._cells), len(self._names))
+
+    def _rig_rows(self, rig: str) -> range:
+        start = self._rigs.index(rig) * len(self._names)
+        return range(start, start + len(self._names))
+
+    def _cell_state(self, row: int) -> tuple[bool, bool, bool]:
+        rig_index, antenna = divmod(row, len(self._names))
+        rig = self._rigs[rig_index]
+        selected = self._selected[rig] == antenna
+        if antenna == 0:
+            return selected, False, self._interactive
+        reserved = any(self._selected[other] == antenna for other in self._rigs if other != rig)
+        selectable = self._interactive and not reserved and (not self._auto[rig] or selected)
+        return selected, reserved, selectable
+
+    def _refresh(self, rows: Iterable[int]) -> None:
+        # Adjacent rows with the same changed roles go out as one dataChanged range.
+        run_start = run_end = -1
+        run_roles: list[int] = []
+        for row in rows:
+            old = self._cells[row]
+            new = self._cell_state(row)
+            if new == old:
+                continue
+            self._cells[row] = new
+            self.updated_rows += 1
+            roles = [role for role, before, after in zip(self._STATE_ROLES, old, new) if before != after]
+            if roles == run_roles and row == run_end + 1:
+                run_end = row
+                continue
+            if run_roles:
+                self.dataChanged.emit(self.index(run_start), self.index(run_end), run_roles)
+            run_start = run_end = row
+            run_roles = roles
+        if run_roles:
+            self.dataChanged.emit(self.index(run_start), self.index(run_end), run_roles)
+
+
+class RigListModel(QAbstractListModel):
+    """One row per rig: name, frequency and auto-switch state."""
+
+    RigRole = Qt.ItemDataRole.UserRole + 1
+    NameRole = Qt.ItemDataRole.UserRole + 2
+    FreqRole = Qt.ItemDataRole.UserRole + 3
+    AutoRole = Qt.ItemDataRole.UserRole + 4
+    AutoAvailableRole = Qt.ItemDataRole.UserRole + 5
+
+    def __init__(self, rigs: Mapping[str, str], parent: QObject | None = None) -> None:
+        super().__init__(parent)
+        self._rigs = list(rigs)
+        self._names = dict(rigs)
+        self._freq = {rig: 0 for rig in self._rigs}
+        self._auto = {rig: False for rig in self._rigs}
+        self._interactive = False
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._rigs)
+
+    def roleNames(self) -> dict[int, QByteArray]:
+        return {
+            self.RigRole: QByteArray(b"rig"),
+            self.NameRole: QByteArray(b"name"),
+            self.FreqRole: QByteArray(b"freq"),
+            self.AutoRole: QByteArray(b"auto"),
+            self.AutoAvailableRole: QByteArray(b"autoAvailable"),
+        }
+
+    def data(self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole) -> Any:
+        row = index.row()
+        if not index.isValid() or not 0 <= row < len(self._rigs):
+            return None
+        rig = self._rigs[row]
+        if role == self.RigRole:
+            return rig
+        if role in (self.NameRole, Qt.ItemDataRole.DisplayRole):
+            return self._names[rig]
+        if role == self.FreqRole:
+            return self._freq[rig]
+        if role == self.AutoRole:
+            return self._auto[rig]
+        if role == self.AutoAvailableRole:
+            return self._interactive and self._freq[rig] > 0
+        return None
+
+    count = Property(int, lambda self: len(self._rigs), constant=True)
+
+    def set_freq(self, rig: str, freq: int) -> None:
+        old = self._freq.get(rig)
+        if old is None or old == freq:
+            return
+        self._freq[rig] = freq
+        roles = [self.FreqRole]
+        if (old > 0) != (freq > 0):
+            roles.append(self.AutoAvailableRole)
+        self._emit_row(rig, roles)
+
+    def set_auto(self, rig: str, enabled: bool) -> None:
+        if rig in self._auto and self._auto[rig] != enabled:
+            self._auto[rig] = enabled
+            self._emit_row(rig, [self.AutoRole])
+
+    def set_name(self, rig: str, name: str) -> None:
+        if rig in self._names and self._names[rig] != name:
+            self._names[rig] = name
+            self._emit_row(rig, [self.NameRole])
+
+    def set_interactive(self, interactive: bool) -> None:
+        if self._interactive != interactive:
+            self._interactive = interactive
+            self.dataChanged.emit(self.index(0), self.index(len(self._rigs) - 1), [self.AutoAvailableRole])
+
+    def _emit_row(self, rig: str, roles: list[int]) -> None:
+        index = self.index(self._rigs.index(rig))
+        self.dataChanged.emit(index, index, roles)
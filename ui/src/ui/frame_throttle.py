@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+from typing import Any, Callable, Hashable, Optional
+
+from PySide6.QtCore import QObject, Qt, QTimer
+
+from core.tracing import tracer
+
+
+class FrameThrottle(QObject):
+    """Pushes state changes to QML at most once per interval.
+
+    Wrapped callables keep only the newest arguments per key. The first call
+    after a quiet interval is delivered at once; calls within the interval
+    are held and flushed together when it ends, so a spinning VFO re-renders
+    the UI once per frame instead of once per datagram. Discrete events
+    should not go through here.
+    """
+
+    def __init__(self, interval_ms: int = 16, parent: QObject | None = None) -> None:
+        super().__init__(parent)
+        self._interval_ms = max(0, interval_ms)
+        self._latest: dict[Hashable, tuple[Callable[..., Any], tuple]] = {}
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setTimerType(Qt.TimerType.PreciseTimer)
+        self._timer.setInterval(self._interval_ms)
+        self._timer.timeout.connect(self._flush)
+        self.delivered = 0
+        self.dropped = 0
+
+    @property
+    def interval_ms(self) -> int:
+        return self._interval_ms
+
+    def throttled(
+        self,
+        func: Callable[..., Any],
+        key: Optional[Callable[..., Hashable]] = None,
+    ) -> Callable[..., None]:
+        """Wrap `func` so it runs at most once per key per interval, with the newest arguments."""
+        if self._interval_ms == 0:
+            return func
+        base = object()
+
+        def wrapper(*args: Any) -> None:
+            slot = (base, key(*args)) if key is not None else base
+            if self._timer.isActive():
+                if self._latest.get(slot) is not None:
+                    self.dropped += 1
+                self._latest[slot] = (tracer.bind(func), args)
+                return
+            self._timer.start()
+            self.delivered += 1
+            func(*args)
+
+        return wrapper
+
+    def flush(self) -> None:
+        """Deliver held updates now, e.g. before shutdown."""
+        self._timer.stop()
+        self._flush()
+
+    def _flush(self) -> None:
+        if not self._latest:
+            return
+        latest, self._latest = self._latest, {}
+        # Deliveries open a new interval, so updates they trigger are held too.
+        self._timer.start()
+        for func, args in latest.values():
+            self.delivered += 1
+            func(*args)
@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+import math
+
+from PySide6.QtCore import QObject, Property, QTimer, Signal
+
+from core.metrics import MetricsRegistry
+
+
+class MetricsStatus(QObject):
+    """Exposes a periodic snapshot of the metrics registry to QML.
+
+    QML binds to `values.<name>`, e.g. `bridge.metrics.values.ws_reconnects_total`.
+    Polling keeps the metric updates themselves free of Qt signals.
+    """
+
+    changed = Signal()
+
+    def __init__(self, registry: MetricsRegistry, interval_ms: int = 1000) -> None:
+        super().__init__()
+        self._registry = registry
+        self._values: dict[str, float] = registry.snapshot()
+        self._timer = QTimer(self)
+        self._timer.timeout.connect(self.refresh)
+        if interval_ms > 0:
+            self._timer.start(interval_ms)
+
+    def refresh(self) -> None:
+        values = self._registry.snapshot()
+        if not _same(values, self._values):
+            self._values = values
+            self.changed.emit()
+
+    values = Property("QVariantMap", lambda self: self._values, notify=changed)
+
+
+def _same(a: dict[str, float], b: dict[str, float]) -> bool:
+    # An unreadable gauge (e.g. no value yet) snapshots as NaN, which never equals itself.
+    if a.keys() != b.keys():
+        return False
+    return all(x == y or (math.isnan(x) and math.isnan(y)) for x, y in ((a[k], b[k]) for k in a))
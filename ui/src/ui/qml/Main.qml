@@ -5,14 +5,13 @@ import QtQuick.Layouts 1.15
 
 ApplicationWindow {
     id: root
-    width: 515
-    height: 85
+    width: Math.max(515, antennaGrid.width + 220)
+    height: Math.max(85, content.height + 20)
     visible: true
     title: appTitle
     Material.theme: appTheme === "dark" ? Material.Dark : (appTheme === "system" ? Material.System : Material.Light)
     Material.accent: Material.Teal
     Material.primary: Material.BlueGrey
-    readonly property bool statusOk: bridge.statusMessage === "OK"
     function formatKHz(value) {
         if (!value || value <= 0) {
             return "";
@@ -68,242 +67,86 @@ ApplicationWindow {
         }
     }
 
-    Column {
-        anchors.centerIn: parent
-        spacing: 1
-        width: parent.width * 0.97
-
-        Row {
-            spacing: 4
-            width: parent.width
-
-            CheckBox {
-                id: cbAutoA
-                text: qsTr("Auto")
-                height: rbA0.height
-                enabled: radioStatus.aFreq > 0 && !bridge.busy && statusOk
-                checked: bridge.autoA
-                onClicked: bridge.autoA = checked
-            }
-
-            ButtonGroup {
-                buttons: aRow.children
-                exclusive: true
-            }
-
-            Row {
-                id: aRow
-                spacing: 6
-
-                ToggleButton {
-                    id: rbA0
-                    text: antennaNames[0]
-                    enabled: !bridge.busy && statusOk
-                    checked: wsStatus.a === "-"
-                    onClicked: {
-                        if (rbA0.checked) {
-                            cbAutoA.checked = false;
-                            bridge.autoA = false;
-                        }
-                        bridge.selectAntenna("A", 0);
-                    }
-                }
-
-                ToggleButton {
-                    id: rbA1
-                    text: antennaNames[1]
-                    enabled: !bridge.busy && statusOk && !rbB1.checked && (!cbAutoA.checked || wsStatus.a === "1")
-                    checked: wsStatus.a === "1"
-                    onClicked: {
-                        bridge.selectAntenna("A", 1);
-                    }
-                }
-
-                ToggleButton {
-                    id: rbA2
-                    text: antennaNames[2]
-                    enabled: !bridge.busy && statusOk && !rbB2.checked && (!cbAutoA.checked || wsStatus.a === "2")
-                    checked: wsStatus.a === "2"
-                    onClicked: {
-                        bridge.selectAntenna("A", 2);
-                    }
-                }
-
-                ToggleButton {
-                    id: rbA3
-                    text: antennaNames[3]
-                    enabled: !bridge.busy && statusOk && !rbB3.checked && (!cbAutoA.checked || wsStatus.a === "3")
-                    checked: wsStatus.a === "3"
-                    onClicked: {
-                        bridge.selectAntenna("A", 3);
-                    }
+    Row {
+        id: content
+        anchors.left: parent.left
+        anchors.leftMargin: parent.width * 0.015
+        anchors.verticalCenter: parent.verticalCenter
+        spacing: 4
+
+        // Per-rig controls and the antenna grid come from bridge.rigs and
+        // bridge.antennaMatrix, so the layout follows the configured rigs and
+        // antennas. Interlocks are computed in the model, not in bindings.
+        Column {
+            spacing: 1
+
+            Repeater {
+                model: bridge.rigs
+
+                CheckBox {
+                    text: qsTr("Auto")
+                    height: 32
+                    enabled: model.autoAvailable
+                    checked: model.auto
+                    onClicked: bridge.setAuto(model.rig, checked)
                 }
-
-                ToggleButton {
-                    id: rbA4
-                    text: antennaNames[4]
-                    enabled: !bridge.busy && statusOk && !rbB4.checked && (!cbAutoA.checked || wsStatus.a === "4")
-                    checked: wsStatus.a === "4"
-                    onClicked: {
-                        bridge.selectAntenna("A", 4);
-                    }
-                }
-
-                ToggleButton {
-                    id: rbA5
-                    text: antennaNames[5]
-                    enabled: !bridge.busy && statusOk && !rbB5.checked && (!cbAutoA.checked || wsStatus.a === "5")
-                    checked: wsStatus.a === "5"
-                    onClicked: {
-                        bridge.selectAntenna("A", 5);
-                    }
-                }
-
-                ToggleButton {
-                    id: rbA6
-                    text: antennaNames[6]
-                    enabled: !bridge.busy && statusOk && !rbB6.checked && (!cbAutoA.checked || wsStatus.a === "6")
-                    checked: wsStatus.a === "6"
-                    onClicked: {
-                        bridge.selectAntenna("A", 6);
-                    }
-                }
-            }
-
-            Label {
-                id: lblRigA
-                text: rigAName
-                font.bold: true
-                height: rbA0.height
-                horizontalAlignment: Text.AlignLeft
-                verticalAlignment: Text.AlignVCenter
-                width: 40
-            }
-
-            Label {
-                id: lblRigAFreq
-                text: formatKHz(radioStatus.aFreq)
-                horizontalAlignment: Text.AlignLeft
-                verticalAlignment: Text.AlignVCenter
-                height: rbA0.height
             }
         }
 
-        Row {
-            spacing: 4
-            width: parent.width
+        Grid {
+            id: antennaGrid
+            columns: bridge.antennaMatrix.antennaCount
+            columnSpacing: 6
+            rowSpacing: 1
 
-            CheckBox {
-                id: cbAutoB
-                text: qsTr("Auto")
-                height: rbB0.height
-                enabled: radioStatus.bFreq > 0 && !bridge.busy && statusOk
-                checked: bridge.autoB
-                onClicked: bridge.autoB = checked
-            }
-
-            ButtonGroup {
-                buttons: bRow.children
-                exclusive: true
-            }
-
-            Row {
-                id: bRow
-                spacing: 6
+            Repeater {
+                model: bridge.antennaMatrix
 
                 ToggleButton {
-                    id: rbB0
-                    text: antennaNames[0]
-                    enabled: !bridge.busy && statusOk
-                    checked: wsStatus.b === "-"
+                    // Shows the antenna the bridge reports, not the click.
+                    checkable: false
+                    text: model.name
+                    enabled: model.selectable
+                    checked: model.selected
                     onClicked: {
-                        if (rbB0.checked) {
-                            cbAutoB.checked = false;
-                            bridge.autoB = false;
-                        }
-                        bridge.selectAntenna("B", 0);
+                        if (model.antenna === 0)
+                            bridge.setAuto(model.rig, false);
+                        bridge.selectAntenna(model.rig, model.antenna);
                     }
                 }
+            }
+        }
 
-                ToggleButton {
-                    id: rbB1
-                    text: antennaNames[1]
-                    enabled: !bridge.busy && statusOk && !rbA1.checked && (!cbAutoB.checked || wsStatus.b === "1")
-                    checked: wsStatus.b === "1"
-                    onClicked: {
-                        bridge.selectAntenna("B", 1);
-                    }
-                }
+        Column {
+            spacing: 1
 
-                ToggleButton {
-                    id: rbB2
-                    text: antennaNames[2]
-                    enabled: !bridge.busy && statusOk && !rbA2.checked && (!cbAutoB.checked || wsStatus.b === "2")
-                    checked: wsStatus.b === "2"
-                    onClicked: {
-                        bridge.selectAntenna("B", 2);
-                    }
-                }
+            Repeater {
+                model: bridge.rigs
 
-                ToggleButton {
-                    id: rbB3
-                    text: antennaNames[3]
-                    enabled: !bridge.busy && statusOk && !rbA3.checked && (!cbAutoB.checked || wsStatus.b === "3")
-                    checked: wsStatus.b === "3"
-                    onClicked: {
-                        bridge.selectAntenna("B", 3);
-                    }
+                Label {
+                    text: model.name
+                    font.bold: true
+                    height: 32
+                    width: 40
+                    horizontalAlignment: Text.AlignLeft
+                    verticalAlignment: Text.AlignVCenter
                 }
+            }
+        }
 
-                ToggleButton {
-                    id: rbB4
-                    text: antennaNames[4]
-                    enabled: !bridge.busy && statusOk && !rbA4.checked && (!cbAutoB.checked || wsStatus.b === "4")
-                    checked: wsStatus.b === "4"
-                    onClicked: {
-                        bridge.selectAntenna("B", 4);
-                    }
-                }
+        Column {
+            spacing: 1
 
-                ToggleButton {
-                    id: rbB5
-                    text: antennaNames[5]
-                    enabled: !bridge.busy && statusOk && !rbA5.checked && (!cbAutoB.checked || wsStatus.b === "5")
-                    checked: wsStatus.b === "5"
-                    onClicked: {
-                        bridge.selectAntenna("B", 5);
-                    }
-                }
+            Repeater {
+                model: bridge.rigs
 
-                ToggleButton {
-                    id: rbB6
-                    text: antennaNames[6]
-                    enabled: !bridge.busy && statusOk && !rbA6.checked && (!cbAutoB.checked || wsStatus.b === "6")
-                    checked: wsStatus.b === "6"
-                    onClicked: {
-                        bridge.selectAntenna("B", 6);
-                    }
+                Label {
+                    text: formatKHz(model.freq)
+                    height: 32
+                    horizontalAlignment: Text.AlignLeft
+                    verticalAlignment: Text.AlignVCenter
                 }
             }
-
-            Label {
-                id: lblRigB
-                text: rigBName
-                horizontalAlignment: Text.AlignLeft
-                verticalAlignment: Text.AlignVCenter
-                height: rbB0.height
-                width: 40
-                font.bold: true
-            }
-
-            Label {
-                id: lblRigBFreq
-                text: formatKHz(radioStatus.bFreq)
-                horizontalAlignment: Text.AlignLeft
-                verticalAlignment: Text.AlignVCenter
-                width: 40
-                height: rbB0.height
-            }
         }
     }
     footer: ToolBar {
@@ -316,6 +159,11 @@ ApplicationWindow {
                 text: bridge.statusMessage
                 leftPadding: 8
             }
+            Label {
+                id: lblRtt
+                visible: !isNaN(bridge.wsStatus.rtt)
+                text: "RTT " + bridge.wsStatus.rtt.toFixed(1) + " \u00b1 " + bridge.wsStatus.rttJitter.toFixed(1) + " ms"
+            }
             Label {
                 id: lblVersion
                 text: "Version " + appVersion
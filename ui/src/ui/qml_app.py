@@ -7,6 +7,7 @@ from PySide6.QtQml import QQmlApplicationEngine
 from PySide6.QtCore import QUrl
 
 from core.app_controller import AppController
+from core.startup_profile import StartupProfiler
 from core.version import get_version
 from ui.qml_bridge import QmlBridge
 
@@ -16,7 +17,11 @@ def _resource_path() -> Path:
     return base_dir / "ui" / "qml" / "Main.qml"
 
 
-def create_qml_engine(controller: AppController) -> QQmlApplicationEngine:
+def create_qml_engine(
+    controller: AppController,
+    profiler: StartupProfiler | None = None,
+    fast_start: bool = False,
+) -> QQmlApplicationEngine:
     engine = QQmlApplicationEngine()
     bridge = QmlBridge(controller)
     engine.rootContext().setContextProperty("bridge", bridge)
@@ -26,25 +31,14 @@ def create_qml_engine(controller: AppController) -> QQmlApplicationEngine:
     )
     engine.rootContext().setContextProperty("wsStatus", bridge.wsStatus)
     engine.rootContext().setContextProperty("radioStatus", bridge.radioStatus)
-    antenna_names = controller.settings.antennas
-    engine.rootContext().setContextProperty(
-        "antennaNames",
-        [
-            antenna_names.get("ant0Name", "OFF"),
-            antenna_names.get("ant1Name", "1"),
-            antenna_names.get("ant2Name", "2"),
-            antenna_names.get("ant3Name", "3"),
-            antenna_names.get("ant4Name", "4"),
-            antenna_names.get("ant5Name", "5"),
-            antenna_names.get("ant6Name", "6"),
-        ],
-    )
-    engine.rootContext().setContextProperty("rigAName", controller.settings.rig_a_name)
-    engine.rootContext().setContextProperty("rigBName", controller.settings.rig_b_name)
     engine.rootContext().setContextProperty("appTheme", controller.settings.theme)
-    engine.rootContext().setContextProperty("appVersion", get_version())
+    engine.rootContext().setContextProperty("appVersion", get_version(allow_git=not fast_start))
+    if profiler is not None:
+        profiler.mark("engine created")
 
     qml_path = _resource_path()
     engine.load(QUrl.fromLocalFile(str(qml_path)))
+    if profiler is not None:
+        profiler.mark("qml loaded")
     return engine
 
@@ -1,14 +1,35 @@
 from __future__ import annotations
 
-import json
-
 from PySide6.QtCore import QObject, Property, Signal, Slot
 
+from config.settings import AppSettings
 from core.app_controller import AppController
+from core.events import (
+    BRIDGE_ERROR,
+    BUSY,
+    COMMAND_CONFIRMED,
+    COMMAND_FAILED,
+    COMMAND_SENT,
+    CONFIG_ERROR,
+    RADIO_INFO,
+    SETTINGS,
+    WS_DISCONNECTED,
+    WS_ERROR,
+    WS_RTT,
+    WS_SEND_FAILED,
+    WS_STATUS,
+)
+from core.telemetry import FIELDS
 from core.logging_setup import get_logger
 from core.radio_info import Rig, RadioInfo
+from core.tracing import tracer
+from core.worker import ThreadDispatcher
+from ui.antenna_matrix import AntennaMatrixModel, RigListModel
+from ui.frame_throttle import FrameThrottle
+from ui.metrics_status import MetricsStatus
 from ui.radio_status import RadioStatus
-from ui.ws_status import WsStatus
+from ui.telemetry_model import TelemetryStatus
+from ui.ws_status import WsField, WsStatus
 
 
 class QmlBridge(QObject):
@@ -23,28 +44,75 @@ class QmlBridge(QObject):
         self._status = "Disconnected"
         self._status_message = "Disconnected"
         self._busy = False
-        self._auto_a = False
-        self._auto_b = False
+        self._auto_a = controller.auto_switch.is_enabled(Rig.A)
+        self._auto_b = controller.auto_switch.is_enabled(Rig.B)
         self._logger = get_logger(self.__class__.__name__)
         self._ws_status = WsStatus()
         self._radio_status = RadioStatus()
-        self._auto_rules = controller.settings.auto_rules
-        self._controller.set_ws_message_listener(self._handle_ws_message)
-        self._controller.set_ws_error_listener(self._handle_ws_error)
-        self._controller.set_ws_disconnect_listener(self._handle_ws_disconnected)
-        self._controller.set_ws_send_failed_listener(self._handle_ws_send_failed)
-        self._controller.set_udp_info_listener(self._handle_udp_info)
+        self._metrics = MetricsStatus(controller.metrics, controller.settings.metrics_ui_interval_ms)
+        settings = controller.settings
+        self._telemetry = TelemetryStatus(
+            settings.telemetry_raw_samples,
+            settings.telemetry_minute_buckets,
+            settings.telemetry_quarter_hour_buckets,
+            parent=self,
+        )
+        self._rigs = RigListModel({Rig.A.value: settings.rig_a_name, Rig.B.value: settings.rig_b_name}, self)
+        self._matrix = AntennaMatrixModel([Rig.A.value, Rig.B.value], settings.antennas.values(), self)
+        self._sync_auto(Rig.A, self._auto_a)
+        self._sync_auto(Rig.B, self._auto_b)
+        self._auto_switch = controller.auto_switch
+        # Calls into the controller go through its dispatcher; controller events
+        # come back through ours. Both run inline unless the controller has its
+        # own thread, in which case state updates are coalesced per event-loop turn
+        # and status deltas merged.
+        self._core = controller.dispatcher
+        ui = ThreadDispatcher(self if self._core.threaded else None)
+        events = controller.events
+        events.subscribe(COMMAND_SENT, ui.queued(self._handle_command_sent), name="ui")
+        events.subscribe(COMMAND_CONFIRMED, ui.queued(self._handle_command_confirmed), name="ui")
+        events.subscribe(COMMAND_FAILED, ui.queued(self._handle_command_failed), name="ui")
+        events.subscribe(BUSY, ui.coalesced(self._set_busy), name="ui")
+        events.subscribe(WS_STATUS, ui.merged(self._handle_ws_status), name="ui")
+        events.subscribe(BRIDGE_ERROR, ui.queued(self._handle_bridge_error), name="ui")
+        events.subscribe(WS_ERROR, ui.queued(self._handle_ws_error), name="ui")
+        events.subscribe(WS_DISCONNECTED, ui.queued(self._handle_ws_disconnected), name="ui")
+        events.subscribe(WS_SEND_FAILED, ui.queued(self._handle_ws_send_failed), name="ui")
+        events.subscribe(WS_RTT, ui.coalesced(self._ws_status.update_rtt), name="ui")
+        events.subscribe(SETTINGS, ui.coalesced(self._handle_settings), name="ui")
+        events.subscribe(CONFIG_ERROR, ui.queued(self._handle_config_error), name="ui")
+        # Auto switching sees every RadioInfo frame first; QML gets at most one
+        # frequency update per rig per frame interval.
+        self._throttle = FrameThrottle(settings.app_ui_update_interval_ms, self)
+        events.subscribe(
+            RADIO_INFO,
+            ui.coalesced(
+                self._throttle.throttled(self._handle_udp_info, key=lambda info: info.radio),
+                key=lambda info: info.radio,
+            ),
+            name="ui",
+        )
+        if controller.state.ws_status:
+            # A status may have arrived on the controller thread before the bridge subscribed.
+            self._handle_ws_status(dict(controller.state.ws_status))
 
     @Slot(str)
     def sendText(self, text: str) -> None:
         message = text.strip()
         if not message:
             return
-        self._controller.send_text(message)
+        self._core.call(self._controller.send_text, message)
 
     @Slot(str, int)
     def selectAntenna(self, rig: str, value: int) -> None:
-        self._select_antenna_internal(rig, value)
+        self._core.call(self._auto_switch.select, rig, value)
+
+    @Slot(str, bool)
+    def setAuto(self, rig: str, enabled: bool) -> None:
+        if rig == Rig.A:
+            self._set_auto_a(enabled)
+        elif rig == Rig.B:
+            self._set_auto_b(enabled)
 
     def _get_status(self) -> str:
         return self._status
@@ -65,6 +133,7 @@ class QmlBridge(QObject):
             return
         self._status_message = value
         self.statusMessageChanged.emit()
+        self._sync_interactive()
 
     statusMessage = Property(str, _get_status_message, _set_status_message, notify=statusMessageChanged)
 
@@ -76,6 +145,7 @@ class QmlBridge(QObject):
             return
         self._busy = value
         self.busyChanged.emit()
+        self._sync_interactive()
 
     busy = Property(bool, _get_busy, _set_busy, notify=busyChanged)
 
@@ -87,6 +157,8 @@ class QmlBridge(QObject):
             return
         self._auto_a = value
         self.autoAChanged.emit()
+        self._sync_auto(Rig.A, value)
+        self._core.call(self._auto_switch.set_enabled, Rig.A, value)
 
     autoA = Property(bool, _get_auto_a, _set_auto_a, notify=autoAChanged)
 
@@ -98,97 +170,89 @@ class QmlBridge(QObject):
             return
         self._auto_b = value
         self.autoBChanged.emit()
+        self._sync_auto(Rig.B, value)
+        self._core.call(self._auto_switch.set_enabled, Rig.B, value)
 
     autoB = Property(bool, _get_auto_b, _set_auto_b, notify=autoBChanged)
 
-    def _handle_ws_message(self, message: str) -> None:
-        try:
-            data = json.loads(message)
-        except json.JSONDecodeError as exc:
-            self._logger.warning("Invalid JSON message: %s", exc)
-            return
-        if isinstance(data, dict):
-            if "error" in data:
-                self._set_busy(False)
-                self._set_status_message(data["error"])
-                return
-            self._ws_status.update_from_dict(data)
-            self._set_busy(False)
-            self._set_status_message("OK")
+    def _sync_auto(self, rig: Rig, value: bool) -> None:
+        self._rigs.set_auto(rig.value, value)
+        self._matrix.set_auto(rig.value, value)
+
+    def _sync_interactive(self) -> None:
+        interactive = not self._busy and self._status_message == "OK"
+        self._rigs.set_interactive(interactive)
+        self._matrix.set_interactive(interactive)
+
+    def _handle_ws_status(self, data: dict) -> None:
+        with tracer.span("ui status"):
+            applied = self._ws_status.update_from_dict(data)
+            if applied & (WsField.A | WsField.B):
+                self._matrix.set_selection({Rig.A.value: self._ws_status.a, Rig.B.value: self._ws_status.b})
+            if any(field in data for field in FIELDS):
+                # A delta may carry a single field; the sample is the whole current status.
+                self._telemetry.record(self._ws_status)
+            if not self._busy:
+                self._set_status_message("OK")
+
+    def _handle_settings(self, settings: AppSettings) -> None:
+        self._rigs.set_name(Rig.A.value, settings.rig_a_name)
+        self._rigs.set_name(Rig.B.value, settings.rig_b_name)
+        self._matrix.set_antenna_names(settings.antennas.values())
+
+    def _handle_config_error(self, error: str) -> None:
+        self._set_status_message(f"Config error: {error}")
+
+    def _handle_bridge_error(self, error: str) -> None:
+        self._set_status_message(error)
 
     def _handle_ws_error(self, error: str) -> None:
         self._logger.warning("WebSocket error: %s", error)
-        self._set_busy(False)
         self._set_status_message(error)
 
     def _handle_ws_disconnected(self) -> None:
-        self._set_busy(False)
+        self._telemetry.interrupt()
         self._set_status_message("Disconnected")
 
     def _handle_ws_send_failed(self, reason: str) -> None:
         self._logger.warning("WebSocket send failed: %s", reason)
-        self._set_busy(False)
         self._set_status_message(f"Send failed: {reason}")
 
+    def _handle_command_sent(self, command: str) -> None:
+        self._set_status_message(f"Sending command: {command}")
+
+    def _handle_command_confirmed(self, command: str, latency_ms: float) -> None:
+        with tracer.span("ui confirmed", command=command):
+            self._set_status_message("OK")
+
+    def _handle_command_failed(self, command: str, reason: str) -> None:
+        self._set_status_message(f"Command {command} failed: {reason}")
+
     @Property(QObject, constant=True)
     def wsStatus(self) -> WsStatus:
         return self._ws_status
 
-    def _handle_udp_info(self, info) -> None:
-        self._radio_status.update_from_radio_info(info)
-        if isinstance(info, RadioInfo):
-            self._apply_auto_rule(info)
+    def _handle_udp_info(self, info: RadioInfo) -> None:
+        with tracer.span("ui radio info"):
+            if self._radio_status.update_from_radio_info(info):
+                self._rigs.set_freq(info.radio.value, info.freq)
 
     @Property(QObject, constant=True)
     def radioStatus(self) -> RadioStatus:
         return self._radio_status
 
-    def _apply_auto_rule(self, info: RadioInfo) -> None:
-        if self._busy:
-            return
-        if info.radio == Rig.A and not self._auto_a:
-            return
-        if info.radio == Rig.B and not self._auto_b:
-            return
-
-        rule = self._select_rule(info.radio,info.freq)
-        if rule is None:
-            return
-
-        primary = int(rule.get("primaryAntenna", 0))
-        secondary = int(rule.get("secondaryAntenna", 0))
-        selected = primary
+    @Property(QObject, constant=True)
+    def rigs(self) -> RigListModel:
+        return self._rigs
 
-        other = self._current_antenna(Rig.B if info.radio == Rig.A else Rig.A)
-        if other == str(primary):
-            selected = secondary
+    @Property(QObject, constant=True)
+    def antennaMatrix(self) -> AntennaMatrixModel:
+        return self._matrix
 
-        current = self._current_antenna(info.radio)
-        if current == str(selected):
-            return
+    @Property(QObject, constant=True)
+    def metrics(self) -> MetricsStatus:
+        return self._metrics
 
-        self._select_antenna_internal(info.radio.value, selected)
-
-    def _select_rule(self, rig: Rig, freq_khz: int) -> dict | None:
-        for rule in self._auto_rules:
-            if str(rule.get("rig", "")).upper() != rig.value:
-                continue
-            min_freq = int(rule.get("minFrequency", 0))
-            max_freq = int(rule.get("maxFrequency", 0))
-            if min_freq <= freq_khz < max_freq:
-                return rule
-        return None
-
-    def _current_antenna(self, rig: Rig) -> str:
-        return self._ws_status._a if rig == Rig.A else self._ws_status._b
-
-    def _select_antenna_internal(self, rig: str, value: int) -> None:
-        rig = rig.upper()
-        target = "-" if value == 0 else str(value)
-        current = self._ws_status.a if rig == "A" else self._ws_status.b
-        if current == target:
-            return
-        command = f"{rig}{'-' if value == 0 else value}"
-        self._set_status_message(f"Sending command: {command}")
-        self._set_busy(True)
-        self._controller.send_text(command)
+    @Property(QObject, constant=True)
+    def telemetry(self) -> TelemetryStatus:
+        return self._telemetry
@@ -6,25 +6,27 @@ from core.radio_info import RadioInfo, Rig
 
 
 class RadioStatus(QObject):
-    changed = Signal()
+    aFreqChanged = Signal()
+    bFreqChanged = Signal()
 
     def __init__(self) -> None:
         super().__init__()
         self._a_freq = 0
         self._b_freq = 0
 
-    def update_from_radio_info(self, info: RadioInfo) -> None:
-        updated = False
-
-        if info.radio == Rig.A and self._a_freq != info.freq:
+    def update_from_radio_info(self, info: RadioInfo) -> bool:
+        """Applies a RadioInfo frame; returns True if a frequency changed."""
+        if info.radio == Rig.A:
+            if self._a_freq == info.freq:
+                return False
             self._a_freq = info.freq
-            updated = True
-        elif info.radio == Rig.B and self._b_freq != info.freq:
+            self.aFreqChanged.emit()
+        else:
+            if self._b_freq == info.freq:
+                return False
             self._b_freq = info.freq
-            updated = True
-
-        if updated:
-            self.changed.emit()
+            self.bFreqChanged.emit()
+        return True
 
-    aFreq = Property(int, lambda self: self._a_freq, notify=changed)
-    bFreq = Property(int, lambda self: self._b_freq, notify=changed)
+    aFreq = Property(int, lambda self: self._a_freq, notify=aFreqChanged)
+    bFreq = Property(int, lambda self: self._b_freq, notify=bFreqChanged)
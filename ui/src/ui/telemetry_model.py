@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+import math
+import time
+from typing import Any, Callable
+
+from PySide6.QtCore import QAbstractTableModel, QByteArray, QModelIndex, QObject, Property, Qt, QTimer, Signal, Slot
+
+from core.telemetry import FIELDS, TelemetryHistory, TelemetryLevel
+from ui.ws_status import WsStatus
+
+
+class TelemetryModel(QAbstractTableModel):
+    """Rows of one TelemetryLevel, oldest first, read in place from its series.
+
+    Column 0 is the time (ms since the epoch, for a QML Date or a
+    DateTimeAxis), then the mean of each field in FIELDS order, then the
+    minimums, then the maximums, so a QtCharts model mapper can pick
+    columns. Views can use the roles `time`, `<field>`, `<field>Min` and
+    `<field>Max` instead, and a Canvas can call `value(row, role)`. On the
+    raw level min, mean and max are the sample. A new row is reported as an
+    insert at the end (after removing row 0 once the series is full), so
+    views never reload the history.
+    """
+
+    TimeRole = Qt.ItemDataRole.UserRole + 1
+
+    countChanged = Signal()
+
+    def __init__(self, level: TelemetryLevel, parent: QObject | None = None) -> None:
+        super().__init__(parent)
+        self._level = level
+        self._series = level.series
+        fields = len(FIELDS)
+        # Column in the series for each model column after the time; the raw level has one per field.
+        self._columns = [column % fields if not level.bucketed else column for column in range(3 * fields)]
+        self._role_names = {self.TimeRole: QByteArray(b"time")}
+        self._role_columns: dict[int, int] = {}
+        self._name_roles = {"time": self.TimeRole}
+        for offset, suffix in enumerate(("", "Min", "Max")):
+            for column, field in enumerate(FIELDS):
+                role = self.TimeRole + 1 + offset * fields + column
+                name = field + suffix
+                self._role_names[role] = QByteArray(name.encode())
+                self._role_columns[role] = self._columns[offset * fields + column]
+                self._name_roles[name] = role
+        level.set_append_listener(self._append)
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._series)
+
+    def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else 1 + len(self._columns)
+
+    def roleNames(self) -> dict[int, QByteArray]:
+        return self._role_names
+
+    def data(self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole) -> Any:
+        row = index.row()
+        if not index.isValid() or not 0 <= row < len(self._series):
+            return None
+        if role == Qt.ItemDataRole.DisplayRole:
+            column = index.column()
+            if column == 0:
+                return self._series.time(row) * 1000.0
+            return self._series.value(row, self._columns[column - 1]) if column <= len(self._columns) else None
+        return self._value(row, role)
+
+    def headerData(self, section: int, orientation: Qt.Orientation, role: int = Qt.ItemDataRole.DisplayRole) -> Any:
+        if orientation != Qt.Orientation.Horizontal or role != Qt.ItemDataRole.DisplayRole:
+            return None
+        return self._role_names[self.TimeRole + section].data().decode() if section <= len(self._columns) else None
+
+    @Slot(int, str, result=float)
+    def value(self, row: int, role: str) -> float:
+        """`role` as in roleNames(), e.g. `rssiMin`; NaN for an unknown row or name."""
+        if not 0 <= row < len(self._series) or role not in self._name_roles:
+            return math.nan
+        return self._value(row, self._name_roles[role])
+
+    count = Property(int, lambda self: len(self._series), notify=countChanged)
+    bucketSeconds = Property(float, lambda self: self._level.width_s, constant=True)
+
+    def _value(self, row: int, role: int) -> float | None:
+        if role == self.TimeRole:
+            return self._series.time(row) * 1000.0
+        column = self._role_columns.get(role)
+        return None if column is None else self._series.value(row, column)
+
+    def _append(self, append: Callable[[], None]) -> None:
+        if self._series.full:
+            self.beginRemoveRows(QModelIndex(), 0, 0)
+            self._series.drop_oldest()
+            self.endRemoveRows()
+        row = len(self._series)
+        self.beginInsertRows(QModelIndex(), row, row)
+        append()
+        self.endInsertRows()
+        self.countChanged.emit()
+
+
+class TelemetryStatus(QObject):
+    """History of the bridge's link quality and power for QML charts.
+
+    `raw`, `minute` and `quarterHour` are TelemetryModels over one
+    TelemetryHistory. A timer closes the minute buckets on the minute while
+    no status arrives.
+    """
+
+    def __init__(
+        self,
+        raw_samples: int = 4096,
+        minute_buckets: int = 2880,
+        quarter_hour_buckets: int = 672,
+        clock: Callable[[], float] = time.time,
+        parent: QObject | None = None,
+    ) -> None:
+        super().__init__(parent)
+        self._clock = clock
+        self._history = TelemetryHistory(raw_samples, minute_buckets, quarter_hour_buckets)
+        self._raw = TelemetryModel(self._history.raw, self)
+        self._minute = TelemetryModel(self._history.minute, self)
+        self._quarter_hour = TelemetryModel(self._history.quarter_hour, self)
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self._tick)
+        self._tick()
+
+    @property
+    def history(self) -> TelemetryHistory:
+        return self._history
+
+    def record(self, status: WsStatus) -> None:
+        self._history.record(self._clock(), [getattr(status, field) for field in FIELDS])
+
+    def interrupt(self) -> None:
+        self._history.interrupt()
+
+    def _tick(self) -> None:
+        now = self._clock()
+        self._history.advance(now)
+        width = self._history.minute.width_s
+        self._timer.start(int((width - now % width) * 1000) + 50)
+
+    raw = Property(QObject, lambda self: self._raw, constant=True)
+    minute = Property(QObject, lambda self: self._minute, constant=True)
+    quarterHour = Property(QObject, lambda self: self._quarter_hour, constant=True)
@@ -1,10 +1,40 @@
 from __future__ import annotations
 
+import math
+from enum import IntFlag
+
 from PySide6.QtCore import QObject, Property, Signal
 
 
+class WsField(IntFlag):
+    NONE = 0
+    A = 1
+    B = 2
+    CMDS = 4
+    I2CS = 8
+    RSSI = 16
+    SNR = 32
+    LRSSI = 64
+    PWR = 128
+    LINK = RSSI | SNR | LRSSI
+    MAST = CMDS | I2CS | PWR
+
+
 class WsStatus(QObject):
-    changed = Signal()
+    """Latest bridge status for QML.
+
+    Antenna positions have their own notify signals and the remaining fields
+    are grouped, so the bridge's periodic link-quality frames do not
+    re-evaluate the antenna button bindings. The ping round trip to the
+    bridge is measured by the client, not reported in status frames; it is
+    NaN while unknown.
+    """
+
+    aChanged = Signal()
+    bChanged = Signal()
+    linkChanged = Signal()
+    mastChanged = Signal()
+    rttChanged = Signal()
 
     def __init__(self) -> None:
         super().__init__()
@@ -16,33 +46,85 @@ class WsStatus(QObject):
         self._snr = 0
         self._lrssi = 0
         self._pwr = 0
+        self._rtt = math.nan
+        self._rtt_jitter = math.nan
+
+    def update_from_dict(self, data: dict) -> WsField:
+        """Applies a status frame and returns the fields it changed."""
+        applied = WsField.NONE
+        if "a" in data:
+            a = str(data["a"])
+            if a != self._a:
+                self._a = a
+                applied |= WsField.A
+        if "b" in data:
+            b = str(data["b"])
+            if b != self._b:
+                self._b = b
+                applied |= WsField.B
+        if "cmds" in data:
+            cmds = int(data["cmds"])
+            if cmds != self._cmds:
+                self._cmds = cmds
+                applied |= WsField.CMDS
+        if "i2cs" in data:
+            i2cs = int(data["i2cs"])
+            if i2cs != self._i2cs:
+                self._i2cs = i2cs
+                applied |= WsField.I2CS
+        if "rssi" in data:
+            rssi = int(data["rssi"])
+            if rssi != self._rssi:
+                self._rssi = rssi
+                applied |= WsField.RSSI
+        if "snr" in data:
+            snr = int(data["snr"])
+            if snr != self._snr:
+                self._snr = snr
+                applied |= WsField.SNR
+        if "lrssi" in data:
+            lrssi = int(data["lrssi"])
+            if lrssi != self._lrssi:
+                self._lrssi = lrssi
+                applied |= WsField.LRSSI
+        if "pwr" in data:
+            pwr = int(data["pwr"])
+            if pwr != self._pwr:
+                self._pwr = pwr
+                applied |= WsField.PWR
+
+        if applied & WsField.A:
+            self.aChanged.emit()
+        if applied & WsField.B:
+            self.bChanged.emit()
+        if applied & WsField.LINK:
+            self.linkChanged.emit()
+        if applied & WsField.MAST:
+            self.mastChanged.emit()
+        return applied
+
+    def update_rtt(self, rtt_ms: float, jitter_ms: float) -> bool:
+        """Applies a round trip estimate, rounded to 0.1 ms; True if it changed."""
+        rtt = round(rtt_ms, 1)
+        jitter = round(jitter_ms, 1)
+        if _same(rtt, self._rtt) and _same(jitter, self._rtt_jitter):
+            return False
+        self._rtt = rtt
+        self._rtt_jitter = jitter
+        self.rttChanged.emit()
+        return True
+
+    a = Property(str, lambda self: self._a, notify=aChanged)
+    b = Property(str, lambda self: self._b, notify=bChanged)
+    cmds = Property(int, lambda self: self._cmds, notify=mastChanged)
+    i2cs = Property(int, lambda self: self._i2cs, notify=mastChanged)
+    rssi = Property(int, lambda self: self._rssi, notify=linkChanged)
+    snr = Property(int, lambda self: self._snr, notify=linkChanged)
+    lrssi = Property(int, lambda self: self._lrssi, notify=linkChanged)
+    pwr = Property(int, lambda self: self._pwr, notify=mastChanged)
+    rtt = Property(float, lambda self: self._rtt, notify=rttChanged)
+    rttJitter = Property(float, lambda self: self._rtt_jitter, notify=rttChanged)
+
 
-    def update_from_dict(self, data: dict) -> None:
-        updated = False
-
-        def set_if_changed(attr: str, value) -> None:
-            nonlocal updated
-            if getattr(self, attr) != value:
-                setattr(self, attr, value)
-                updated = True
-
-        set_if_changed("_a", str(data.get("a", self._a)))
-        set_if_changed("_b", str(data.get("b", self._b)))
-        set_if_changed("_cmds", int(data.get("cmds", self._cmds)))
-        set_if_changed("_i2cs", int(data.get("i2cs", self._i2cs)))
-        set_if_changed("_rssi", int(data.get("rssi", self._rssi)))
-        set_if_changed("_snr", int(data.get("snr", self._snr)))
-        set_if_changed("_lrssi", int(data.get("lrssi", self._lrssi)))
-        set_if_changed("_pwr", int(data.get("pwr", self._pwr)))
-
-        if updated:
-            self.changed.emit()
-
-    a = Property(str, lambda self: self._a, notify=changed)
-    b = Property(str, lambda self: self._b, notify=changed)
-    cmds = Property(int, lambda self: self._cmds, notify=changed)
-    i2cs = Property(int, lambda self: self._i2cs, notify=changed)
-    rssi = Property(int, lambda self: self._rssi, notify=changed)
-    snr = Property(int, lambda self: self._snr, notify=changed)
-    lrssi = Property(int, lambda self: self._lrssi, notify=changed)
-    pwr = Property(int, lambda self: self._pwr, notify=changed)
+def _same(a: float, b: float) -> bool:
+    return a == b or (math.isnan(a) and math.isnan(b))
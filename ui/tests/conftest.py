@@ -0,0 +1,20 @@
+from __future__ import annotations
+
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+SRC_DIR = Path(__file__).resolve().parents[1] / "src"
+if str(SRC_DIR) not in sys.path:
+    sys.path.insert(0, str(SRC_DIR))
+
+from PySide6.QtCore import QCoreApplication  # noqa: E402
+
+
+@pytest.fixture(scope="session")
+def qapp() -> QCoreApplication:
+    return QCoreApplication.instance() or QCoreApplication([])
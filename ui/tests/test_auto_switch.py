@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+from core.auto_rules import RuleIndex
+from core.auto_switch import AutoSwitch
+from core.command_pipeline import CommandConfig, CommandPipeline
+from core.radio_info import Rig, parse_radio_info_bytes
+from core.switch_policy import SwitchPolicy, SwitchPolicyConfig
+
+RULES = [{"rig": "A", "minFrequency": 7000, "maxFrequency": 7300, "primaryAntenna": 1, "secondaryAntenna": 2}]
+
+
+def _frame(freq_khz: int):
+    return parse_radio_info_bytes(
+        b"<RadioInfo><StationName>TEST</StationName><RadioNr>1</RadioNr>"
+        b"<Freq>%d</Freq><TXFreq>%d</TXFreq><Mode>CW</Mode></RadioInfo>" % (freq_khz * 100, freq_khz * 100)
+    )
+
+
+def test_manual_selection_survives_out_of_range_frames_with_policy_off(qapp):
+    sent: list[str] = []
+    commands = CommandPipeline(CommandConfig(timeout_ms=0), lambda command: sent.append(command) or True)
+    # Hysteresis, settle time and rate limit all off, as in the shipped config.
+    auto = AutoSwitch(RuleIndex.compile(RULES), SwitchPolicy(SwitchPolicyConfig()), commands)
+    auto.set_enabled(Rig.A, True)
+
+    auto.handle_radio_info(_frame(7050))
+    commands.handle_status("1", "-")
+    auto.select("A", 3)
+    commands.handle_status("3", "-")
+    for _ in range(3):
+        auto.handle_radio_info(_frame(144000))
+
+    assert sent == ["A1", "A3"]
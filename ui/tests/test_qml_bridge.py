@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+import dataclasses
+import threading
+import time
+
+from config.settings import load_settings
+from core.app_controller import AppController
+from core.state import AppState
+from core.status_codec import encode_status
+from core.worker import ControllerThread
+from ui.qml_bridge import QmlBridge
+
+FULL_STATUS = {"a": "-", "b": "-", "cmds": 0, "i2cs": 0, "rssi": -50, "snr": 8, "lrssi": -48, "pwr": 10}
+
+
+def _settings():
+    return dataclasses.replace(
+        load_settings(None),
+        ws_auto_reconnect=False,
+        udp_port=0,
+        metrics_port=0,
+        log_console=False,
+        journal_directory=None,
+        capture_file=None,
+    )
+
+
+def test_status_deltas_in_one_turn_are_merged(qapp):
+    controller = AppController(settings=_settings(), state=AppState())
+    worker = ControllerThread(controller)
+    bridge = QmlBridge(controller)
+    worker.start()
+    try:
+        relay_on = {**FULL_STATUS, "a": "1"}
+        stronger = {**relay_on, "rssi": -40}
+        frames = [encode_status(FULL_STATUS), encode_status(relay_on, FULL_STATUS), encode_status(stronger, relay_on)]
+        done = threading.Event()
+
+        def receive() -> None:
+            # The GUI thread is blocked in done.wait(), so both deltas land in one of its turns.
+            for frame in frames:
+                controller._handle_ws_binary_message(frame)
+            done.set()
+
+        controller.dispatcher.call(receive)
+        assert done.wait(2.0)
+        deadline = time.monotonic() + 2.0
+        while bridge.wsStatus.rssi != -40 and time.monotonic() < deadline:
+            qapp.processEvents()
+        assert bridge.wsStatus.rssi == -40
+        assert bridge.wsStatus.a == "1"
+    finally:
+        worker.stop()
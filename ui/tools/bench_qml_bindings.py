@@ -0,0 +1,125 @@
+"""Counts the QML updates a status frame causes, and times the frames.
+
+Usage: python tools/bench_qml_bindings.py [--frames N]
+
+Loads Main.qml on the offscreen platform and feeds the bridge typical
+frames: a bridge ping status (link quality only), an antenna switch on rig A
+and an N1MM frequency update for rig A. For every notify signal of
+`wsStatus`/`radioStatus` a frame emits, the bindings connected to that signal
+are re-evaluated; "bindings" is the sum of their receivers. "model roles" is
+the number of (row, role) pairs the antenna matrix and rig models report in
+`dataChanged`, which is what the delegates re-read. --frames of each kind are
+then pushed through the bridge and timed, including the QML re-evaluation.
+"""
+from __future__ import annotations
+
+import argparse
+import dataclasses
+import os
+import sys
+import time
+from pathlib import Path
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+UI_DIR = Path(__file__).resolve().parents[1]
+SRC_DIR = UI_DIR / "src"
+if str(SRC_DIR) not in sys.path:
+    sys.path.insert(0, str(SRC_DIR))
+
+from PySide6.QtCore import QObject, SIGNAL
+from PySide6.QtGui import QGuiApplication
+
+from config.settings import load_settings
+from core.app_controller import AppController
+from core.radio_info import parse_radio_info
+from core.state import AppState
+from ui.qml_app import create_qml_engine
+
+
+def _notify_signals(obj: QObject) -> dict[str, int]:
+    """Notify signal signature -> number of connected bindings."""
+    meta = obj.metaObject()
+    signals: dict[str, int] = {}
+    for index in range(meta.propertyOffset(), meta.propertyCount()):
+        prop = meta.property(index)
+        if prop.hasNotifySignal():
+            signature = bytes(prop.notifySignal().methodSignature()).decode()
+            signals[signature] = obj.receivers(SIGNAL(signature))
+    return signals
+
+
+RADIO_INFO = parse_radio_info(
+    "<RadioInfo><RadioNr>1</RadioNr><Freq>700000</Freq><TXFreq>700000</TXFreq><Mode>CW</Mode></RadioInfo>"
+)
+
+
+def _status(a: str, rssi: int) -> dict:
+    return {"a": a, "b": "2", "cmds": 0, "i2cs": 0, "rssi": rssi, "snr": 8, "lrssi": rssi + 2, "pwr": 10}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--frames", type=int, default=5000, help="frames of each kind to time")
+    args = parser.parse_args()
+
+    app = QGuiApplication(sys.argv[:1])
+    controller = AppController(settings=load_settings(UI_DIR / "config.json"), state=AppState())
+    engine = create_qml_engine(controller, fast_start=True)
+    if not engine.rootObjects():
+        print("Main.qml failed to load")
+        return 1
+    bridge = engine.rootContext().contextProperty("bridge")
+    ws_status = bridge.wsStatus
+    radio_status = bridge.radioStatus
+    bindings = {id(ws_status): _notify_signals(ws_status), id(radio_status): _notify_signals(radio_status)}
+
+    emitted: list[tuple[int, str]] = []
+    model_roles = [0]
+
+    def count_roles(top, bottom, roles) -> None:
+        model_roles[0] += (bottom.row() - top.row() + 1) * len(roles)
+
+    def updates_for(apply) -> tuple[int, int]:
+        spies = []
+        for obj in (ws_status, radio_status):
+            for signature in bindings[id(obj)]:
+                signal = getattr(obj, signature.split("(")[0])
+                spy = lambda obj=obj, signature=signature: emitted.append((id(obj), signature))  # noqa: E731
+                signal.connect(spy)
+                spies.append((signal, spy))
+        for model in (bridge.antennaMatrix, bridge.rigs):
+            model.dataChanged.connect(count_roles)
+            spies.append((model.dataChanged, count_roles))
+        emitted.clear()
+        model_roles[0] = 0
+        apply()
+        for signal, spy in spies:
+            signal.disconnect(spy)
+        app.processEvents()
+        return sum(bindings[obj][signature] for obj, signature in set(emitted)), model_roles[0]
+
+    bridge._handle_ws_status(_status("1", -80))
+    bridge._handle_udp_info(RADIO_INFO)
+    kinds = {
+        "bridge ping (rssi/snr)": lambda i: bridge._handle_ws_status(_status("1", -80 - i % 7 - 1)),
+        "antenna switch (a)": lambda i: bridge._handle_ws_status(_status("1" if i % 2 else "3", -80)),
+        "N1MM frequency (aFreq)": lambda i: bridge._handle_udp_info(
+            dataclasses.replace(RADIO_INFO, freq=RADIO_INFO.freq + (i % 2 + 1) * 10)
+        ),
+    }
+    print(f"{'frame':<26}{'bindings':>10}{'model roles':>13}{'us/frame':>10}")
+    for label, apply in kinds.items():
+        bindings_per_frame, roles_per_frame = updates_for(lambda: apply(0))
+        started = time.perf_counter()
+        for index in range(args.frames):
+            apply(index)
+        app.processEvents()
+        elapsed = time.perf_counter() - started
+        print(f"{label:<26}{bindings_per_frame:>10}{roles_per_frame:>13}{elapsed / args.frames * 1e6:>10.1f}")
+    controller.dispose()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
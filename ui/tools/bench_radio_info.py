@@ -0,0 +1,109 @@
+"""Micro-benchmark: ElementTree RadioInfo parsing vs. the bytes fast path.
+
+Usage: python tools/bench_radio_info.py [frames.jsonl] [--rounds N]
+
+The frames file holds one JSON-encoded N1MM UDP payload per line (RadioInfo,
+contactinfo, spot, ...), in the order they were received.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+SRC_DIR = Path(__file__).resolve().parents[1] / "src"
+if str(SRC_DIR) not in sys.path:
+    sys.path.insert(0, str(SRC_DIR))
+
+from core.radio_info import RadioInfoParser, parse_radio_info, parse_radio_info_bytes
+
+DEFAULT_FRAMES = Path(__file__).with_name("data") / "n1mm_frames.jsonl"
+
+
+def load_frames(path: Path) -> list[bytes]:
+    frames = []
+    for line in path.read_text(encoding="utf-8").splitlines():
+        if line.strip():
+            frames.append(json.loads(line).encode("utf-8"))
+    return frames
+
+
+def run_elementtree(frames: list[bytes]) -> int:
+    # Mirrors the previous AppController path: decode, then full ET parse.
+    parsed = 0
+    for payload in frames:
+        try:
+            parse_radio_info(payload.decode("utf-8", errors="ignore"))
+            parsed += 1
+        except Exception:
+            pass
+    return parsed
+
+
+def run_fast_path(frames: list[bytes]) -> int:
+    parsed = 0
+    for payload in frames:
+        if parse_radio_info_bytes(payload) is not None:
+            parsed += 1
+    return parsed
+
+
+def run_cached(frames: list[bytes]) -> int:
+    parser = RadioInfoParser()
+    parsed = 0
+    for payload in frames:
+        if parser.parse(payload) is not None:
+            parsed += 1
+    return parsed
+
+
+def time_it(func, frames: list[bytes], rounds: int) -> tuple[float, int]:
+    best = float("inf")
+    result = 0
+    for _ in range(rounds):
+        start = time.perf_counter()
+        result = func(frames)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def check_equivalence(frames: list[bytes]) -> None:
+    for payload in frames:
+        fast = parse_radio_info_bytes(payload)
+        if fast is None:
+            continue
+        reference = parse_radio_info(payload.decode("utf-8", errors="ignore"))
+        if fast != reference:
+            raise SystemExit(f"Parser mismatch:\n  fast: {fast}\n  ref:  {reference}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("frames", nargs="?", type=Path, default=DEFAULT_FRAMES)
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+
+    frames = load_frames(args.frames)
+    check_equivalence(frames)
+
+    print(f"{len(frames)} frames from {args.frames}")
+    baseline = None
+    for name, func in (
+        ("elementtree", run_elementtree),
+        ("bytes", run_fast_path),
+        ("bytes+cache", run_cached),
+    ):
+        elapsed, parsed = time_it(func, frames, args.rounds)
+        per_frame_us = elapsed / len(frames) * 1e6
+        baseline = baseline or elapsed
+        print(
+            f"{name:12s} {per_frame_us:8.2f} us/frame  "
+            f"{baseline / elapsed:5.1f}x  ({parsed} accepted as RadioInfo)"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,111 @@
+"""CPU time of the QML app while the VFO spins, with and without UI throttling.
+
+Usage: python tools/bench_ui_throttle.py [--seconds 5] [--rate 500] [--interval-ms 16]
+
+Loads Main.qml on the offscreen platform and feeds N1MM RadioInfo frames
+straight into AppController at --rate frames per second, sweeping rig A
+across the band so every frame changes the frequency. The run is repeated
+with `app.uiUpdateIntervalMs` = 0 (every change reaches QML) and with
+--interval-ms. Reports process CPU time per wall second, the QML frequency
+updates delivered and the frames auto switching handled.
+"""
+from __future__ import annotations
+
+import argparse
+import dataclasses
+import os
+import sys
+import time
+from pathlib import Path
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+UI_DIR = Path(__file__).resolve().parents[1]
+SRC_DIR = UI_DIR / "src"
+if str(SRC_DIR) not in sys.path:
+    sys.path.insert(0, str(SRC_DIR))
+
+from PySide6.QtCore import QTimer, Qt
+from PySide6.QtGui import QGuiApplication
+
+from config.settings import load_settings
+from core.app_controller import AppController
+from core.events import RADIO_INFO
+from core.state import AppState
+from ui.qml_app import create_qml_engine
+
+FRAME = (
+    '<?xml version="1.0" encoding="utf-8"?>\n<RadioInfo><StationName>BENCH</StationName>'
+    "<RadioNr>1</RadioNr><Freq>{freq}</Freq><TXFreq>{freq}</TXFreq><Mode>CW</Mode>"
+    "<FocusEntry>{seq}</FocusEntry></RadioInfo>"
+)
+
+
+def run(app: QGuiApplication, interval_ms: int, seconds: float, rate: float) -> dict:
+    settings = dataclasses.replace(
+        load_settings(UI_DIR / "config.json"),
+        app_ui_update_interval_ms=interval_ms,
+        auto_enabled_rigs=[],
+        metrics_port=0,
+        capture_file=None,
+        trace_file=None,
+        journal_directory=None,
+    )
+    controller = AppController(settings=settings, state=AppState())
+    engine = create_qml_engine(controller, fast_start=True)
+    bridge = engine.rootContext().contextProperty("bridge")
+    updates = [0]
+    bridge.radioStatus.aFreqChanged.connect(lambda: updates.__setitem__(0, updates[0] + 1))
+    handled = [0]
+    controller.events.subscribe(RADIO_INFO, lambda _info: handled.__setitem__(0, handled[0] + 1), name="bench")
+    sent = [0]
+    started = time.perf_counter()
+
+    def feed() -> None:
+        elapsed = time.perf_counter() - started
+        due = int(elapsed * rate)
+        while sent[0] < due:
+            # 3.5 to 7.5 MHz and back every 2 s, in N1MM's 10 Hz units
+            khz = 3500 + 4000 * abs((elapsed % 2.0) - 1.0)
+            controller._handle_udp_message(FRAME.format(freq=int(khz * 100) + sent[0] % 7, seq=sent[0]).encode())
+            sent[0] += 1
+        if elapsed >= seconds:
+            app.quit()
+
+    feeder = QTimer()
+    feeder.setTimerType(Qt.TimerType.PreciseTimer)
+    feeder.timeout.connect(feed)
+    feeder.start(1)
+    cpu_start = time.process_time()
+    app.exec()
+    cpu = time.process_time() - cpu_start
+    wall = time.perf_counter() - started
+    feeder.stop()
+    for window in engine.rootObjects():
+        window.close()
+    controller.dispose()
+    return {"engine": engine, "cpu": cpu / wall, "frames": sent[0], "handled": handled[0], "updates": updates[0]}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--rate", type=float, default=500.0, help="RadioInfo frames per second")
+    parser.add_argument("--interval-ms", type=int, default=16, help="throttled run's uiUpdateIntervalMs")
+    args = parser.parse_args()
+
+    app = QGuiApplication(sys.argv[:1])
+    print(f"{'uiUpdateIntervalMs':<20}{'CPU':>8}{'frames':>9}{'auto':>9}{'QML updates':>13}")
+    engines = []  # keep finished runs alive so their bindings do not fire on a deleted bridge
+    for interval_ms in (0, args.interval_ms):
+        result = run(app, interval_ms, args.seconds, args.rate)
+        engines.append(result["engine"])
+        print(
+            f"{interval_ms:<20}{result['cpu']:>7.0%}{result['frames']:>9}"
+            f"{result['handled']:>9}{result['updates']:>13}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
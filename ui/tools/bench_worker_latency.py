@@ -0,0 +1,165 @@
+"""Datagram-to-switch-decision latency with and without the controller worker thread.
+
+Usage: python tools/bench_worker_latency.py [--seconds N] [--load-ms N]
+
+A sender thread pushes N1MM RadioInfo frames over localhost UDP, alternating
+rig A between two auto-switch rules so every frame asks for a new antenna.
+Latency is measured from `sendto` to the auto-switch evaluation of that
+frame, which issues the command synchronously. UDP coalescing is off so every
+frame is measured. The WebSocket send is replaced by a stub that confirms
+each command at once. The GUI thread is blocked for --load-ms out of every
+16 ms to mimic slow frames.
+"""
+from __future__ import annotations
+
+import argparse
+import dataclasses
+import gc
+import json
+import os
+import socket
+import statistics
+import sys
+import threading
+import time
+from pathlib import Path
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+SRC_DIR = Path(__file__).resolve().parents[1] / "src"
+if str(SRC_DIR) not in sys.path:
+    sys.path.insert(0, str(SRC_DIR))
+
+from PySide6.QtCore import QCoreApplication, QTimer
+
+from config.settings import load_settings
+from core.app_controller import AppController
+from core.events import PRIORITY_SWITCHING, RADIO_INFO
+from core.radio_info import Rig
+from core.state import AppState
+from core.worker import ControllerThread
+
+FRAME = (
+    '<?xml version="1.0" encoding="utf-8"?>\n<RadioInfo><StationName>BENCH</StationName>'
+    "<RadioNr>1</RadioNr><Freq>{freq}</Freq><TXFreq>{freq}</TXFreq><Mode>CW</Mode>"
+    "<FocusEntry>{seq}</FocusEntry></RadioInfo>"
+)
+RULES = [
+    {"rig": "A", "minFrequency": 100, "maxFrequency": 8000, "primaryAntenna": 1, "secondaryAntenna": 4},
+    {"rig": "A", "minFrequency": 8000, "maxFrequency": 60000, "primaryAntenna": 4, "secondaryAntenna": 1},
+]
+
+
+def _free_port() -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as probe:
+        probe.bind(("127.0.0.1", 0))
+        return probe.getsockname()[1]
+
+
+def run(threaded: bool, seconds: float, load_ms: float, interval_ms: float) -> list[float]:
+    app = QCoreApplication.instance() or QCoreApplication([])
+    port = _free_port()
+    settings = dataclasses.replace(
+        load_settings(None),
+        udp_port=port,
+        udp_coalesce=False,
+        auto_rules=RULES,
+        ws_auto_reconnect=False,
+        ws_command_timeout_ms=0,
+        log_console=False,
+        journal_directory=None,
+    )
+    controller = AppController(settings=settings, state=AppState())
+    controller.auto_switch.set_enabled(Rig.A, True)
+    sent_at: dict[int, float] = {}
+    latencies: list[float] = []
+    status = {"a": "-", "b": "-"}
+
+    def fake_send(command: str, key: str | None = None) -> bool:
+        status["a"] = command[1]
+        # Confirm right away so the next frame is free to switch again.
+        QTimer.singleShot(0, lambda: controller._handle_ws_message(json.dumps(status)))
+        return True
+
+    def timed(info) -> None:
+        started = sent_at.get(info.focus_entry)
+        if started is not None:
+            latencies.append((time.perf_counter() - started) * 1000)
+
+    controller.ws_client.send = fake_send
+    # Called right before auto switching evaluates the frame.
+    controller.events.subscribe(RADIO_INFO, timed, PRIORITY_SWITCHING + 2, name="bench")
+    worker = ControllerThread(controller) if threaded else None
+    if worker is not None:
+        worker.start()
+    else:
+        controller.udp_client.open()
+
+    stop = threading.Event()
+
+    def sender() -> None:
+        out = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        seq = 0
+        while not stop.is_set():
+            seq += 1
+            freq = 700000 if seq % 2 else 1400000
+            sent_at[seq] = time.perf_counter()
+            out.sendto(FRAME.format(freq=freq, seq=seq).encode(), ("127.0.0.1", port))
+            time.sleep(interval_ms / 1000)
+        out.close()
+
+    def slow_frame() -> None:
+        # Blocks the GUI thread without holding the GIL, like a slow native
+        # render or a disk stall. A pure-Python busy loop would also starve
+        # the worker thread through the GIL.
+        time.sleep(load_ms / 1000)
+
+    load = QTimer()
+    load.timeout.connect(slow_frame)
+    if load_ms > 0:
+        load.start(16)
+
+    thread = threading.Thread(target=sender, daemon=True)
+    QTimer.singleShot(0, thread.start)
+    QTimer.singleShot(int(seconds * 1000), app.quit)
+    app.exec()
+    stop.set()
+    load.stop()
+    thread.join()
+    if worker is not None:
+        worker.stop()
+    else:
+        controller.dispose()
+    worker = None
+    gc.collect()
+    return latencies
+
+
+def _summary(values: list[float]) -> str:
+    if not values:
+        return "no commands"
+    ordered = sorted(values)
+    p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+    return (
+        f"n={len(ordered):4d}  p50={statistics.median(ordered):6.2f} ms  "
+        f"p95={p95:6.2f} ms  max={ordered[-1]:6.2f} ms"
+    )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--load-ms", type=float, default=12.0, help="blocked time per 16 ms GUI tick")
+    parser.add_argument("--interval-ms", type=float, default=5.0, help="delay between datagrams")
+    args = parser.parse_args()
+
+    for threaded in (False, True):
+        for load_ms in (0.0, args.load_ms):
+            latencies = run(threaded, args.seconds, load_ms, args.interval_ms)
+            mode = "worker thread" if threaded else "GUI thread   "
+            print(f"{mode}  load {load_ms:4.1f} ms/frame  {_summary(latencies)}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
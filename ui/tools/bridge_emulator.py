@@ -0,0 +1,322 @@
+"""Stand-in for the LoRa-WS bridge unit, for testing without hardware.
+
+Usage: python tools/bridge_emulator.py [--port 81] [--lora-ms 250] [--loss 0.05] ...
+
+Follows lora/bridge-unit/bridge-unit.ino and lora/mast-unit/mast-unit.ino:
+
+- A new client gets the current status JSON (`a`, `b`, `cmds`, `i2cs`,
+  `rssi`, `snr`, `lrssi`, `pwr`).
+- Text frames (`A1`, `B-`, `PN`, `02`..`17`) are relayed to the emulated
+  mast, one at a time; frames arriving while a relay is in progress are
+  dropped, as on the bridge.
+- The mast applies the command with the firmware's conflict and range
+  rules; the answer is broadcast as a status after the LoRa round trip.
+- A lost packet or an offline mast yields `{"error":"Mast Offline"}` after
+  --timeout-ms, and `a`/`b` read `NC` until the next answer.
+- The bridge pings the mast every 5 s, which broadcasts a status.
+
+With --binary the emulator also accepts the binary status subprotocol
+(src/core/status_codec.py): a client that offers it gets a full frame on
+connect and then deltas with only the fields that changed. Other clients,
+and all errors, stay JSON text.
+
+Fault injection: --loss, --offline-every/--offline-for (mast down),
+--stall-every/--stall-for (bridge silent, to trip the client heartbeat) and
+--kick-every (drop all WebSocket connections, to exercise reconnect).
+
+Point the app at it with `wsConnection.url` = `http://127.0.0.1/` and
+`wsConnection.port` = the emulator port.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import signal
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+
+from PySide6.QtCore import QCoreApplication, QObject, QTimer
+from PySide6.QtNetwork import QHostAddress
+from PySide6.QtWebSockets import QWebSocket, QWebSocketServer
+
+SRC_DIR = Path(__file__).resolve().parents[1] / "src"
+if str(SRC_DIR) not in sys.path:
+    sys.path.insert(0, str(SRC_DIR))
+
+from core.status_codec import BINARY_STATUS_PROTOCOL, encode_status  # noqa: E402
+
+PING_INTERVAL_MS = 5000
+
+# mast-unit.ino command status codes
+COMMAND_SUCCESS = 0
+COMMAND_UNRECOGNIZED = 1
+COMMAND_INVALID_ANTENNA = 3
+COMMAND_ANTENNA_CONFLICT = 4
+COMMAND_PWR_OUT_OF_RANGE = 5
+
+
+@dataclass
+class EmulatorConfig:
+    host: str = "127.0.0.1"
+    port: int = 81
+    lora_ms: int = 250  # round trip bridge -> mast -> bridge
+    jitter_ms: int = 50
+    loss: float = 0.0  # probability that a round trip gets no answer
+    timeout_ms: int = 1000  # time until a lost round trip is reported
+    offline_every_s: float = 0.0  # 0 = mast never goes offline
+    offline_for_s: float = 10.0
+    stall_every_s: float = 0.0  # 0 = bridge never stalls
+    stall_for_s: float = 10.0
+    kick_every_s: float = 0.0  # 0 = never drop connections
+    rssi: int = -80
+    snr: int = 8
+    binary: bool = False  # offer the binary status subprotocol
+    seed: int | None = None
+
+
+class MastState:
+    """Relay state and command handling of mast-unit.ino."""
+
+    def __init__(self) -> None:
+        self.ant_a = 0
+        self.ant_b = 0
+        self.cmd_status = COMMAND_SUCCESS
+        self.i2c_status = 0
+        self.pwr = 2
+
+    def process(self, command: str) -> None:
+        self.cmd_status = COMMAND_SUCCESS
+        if len(command) != 2:
+            self.cmd_status = COMMAND_UNRECOGNIZED
+        elif command.isdigit():
+            pwr = int(command)
+            if 2 <= pwr <= 17:
+                self.pwr = pwr
+            else:
+                self.cmd_status = COMMAND_PWR_OUT_OF_RANGE
+        elif command[0] in "AB":
+            ant = _parse_ant(command[1])
+            own, other = (self.ant_a, self.ant_b) if command[0] == "A" else (self.ant_b, self.ant_a)
+            if ant is None:
+                self.cmd_status = COMMAND_INVALID_ANTENNA
+            elif own != ant and (ant != other or ant == 0):
+                if command[0] == "A":
+                    self.ant_a = ant
+                else:
+                    self.ant_b = ant
+            else:
+                self.cmd_status = COMMAND_ANTENNA_CONFLICT
+        elif command != "PN":
+            self.cmd_status = COMMAND_UNRECOGNIZED
+
+
+def _parse_ant(char: str) -> int | None:
+    if char == "-":
+        return 0
+    if "1" <= char <= "6":
+        return int(char)
+    return None
+
+
+def _ant_char(ant: int) -> str:
+    return "-" if ant == 0 else str(ant)
+
+
+class BridgeEmulator(QObject):
+    def __init__(self, config: EmulatorConfig) -> None:
+        super().__init__()
+        self._config = config
+        self._random = random.Random(config.seed)
+        self._mast = MastState()
+        self._status_a = "-"
+        self._status_b = "-"
+        self._rssi = config.rssi
+        self._snr = config.snr
+        self._busy = False
+        self._offline = False
+        self._stalled = False
+        self._clients: list[QWebSocket] = []
+        self._sent_status: dict[QWebSocket, dict] = {}  # last status sent to each binary client
+        self.relayed = 0
+        self.dropped_busy = 0
+        self.lost = 0
+        self._server = QWebSocketServer("bridge-emulator", QWebSocketServer.SslMode.NonSecureMode, self)
+        if config.binary:
+            self._server.setSupportedSubprotocols([BINARY_STATUS_PROTOCOL])
+        self._server.newConnection.connect(self._handle_new_connection)
+        self._timers: list[QTimer] = []
+        self._every(PING_INTERVAL_MS, self._ping)
+        self._toggle(config.offline_every_s, config.offline_for_s, "_offline", "mast offline")
+        self._toggle(config.stall_every_s, config.stall_for_s, "_stalled", "bridge stalled")
+        if config.kick_every_s > 0:
+            self._every(int(config.kick_every_s * 1000), self._kick)
+
+    def listen(self) -> bool:
+        if not self._server.listen(QHostAddress(self._config.host), self._config.port):
+            print(f"listen failed: {self._server.errorString()}", file=sys.stderr)
+            return False
+        print(f"bridge emulator on ws://{self._config.host}:{self._server.serverPort()}/")
+        return True
+
+    def status(self) -> dict:
+        return {
+            "a": self._status_a,
+            "b": self._status_b,
+            "pwr": self._mast.pwr,
+            "lrssi": self._config.rssi + self._random.randint(-3, 3),
+            "rssi": self._rssi,
+            "snr": self._snr,
+            "i2cs": self._mast.i2c_status,
+            "cmds": self._mast.cmd_status,
+        }
+
+    def _every(self, interval_ms: int, callback) -> None:
+        timer = QTimer(self)
+        timer.timeout.connect(callback)
+        timer.start(interval_ms)
+        self._timers.append(timer)
+
+    def _toggle(self, every_s: float, duration_s: float, attribute: str, label: str) -> None:
+        if every_s <= 0:
+            return
+
+        def begin() -> None:
+            setattr(self, attribute, True)
+            print(f"{label} for {duration_s:g} s")
+            QTimer.singleShot(int(duration_s * 1000), self, end)
+
+        def end() -> None:
+            setattr(self, attribute, False)
+            print(f"{label}: over")
+
+        self._every(int(every_s * 1000), begin)
+
+    def _handle_new_connection(self) -> None:
+        while self._server.hasPendingConnections():
+            client = self._server.nextPendingConnection()
+            self._clients.append(client)
+            client.textMessageReceived.connect(self._handle_text)
+            client.disconnected.connect(lambda client=client: self._forget(client))
+            protocol = client.subprotocol()
+            print(f"client connected ({len(self._clients)}){f' ({protocol})' if protocol else ''}")
+            self._send_status(client, self.status())
+
+    def _forget(self, client: QWebSocket) -> None:
+        if client in self._clients:
+            self._clients.remove(client)
+        self._sent_status.pop(client, None)
+        client.deleteLater()
+
+    def _send_status(self, client: QWebSocket, status: dict) -> None:
+        if client.subprotocol() != BINARY_STATUS_PROTOCOL:
+            client.sendTextMessage(json.dumps(status, separators=(",", ":")))
+            return
+        client.sendBinaryMessage(encode_status(status, self._sent_status.get(client)))
+        self._sent_status[client] = status
+
+    def _kick(self) -> None:
+        print(f"dropping {len(self._clients)} client(s)")
+        for client in tuple(self._clients):
+            client.abort()
+
+    def _broadcast(self, message: str) -> None:
+        for client in self._clients:
+            client.sendTextMessage(message)
+
+    def _handle_text(self, message: str) -> None:
+        if self._stalled:
+            return
+        if self._busy:
+            self.dropped_busy += 1
+            return
+        self._relay(message.strip())
+
+    def _ping(self) -> None:
+        if not self._busy and not self._stalled:
+            self._relay("PN")
+
+    def _relay(self, command: str) -> None:
+        self._busy = True
+        self.relayed += 1
+        lost = self._offline or self._random.random() < self._config.loss
+        if lost:
+            self.lost += 1
+            QTimer.singleShot(self._config.timeout_ms, self, self._no_answer)
+            return
+        delay = max(0, self._config.lora_ms + self._random.randint(-self._config.jitter_ms, self._config.jitter_ms))
+        QTimer.singleShot(delay, self, lambda: self._answer(command))
+
+    def _answer(self, command: str) -> None:
+        self._mast.process(command)
+        self._status_a = _ant_char(self._mast.ant_a)
+        self._status_b = _ant_char(self._mast.ant_b)
+        self._rssi = self._config.rssi + self._random.randint(-4, 4)
+        self._snr = self._config.snr + self._random.randint(-2, 2)
+        self._busy = False
+        status = self.status()
+        for client in self._clients:
+            self._send_status(client, status)
+
+    def _no_answer(self) -> None:
+        self._status_a = "NC"
+        self._status_b = "NC"
+        self._busy = False
+        self._broadcast('{"error":"Mast Offline"}')
+
+
+def main() -> int:
+    defaults = EmulatorConfig()
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default=defaults.host)
+    parser.add_argument("--port", type=int, default=defaults.port)
+    parser.add_argument("--lora-ms", type=int, default=defaults.lora_ms, help="LoRa round trip")
+    parser.add_argument("--jitter-ms", type=int, default=defaults.jitter_ms)
+    parser.add_argument("--loss", type=float, default=defaults.loss, help="round-trip loss probability, 0..1")
+    parser.add_argument("--timeout-ms", type=int, default=defaults.timeout_ms, help="delay before Mast Offline")
+    parser.add_argument("--offline-every", type=float, default=0.0, help="seconds between mast outages")
+    parser.add_argument("--offline-for", type=float, default=defaults.offline_for_s)
+    parser.add_argument("--stall-every", type=float, default=0.0, help="seconds between bridge stalls")
+    parser.add_argument("--stall-for", type=float, default=defaults.stall_for_s)
+    parser.add_argument("--kick-every", type=float, default=0.0, help="seconds between dropped connections")
+    parser.add_argument("--rssi", type=int, default=defaults.rssi)
+    parser.add_argument("--snr", type=int, default=defaults.snr)
+    parser.add_argument("--binary", action="store_true", help="accept the binary status subprotocol")
+    parser.add_argument("--seed", type=int)
+    args = parser.parse_args()
+
+    app = QCoreApplication(sys.argv[:1])
+    emulator = BridgeEmulator(
+        EmulatorConfig(
+            host=args.host,
+            port=args.port,
+            lora_ms=args.lora_ms,
+            jitter_ms=args.jitter_ms,
+            loss=args.loss,
+            timeout_ms=args.timeout_ms,
+            offline_every_s=args.offline_every,
+            offline_for_s=args.offline_for,
+            stall_every_s=args.stall_every,
+            stall_for_s=args.stall_for,
+            kick_every_s=args.kick_every,
+            rssi=args.rssi,
+            snr=args.snr,
+            binary=args.binary,
+            seed=args.seed,
+        )
+    )
+    if not emulator.listen():
+        return 1
+    signal.signal(signal.SIGINT, lambda *_: app.quit())
+    signal.signal(signal.SIGTERM, lambda *_: app.quit())
+    wakeup = QTimer()
+    wakeup.timeout.connect(lambda: None)
+    wakeup.start(250)
+    app.exec()
+    print(f"relayed {emulator.relayed}, lost {emulator.lost}, dropped while busy {emulator.dropped_busy}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,116 @@
+"""Exports a time range of the event journal to CSV, or sums antenna time per band.
+
+Usage: python tools/journal_export.py [--dir logs/journal] [--from TIME] [--to TIME] [--kind KIND ...] [--output FILE]
+       python tools/journal_export.py --usage RIG --band 7000-7300 [--from TIME] [--to TIME]
+
+TIME is an ISO date/time in local time (`2026-10-18T02:00`) or seconds
+since the epoch. Without --output the CSV goes to stdout: one row per
+record with its local time, kind and the fields of that kind (other
+columns stay empty).
+
+--usage prints how long each antenna was on RIG while its frequency was
+in --band (kHz, `min-max`), e.g. which antenna was used on 40 m between
+02:00 and 03:00. `?` is time while a bridge was not connected.
+
+The segments are memory-mapped, so a weekend of records is not loaded
+into memory.
+"""
+from __future__ import annotations
+
+import argparse
+import csv
+import sys
+from datetime import datetime
+from pathlib import Path
+
+SRC_DIR = Path(__file__).resolve().parents[1] / "src"
+if str(SRC_DIR) not in sys.path:
+    sys.path.insert(0, str(SRC_DIR))
+
+from core.journal import RECORD_TYPES, JournalKind, JournalReader, antenna_usage, record_kind  # noqa: E402
+
+COLUMNS = ["time", "kind"] + list(
+    dict.fromkeys(name for record_type in RECORD_TYPES.values() for name in record_type._fields if name != "t")
+)
+
+
+def _time(text: str) -> float:
+    try:
+        return float(text)
+    except ValueError:
+        return datetime.fromisoformat(text).timestamp()
+
+
+def _band(text: str) -> tuple[int, int]:
+    low, _, high = text.partition("-")
+    return int(low), int(high)
+
+
+def _local(t: float) -> str:
+    return datetime.fromtimestamp(t).isoformat(timespec="milliseconds")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--dir", type=Path, default=Path("logs/journal"), help="journal directory")
+    parser.add_argument("--from", dest="start", type=_time, help="first time (ISO local time or epoch seconds)")
+    parser.add_argument("--to", dest="end", type=_time, help="end time, exclusive")
+    parser.add_argument(
+        "--kind",
+        action="append",
+        choices=[kind.name.lower() for kind in JournalKind],
+        help="record kinds to export (default all); may be repeated",
+    )
+    parser.add_argument("--output", type=Path, help="CSV file (default stdout)")
+    parser.add_argument("--usage", choices=["A", "B"], help="print antenna time for this rig instead of CSV")
+    parser.add_argument("--band", type=_band, default=(0, 0xFFFFFFFF), help="frequency range for --usage, kHz")
+    args = parser.parse_args()
+
+    if not args.dir.is_dir():
+        print(f"no journal directory {args.dir}", file=sys.stderr)
+        return 1
+    with JournalReader(args.dir) as reader:
+        if args.usage:
+            return _print_usage(reader, args)
+        kinds = [JournalKind[name.upper()] for name in args.kind] if args.kind else None
+        output = args.output.open("w", newline="", encoding="utf-8") if args.output else sys.stdout
+        try:
+            writer = csv.DictWriter(output, COLUMNS, restval="")
+            writer.writeheader()
+            rows = 0
+            for record in reader.records(args.start, args.end, kinds):
+                row = record._asdict()
+                row["time"] = _local(row.pop("t"))
+                row["kind"] = record_kind(record).name.lower()
+                if "source" in row:
+                    row["source"] = row["source"].name.lower()
+                writer.writerow(row)
+                rows += 1
+        finally:
+            if args.output:
+                output.close()
+    if args.output:
+        print(f"{rows} records written to {args.output}", file=sys.stderr)
+    return 0
+
+
+def _print_usage(reader: JournalReader, args: argparse.Namespace) -> int:
+    first = next(iter(reader.records()), None)
+    if first is None:
+        print("journal is empty", file=sys.stderr)
+        return 1
+    start = args.start if args.start is not None else first.t
+    end = args.end if args.end is not None else datetime.now().timestamp()
+    usage = antenna_usage(reader, args.usage, start, end, *args.band)
+    total = sum(usage.values())
+    print(f"Rig {args.usage}, {args.band[0]}-{args.band[1]} kHz, {_local(start)} to {_local(end)}")
+    if not total:
+        print("  not in this band")
+        return 0
+    for antenna, seconds in sorted(usage.items(), key=lambda item: -item[1]):
+        print(f"  antenna {antenna:>3}: {seconds / 60:8.1f} min  {seconds / total:6.1%}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
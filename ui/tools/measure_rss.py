@@ -0,0 +1,75 @@
+"""Resident memory of the QML app compared with the headless controller.
+
+Usage: python tools/measure_rss.py [--seconds N] [--config PATH]
+
+Starts each entry point as a subprocess, lets it run for --seconds, samples
+its resident set size and stops it. Uses psutil when installed, otherwise
+/proc (Linux). Without a display the QML app runs on the offscreen platform.
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+UI_DIR = Path(__file__).resolve().parents[1]
+ENTRY_POINTS = {
+    "qml": UI_DIR / "src" / "app" / "main.py",
+    "headless": UI_DIR / "src" / "app" / "headless.py",
+}
+
+
+def _rss_bytes(pid: int) -> int:
+    try:
+        import psutil
+    except ImportError:
+        psutil = None
+    if psutil is not None:
+        return psutil.Process(pid).memory_info().rss
+    with open(f"/proc/{pid}/status", encoding="ascii") as status:
+        for line in status:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) * 1024
+    raise RuntimeError("VmRSS not found")
+
+
+def measure(script: Path, seconds: float, config: Path) -> int:
+    env = dict(os.environ)
+    if sys.platform.startswith("linux") and not env.get("DISPLAY") and not env.get("WAYLAND_DISPLAY"):
+        env.setdefault("QT_QPA_PLATFORM", "offscreen")
+    args = [sys.executable, str(script)]
+    if script.name == "headless.py":
+        args += ["--config", str(config)]
+    process = subprocess.Popen(
+        args, cwd=config.parent, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    try:
+        time.sleep(seconds)
+        if process.poll() is not None:
+            raise RuntimeError(f"{script.name} exited early with code {process.returncode}")
+        return _rss_bytes(process.pid)
+    finally:
+        process.kill()
+        process.wait()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=5.0, help="run time before sampling")
+    parser.add_argument("--config", type=Path, default=UI_DIR / "config.json")
+    args = parser.parse_args()
+
+    config = args.config.resolve()
+    results = {name: measure(script, args.seconds, config) for name, script in ENTRY_POINTS.items()}
+    for name, rss in results.items():
+        print(f"{name:<9} {rss / 2**20:7.1f} MiB")
+    saved = results["qml"] - results["headless"]
+    print(f"headless saves {saved / 2**20:.1f} MiB ({saved / results['qml']:.0%})")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,89 @@
+"""Sends N1MM RadioInfo datagrams that sweep the VFO, for load testing.
+
+Usage: python tools/n1mm_generator.py [--port 12060] [--rate 100] [--radios 1,2]
+                                      [--from-khz 3500] [--to-khz 14350] [--sweep-s 10]
+
+Each radio sweeps from --from-khz to --to-khz and back every 2 x --sweep-s
+seconds, sending --rate datagrams per second. The frames carry the same
+fields as N1MM's RadioInfo broadcast. Ranges that cross the auto-switch rule
+boundaries make the app switch antennas on every pass.
+"""
+from __future__ import annotations
+
+import argparse
+import socket
+import time
+
+FRAME = (
+    '<?xml version="1.0" encoding="utf-8"?>\r\n<RadioInfo>\r\n'
+    "  <app>N1MM</app>\r\n  <StationName>LOADTEST</StationName>\r\n"
+    "  <RadioNr>{radio}</RadioNr>\r\n  <Freq>{freq}</Freq>\r\n  <TXFreq>{freq}</TXFreq>\r\n"
+    "  <Mode>{mode}</Mode>\r\n  <OpCall>N0CALL</OpCall>\r\n  <IsRunning>False</IsRunning>\r\n"
+    "  <FocusEntry>{seq}</FocusEntry>\r\n  <EntryWindowHwnd>0</EntryWindowHwnd>\r\n"
+    "  <Antenna>0</Antenna>\r\n  <Rotors></Rotors>\r\n  <FocusRadioNr>1</FocusRadioNr>\r\n"
+    "  <IsStereo>False</IsStereo>\r\n  <IsSplit>False</IsSplit>\r\n  <ActiveRadioNr>1</ActiveRadioNr>\r\n"
+    "  <IsTransmitting>False</IsTransmitting>\r\n  <FunctionKeyCaption></FunctionKeyCaption>\r\n"
+    "  <RadioName>LOAD</RadioName>\r\n  <AuxAntSelected>-1</AuxAntSelected>\r\n"
+    "  <AuxAntSelectedName></AuxAntSelectedName>\r\n  <IsConnected>True</IsConnected>\r\n"
+    "</RadioInfo>"
+)
+
+
+def sweep_khz(elapsed: float, low: float, high: float, period: float) -> float:
+    """Triangle wave between low and high with a full period of 2 x period."""
+    phase = (elapsed / period) % 2.0
+    fraction = phase if phase <= 1.0 else 2.0 - phase
+    return low + (high - low) * fraction
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=12060)
+    parser.add_argument("--rate", type=float, default=100.0, help="datagrams per second per radio")
+    parser.add_argument("--radios", default="1", help="comma separated RadioNr values, e.g. 1,2")
+    parser.add_argument("--from-khz", type=float, default=3500.0)
+    parser.add_argument("--to-khz", type=float, default=14350.0)
+    parser.add_argument("--sweep-s", type=float, default=10.0, help="seconds for one sweep in one direction")
+    parser.add_argument("--mode", default="CW")
+    parser.add_argument("--duration", type=float, default=0.0, help="seconds to run; 0 = until Ctrl+C")
+    args = parser.parse_args()
+
+    radios = [int(radio) for radio in args.radios.split(",") if radio.strip()]
+    interval = 1.0 / args.rate if args.rate > 0 else 0.0
+    out = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    target = (args.host, args.port)
+    print(f"sending {args.rate:g} datagrams/s per radio for radios {radios} to {args.host}:{args.port}")
+
+    sent = 0
+    started = time.perf_counter()
+    next_at = started
+    try:
+        while True:
+            now = time.perf_counter()
+            elapsed = now - started
+            if args.duration and elapsed >= args.duration:
+                break
+            for offset, radio in enumerate(radios):
+                # Offset the radios so they do not cross the same boundary at once.
+                khz = sweep_khz(elapsed + offset * args.sweep_s / 2, args.from_khz, args.to_khz, args.sweep_s)
+                freq = int(round(khz * 100))  # N1MM units are 10 Hz
+                out.sendto(FRAME.format(radio=radio, freq=freq, mode=args.mode, seq=sent).encode(), target)
+                sent += 1
+            next_at += interval
+            delay = next_at - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            elif delay < -1.0:
+                next_at = time.perf_counter()  # fell behind; do not burst to catch up
+    except KeyboardInterrupt:
+        pass
+    finally:
+        out.close()
+    elapsed = time.perf_counter() - started
+    print(f"sent {sent} datagrams in {elapsed:.1f} s ({sent / max(elapsed, 1e-9):,.0f}/s)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
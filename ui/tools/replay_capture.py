@@ -0,0 +1,229 @@
+"""Replays a traffic capture into AppController and reports throughput.
+
+Usage: python tools/replay_capture.py CAPTURE [--speed N] [--repeat N] [--config PATH] [--bridge-frames] [--policy]
+
+CAPTURE is a file written with `capture.file`, or a .jsonl file of N1MM
+frames (such as tools/data/n1mm_frames.jsonl), which is replayed at 10 ms
+spacing. Datagrams are sent over localhost UDP at their recorded pace
+divided by --speed (0 = as fast as possible), so coalescing, parsing, rule
+lookup and the command pipeline all run as in the app, on the offscreen Qt
+platform. Auto switching is on for both rigs. Hysteresis, settle time and
+rate limiting are off unless --policy is given, so latency reflects the
+parser, coalescing and rule engine rather than deliberate delays.
+
+By default a stub bridge confirms each command at once. --bridge-frames
+replays the recorded bridge status frames instead (retries are disabled,
+since they no longer answer this run's commands).
+
+Reports events per second, datagram-to-command latency percentiles and peak
+RSS.
+"""
+from __future__ import annotations
+
+import argparse
+import dataclasses
+import json
+import os
+import socket
+import statistics
+import sys
+import threading
+import time
+from functools import partial
+from pathlib import Path
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+UI_DIR = Path(__file__).resolve().parents[1]
+SRC_DIR = UI_DIR / "src"
+if str(SRC_DIR) not in sys.path:
+    sys.path.insert(0, str(SRC_DIR))
+
+from PySide6.QtCore import QCoreApplication, QTimer
+from PySide6.QtNetwork import QAbstractSocket
+
+from config.settings import load_settings
+from core.app_controller import AppController
+from core.capture import CaptureReader, CaptureRecord, RecordKind
+from core.state import AppState
+
+
+def load_records(path: Path) -> list[CaptureRecord]:
+    if path.suffix == ".jsonl":
+        lines = path.read_text(encoding="utf-8").splitlines()
+        return [
+            CaptureRecord(index * 10_000_000, RecordKind.UDP_IN, json.loads(line).encode("utf-8"))
+            for index, line in enumerate(lines)
+            if line.strip()
+        ]
+    with CaptureReader(path) as reader:
+        return [CaptureRecord(r.t_ns, r.kind, bytes(r.payload)) for r in reader]
+
+
+def repeat(records: list[CaptureRecord], times: int) -> list[CaptureRecord]:
+    if times <= 1 or not records:
+        return records
+    span = records[-1].t_ns - records[0].t_ns + 10_000_000
+    return [record._replace(t_ns=record.t_ns + lap * span) for lap in range(times) for record in records]
+
+
+def peak_rss_mib() -> float | None:
+    try:
+        import resource
+    except ImportError:
+        resource = None
+    if resource is not None:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / 2**20 if sys.platform == "darwin" else peak / 1024
+    try:
+        import psutil
+    except ImportError:
+        return None
+    return psutil.Process().memory_info().peak_wset / 2**20
+
+
+def _free_port() -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as probe:
+        probe.bind(("127.0.0.1", 0))
+        return probe.getsockname()[1]
+
+
+def replay(records: list[CaptureRecord], speed: float, config: Path, bridge_frames: bool, policy: bool) -> dict:
+    app = QCoreApplication.instance() or QCoreApplication([])
+    port = _free_port()
+    settings = dataclasses.replace(
+        load_settings(config),
+        udp_port=port,
+        auto_enabled_rigs=["A", "B"],
+        ws_auto_reconnect=False,
+        ws_command_timeout_ms=0 if bridge_frames else 3000,
+        metrics_port=0,
+        capture_file=None,
+        trace_file=None,
+        journal_directory=None,
+    )
+    if not policy:
+        settings = dataclasses.replace(settings, auto_hysteresis_khz=0, auto_settle_ms=0, auto_max_commands_per_minute=0)
+    controller = AppController(settings=settings, state=AppState())
+    last_handled = [0.0]
+    sent_at: dict[bytes, float] = {}
+    origin: list[float | None] = [None]
+    latencies: list[float] = []
+    status = {"a": "-", "b": "-"}
+
+    def handle_datagram(payload: bytes) -> None:
+        origin[0] = sent_at.get(payload)
+        try:
+            controller._handle_udp_message(payload)
+        finally:
+            origin[0] = None
+            last_handled[0] = time.perf_counter()
+
+    def bridge_send(command: str, key: str | None = None) -> bool:
+        if origin[0] is not None:
+            latencies.append((time.perf_counter() - origin[0]) * 1000)
+        if not bridge_frames:
+            status[command[0].lower()] = command[1]
+            QTimer.singleShot(0, partial(controller._handle_ws_message, json.dumps(status)))
+        return True
+
+    controller.ws_client.send = bridge_send
+    controller.udp_client.set_message_handler(handle_datagram)
+    controller.udp_client.open()
+    udp_socket = controller.udp_client._socket
+    if udp_socket is not None:
+        udp_socket.setSocketOption(QAbstractSocket.SocketOption.ReceiveBufferSizeSocketOption, 8 * 2**20)
+
+    done = threading.Event()
+    sent = [0]
+
+    def sender() -> None:
+        out = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        out.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, 8 * 2**20)
+        started = time.perf_counter()
+        first = records[0].t_ns if records else 0
+        for record in records:
+            if speed > 0:
+                delay = started + (record.t_ns - first) / 1e9 / speed - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+            if record.kind is RecordKind.UDP_IN:
+                sent_at[record.payload] = time.perf_counter()
+                out.sendto(record.payload, ("127.0.0.1", port))
+                sent[0] += 1
+                if speed <= 0 and sent[0] % 64 == 0:
+                    time.sleep(0)  # let the receiver drain
+            elif record.kind is RecordKind.WS_IN and bridge_frames:
+                message = record.payload.decode("utf-8", "replace")
+                QTimer.singleShot(0, app, partial(controller._handle_ws_message, message))
+            elif record.kind is RecordKind.WS_IN_BINARY and bridge_frames:
+                QTimer.singleShot(0, app, partial(controller._handle_ws_binary_message, record.payload))
+        out.close()
+        done.set()
+
+    def check_done() -> None:
+        if done.is_set():
+            poll.stop()
+            QTimer.singleShot(200, app.quit)  # let the last datagrams drain
+
+    poll = QTimer()
+    poll.timeout.connect(check_done)
+    poll.start(20)
+    thread = threading.Thread(target=sender, daemon=True)
+    wall_start = time.perf_counter()
+    QTimer.singleShot(0, thread.start)
+    app.exec()
+    elapsed = last_handled[0] - wall_start
+    thread.join()
+    controller.dispose()
+
+    udp = controller.udp_client
+    return {
+        "sent": sent[0],
+        "received": udp.received,
+        "coalesced": udp.coalesced,
+        "commands": controller.commands.stats.sent,
+        "elapsed": elapsed,
+        "latencies": latencies,
+    }
+
+
+def _percentile(ordered: list[float], fraction: float) -> float:
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("capture", type=Path)
+    parser.add_argument("--speed", type=float, default=1.0, help="1 = recorded pace, N = N times faster, 0 = unlimited")
+    parser.add_argument("--repeat", type=int, default=1, help="play the capture this many times back to back")
+    parser.add_argument("--config", type=Path, default=UI_DIR / "config.json")
+    parser.add_argument("--bridge-frames", action="store_true", help="replay recorded bridge status frames")
+    parser.add_argument("--policy", action="store_true", help="keep the configured switching policy")
+    args = parser.parse_args()
+
+    records = repeat(load_records(args.capture), args.repeat)
+    if not any(record.kind is RecordKind.UDP_IN for record in records):
+        print("capture has no UDP datagrams")
+        return 1
+    result = replay(records, args.speed, args.config, args.bridge_frames, args.policy)
+
+    elapsed = max(result["elapsed"], 1e-9)
+    print(f"datagrams  sent {result['sent']}  received {result['received']}  coalesced {result['coalesced']}")
+    print(f"throughput {result['received'] / elapsed:,.0f} events/s over {elapsed:.2f} s")
+    print(f"commands   {result['commands']}")
+    latencies = sorted(result["latencies"])
+    if latencies:
+        print(
+            f"latency    datagram->command p50={statistics.median(latencies):.3f} ms  "
+            f"p95={_percentile(latencies, 0.95):.3f} ms  p99={_percentile(latencies, 0.99):.3f} ms  "
+            f"max={latencies[-1]:.3f} ms"
+        )
+    rss = peak_rss_mib()
+    if rss is not None:
+        print(f"peak RSS   {rss:.1f} MiB")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,500 @@
+"""Checks the auto-switch rules for gaps and overlaps and predicts the switches over a frequency trace.
+
+Usage: python tools/rule_coverage.py [--config config.json] [--band 7000-7300 ...]
+       python tools/rule_coverage.py --journal logs/journal [--from TIME] [--to TIME] [--station NAME]
+       python tools/rule_coverage.py --trace trace.csv
+
+Without a trace only the rules are checked:
+
+- gaps: parts of each --band (default the amateur bands from 160 m to
+  6 m) that no plain frequency rule covers for a rig; a mode or station
+  rule that covers part of a gap is listed with it;
+- overlaps: rules of the same rig, mode and station that overlap (the app
+  refuses to load these), and mode/station rules that take precedence
+  over a wider rule. The exit status is 1 if rules conflict.
+
+With --journal (the `freq` records of the event journal) or --trace (a
+CSV with `time`, `rig`, `freq` in kHz and optional `mode` and `station`
+columns, e.g. from tools/journal_export.py) every sample is looked up as
+`RuleIndex.lookup` would, and the commands `AutoSwitch` would have sent
+are counted with the switching policy off and with the policy from the
+config: the primary antenna, or the secondary one while the other rig
+holds the primary. Both rigs are assumed to be on auto. The journal does
+not record the station name; --station sets it for every sample.
+
+The lookup runs over NumPy arrays, one binary search per rule group for
+all samples. Only the samples where a rig's rule (or its side of a
+hysteresis edge) changes are replayed through `SwitchPolicy`, so a year
+of samples is evaluated in seconds. Needs NumPy (`pip install numpy`);
+the app itself does not.
+"""
+from __future__ import annotations
+
+import argparse
+import csv
+import heapq
+import sys
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+UI_DIR = Path(__file__).resolve().parents[1]
+SRC_DIR = UI_DIR / "src"
+if str(SRC_DIR) not in sys.path:
+    sys.path.insert(0, str(SRC_DIR))
+
+from config.settings import load_settings  # noqa: E402
+from core.auto_rules import AntennaRule, RuleError, parse_rules  # noqa: E402
+from core.journal import RECORD_SIZE, JournalKind, JournalReader  # noqa: E402
+from core.radio_info import Rig  # noqa: E402
+from core.switch_policy import SwitchPolicy, SwitchPolicyConfig, SwitchPolicyStats  # noqa: E402
+
+RIGS = (Rig.A, Rig.B)  # index = rig code in a Trace
+DEFAULT_BANDS = (
+    (1800, 2000),
+    (3500, 4000),
+    (5351, 5367),
+    (7000, 7300),
+    (10100, 10150),
+    (14000, 14350),
+    (18068, 18168),
+    (21000, 21450),
+    (24890, 24990),
+    (28000, 29700),
+    (50000, 54000),
+)
+
+
+@dataclass
+class Trace:
+    """Frequency samples in time order; `mode`/`station` index into `modes`/`stations` (upper case)."""
+
+    t: np.ndarray  # seconds since the epoch
+    rig: np.ndarray  # index into RIGS
+    freq: np.ndarray  # kHz
+    mode: np.ndarray
+    station: np.ndarray
+    modes: list[str] = field(default_factory=list)
+    stations: list[str] = field(default_factory=list)
+
+    def __len__(self) -> int:
+        return len(self.t)
+
+
+@dataclass
+class Prediction:
+    commands: dict[Rig, int]
+    secondary: int = 0  # commands for the secondary antenna because the other rig held the primary
+    shared: int = 0  # commands for the antenna the other rig was on
+    stats: SwitchPolicyStats = field(default_factory=SwitchPolicyStats)
+
+
+def _time(text: str) -> float:
+    try:
+        return float(text)
+    except ValueError:
+        return datetime.fromisoformat(text).timestamp()
+
+
+def _band(text: str) -> tuple[int, int]:
+    low, _, high = text.partition("-")
+    return int(low), int(high)
+
+
+def _freq_dtype() -> np.dtype:
+    # The `freq` record of core.journal: time, kind, rig, frequency (kHz), mode.
+    return np.dtype(
+        {
+            "names": ["t", "kind", "rig", "freq", "mode"],
+            "formats": ["<f8", "u1", "S1", "<u4", "S8"],
+            "offsets": [0, 8, 9, 10, 14],
+            "itemsize": RECORD_SIZE,
+        }
+    )
+
+
+def load_journal(directory: Path, start: float | None, end: float | None, station: str) -> Trace:
+    dtype = _freq_dtype()
+    parts = []
+    with JournalReader(directory) as reader:
+        for data, offset, count in reader.buffers():
+            records = np.frombuffer(data, dtype=dtype, count=count, offset=offset)
+            keep = records["kind"] == JournalKind.FREQ
+            if start is not None:
+                keep &= records["t"] >= start
+            if end is not None:
+                keep &= records["t"] < end
+            parts.append(records[keep])  # a copy, so the map can be closed
+            del records
+    records = np.concatenate(parts) if parts else np.empty(0, dtype)
+    values, mode = np.unique(records["mode"], return_inverse=True)
+    # Lookups ignore case, so `cw` and `CW` share a code.
+    modes: dict[str, int] = {}
+    codes = np.array([modes.setdefault(value.decode("ascii", "replace").upper(), len(modes)) for value in values])
+    return Trace(
+        t=records["t"].astype(np.float64),
+        rig=(records["rig"] == b"B").astype(np.int8),
+        freq=records["freq"].astype(np.float64),
+        mode=codes[mode].astype(np.int32) if len(codes) else mode.astype(np.int32),
+        station=np.zeros(len(records), np.int32),
+        modes=list(modes),
+        stations=[station.upper()],
+    )
+
+
+def load_csv(path: Path, start: float | None, end: float | None, station: str) -> Trace:
+    times: list[float] = []
+    rigs: list[int] = []
+    freqs: list[float] = []
+    modes: dict[str, int] = {}
+    stations: dict[str, int] = {station.upper(): 0}
+    mode_codes: list[int] = []
+    station_codes: list[int] = []
+    with path.open(newline="", encoding="utf-8") as handle:
+        for row in csv.DictReader(handle):
+            if row.get("kind", "freq") not in ("freq", "") or not row.get("freq"):
+                continue
+            t = _time(row["time"])
+            if (start is not None and t < start) or (end is not None and t >= end):
+                continue
+            times.append(t)
+            rigs.append(1 if row["rig"].strip().upper() == "B" else 0)
+            freqs.append(float(row["freq"]))
+            mode_codes.append(modes.setdefault((row.get("mode") or "").strip().upper(), len(modes)))
+            name = (row.get("station") or station).strip().upper()
+            station_codes.append(stations.setdefault(name, len(stations)))
+    order = np.argsort(np.array(times, np.float64), kind="stable")
+    return Trace(
+        t=np.array(times, np.float64)[order],
+        rig=np.array(rigs, np.int8)[order],
+        freq=np.array(freqs, np.float64)[order],
+        mode=np.array(mode_codes, np.int32)[order],
+        station=np.array(station_codes, np.int32)[order],
+        modes=list(modes),
+        stations=list(stations),
+    )
+
+
+def _rank(rule: AntennaRule) -> int:
+    # Lookup order of RuleIndex.lookup: mode and station, mode, station, plain.
+    if rule.mode:
+        return 0 if rule.station_name else 1
+    return 2 if rule.station_name else 3
+
+
+def lookup(rules: list[AntennaRule], trace: Trace) -> np.ndarray:
+    """Position in `rules` of the rule RuleIndex.lookup returns for each sample; -1 for none."""
+    result = np.full(len(trace), -1, np.int32)
+    groups: dict[tuple[Rig, str | None, str | None], list[AntennaRule]] = {}
+    for rule in rules:
+        groups.setdefault((rule.rig, rule.mode, rule.station_name), []).append(rule)
+    for key, group in sorted(groups.items(), key=lambda item: _rank(item[1][0])):
+        rig, mode, station = key
+        mask = (trace.rig == RIGS.index(rig)) & (result < 0)
+        if mode is not None:
+            mask &= trace.mode == (trace.modes.index(mode) if mode in trace.modes else -1)
+        if station is not None:
+            mask &= trace.station == (trace.stations.index(station) if station in trace.stations else -1)
+        positions = np.flatnonzero(mask)
+        if not len(positions):
+            continue
+        # Same bisect as _Segments.find: the last rule starting at or below the frequency, if it reaches it.
+        group = sorted(group, key=lambda rule: rule.min_freq)
+        starts = np.array([rule.min_freq for rule in group], np.float64)
+        ends = np.array([rule.max_freq for rule in group], np.float64)
+        ids = np.array([rule.position for rule in group], np.int32)
+        freq = trace.freq[positions]
+        slot = np.searchsorted(starts, freq, side="right") - 1
+        clipped = np.maximum(slot, 0)
+        hit = (slot >= 0) & (freq < ends[clipped])
+        result[positions[hit]] = ids[clipped[hit]]
+    return result
+
+
+def change_points(trace: Trace, rule_ids: np.ndarray, rules: list[AntennaRule], hysteresis_khz: float) -> np.ndarray:
+    """Samples where a rig's rule, or its side of a hysteresis edge, differs from the rig's previous sample.
+
+    SwitchPolicy only looks at the frequency to test it against the active
+    rule's range widened by the hysteresis, so in between these samples
+    every frame evaluates like the one before it.
+    """
+    kept = []
+    for code, rig in enumerate(RIGS):
+        positions = np.flatnonzero(trace.rig == code)
+        if not len(positions):
+            continue
+        ids = rule_ids[positions]
+        changed = np.ones(len(positions), bool)
+        np.not_equal(ids[1:], ids[:-1], out=changed[1:])
+        if hysteresis_khz > 0:
+            edges = np.unique(
+                [
+                    edge
+                    for rule in rules
+                    if rule.rig == rig
+                    for edge in (rule.min_freq - hysteresis_khz, rule.max_freq + hysteresis_khz)
+                ]
+            )
+            side = np.searchsorted(edges, trace.freq[positions], side="right")
+            changed[1:] |= side[1:] != side[:-1]
+        kept.append(positions[changed])
+    return np.sort(np.concatenate(kept)) if kept else np.empty(0, np.intp)
+
+
+def predict(
+    trace: Trace, rule_ids: np.ndarray, rules: list[AntennaRule], config: SwitchPolicyConfig
+) -> tuple[Prediction, int]:
+    """Replay the change points through SwitchPolicy the way AutoSwitch.handle_radio_info does.
+
+    Settle and rate-limit rechecks fire on a simulated clock, as the
+    AutoSwitch timers would. After a command, the other rig is evaluated
+    again at its next sample, since its secondary choice may have changed.
+    Returns the prediction and the number of change points.
+    """
+    events = change_points(trace, rule_ids, rules, config.hysteresis_khz)
+    times = trace.t * 1000.0
+    rig_samples = [(samples, times[samples]) for samples in (np.flatnonzero(trace.rig == code) for code in (0, 1))]
+    by_position = {rule.position: rule for rule in rules}
+    now = 0.0
+    policy = SwitchPolicy(config, clock=lambda: now)
+    prediction = Prediction(commands={rig: 0 for rig in RIGS}, stats=policy.stats)
+    current: dict[Rig, int | None] = {rig: None for rig in RIGS}
+    last_sample: dict[Rig, int] = {}
+    timers: dict[Rig, int] = {}  # rig -> sequence number of its pending recheck; a restart supersedes it
+    wakeups: list[tuple[float, int, int, int]] = []  # (time ms, sequence, rig code, sample or -1 for a recheck)
+    sequence = 0
+
+    def schedule(code: int, at: float, sample: int) -> None:
+        nonlocal sequence
+        sequence += 1
+        if sample < 0:
+            timers[RIGS[code]] = sequence
+        heapq.heappush(wakeups, (at, sequence, code, sample))
+
+    def evaluate(rig: Rig, sample: int) -> None:
+        last_sample[rig] = sample
+        rule_id = int(rule_ids[sample])
+        decision = policy.evaluate(rig, float(trace.freq[sample]), by_position[rule_id] if rule_id >= 0 else None)
+        if decision.recheck_ms:
+            schedule(RIGS.index(rig), now + decision.recheck_ms, -1)
+        rule = decision.rule
+        if rule is None:
+            return
+        other = RIGS[1 - RIGS.index(rig)]
+        selected = rule.secondary if current[other] == rule.primary else rule.primary
+        if current[rig] == selected:
+            return
+        wait_ms = policy.acquire(rig)
+        if wait_ms:
+            schedule(RIGS.index(rig), now + wait_ms, -1)
+            return
+        current[rig] = selected
+        prediction.commands[rig] += 1
+        prediction.secondary += selected != rule.primary
+        prediction.shared += selected != 0 and selected == current[other]
+        samples, sample_times = rig_samples[RIGS.index(other)]
+        following = int(np.searchsorted(sample_times, now, side="right"))
+        if following < len(samples):
+            schedule(RIGS.index(other), float(sample_times[following]), int(samples[following]))
+
+    event_list = events.tolist()
+    event_times = times[events].tolist()
+    index = 0
+    while index < len(event_list) or wakeups:
+        if wakeups and (index == len(event_list) or wakeups[0][0] < event_times[index]):
+            now, number, code, sample = heapq.heappop(wakeups)
+            rig = RIGS[code]
+            if sample < 0:
+                if timers.get(rig) != number:
+                    continue
+                del timers[rig]
+                sample = last_sample[rig]
+        else:
+            sample = event_list[index]
+            now = event_times[index]
+            rig = RIGS[int(trace.rig[sample])]
+            index += 1
+        evaluate(rig, sample)
+    return prediction, len(event_list)
+
+
+def find_gaps(
+    rules: list[AntennaRule], rig: Rig, bands: list[tuple[int, int]]
+) -> list[tuple[int, int, list[AntennaRule]]]:
+    """Ranges of the bands no plain rule of `rig` covers, with the mode/station rules that reach into them."""
+    plain = sorted((rule.min_freq, rule.max_freq) for rule in rules if rule.rig == rig and _rank(rule) == 3)
+    specific = [rule for rule in rules if rule.rig == rig and _rank(rule) < 3]
+    gaps = []
+    for low, high in bands:
+        cursor = low
+        for start, end in plain:
+            if end <= cursor:
+                continue
+            if start >= high:
+                break
+            if start > cursor:
+                gaps.append((cursor, start))
+            cursor = max(cursor, end)
+        if cursor < high:
+            gaps.append((cursor, high))
+    return [
+        (start, end, [rule for rule in specific if rule.min_freq < end and start < rule.max_freq])
+        for start, end in gaps
+    ]
+
+
+def find_overlaps(rules: list[AntennaRule]) -> list[tuple[AntennaRule, AntennaRule, int, int, bool]]:
+    """`(winner, other, start, end, conflict)`; a conflict is an overlap within one rig/mode/station group."""
+    overlaps = []
+    for index, first in enumerate(rules):
+        for second in rules[index + 1 :]:
+            start, end = max(first.min_freq, second.min_freq), min(first.max_freq, second.max_freq)
+            if first.rig != second.rig or start >= end:
+                continue
+            if (first.mode, first.station_name) == (second.mode, second.station_name):
+                overlaps.append((first, second, start, end, True))
+                continue
+            if first.mode and second.mode and first.mode != second.mode:
+                continue  # never apply to the same frame
+            if first.station_name and second.station_name and first.station_name != second.station_name:
+                continue
+            winner, other = (first, second) if _rank(first) < _rank(second) else (second, first)
+            overlaps.append((winner, other, start, end, False))
+    return overlaps
+
+
+def _name(rule: AntennaRule) -> str:
+    return f"[{rule.position}] {rule.describe()} -> {rule.primary}/{rule.secondary}"
+
+
+def _local(t: float) -> str:
+    return datetime.fromtimestamp(t).isoformat(timespec="seconds")
+
+
+def report_rules(rules: list[AntennaRule], bands: list[tuple[int, int]]) -> int:
+    conflicts = 0
+    for rig in RIGS:
+        gaps = find_gaps(rules, rig, bands)
+        print(f"Rig {rig.value} gaps:" + ("" if gaps else " none"))
+        for start, end, partial in gaps:
+            print(f"  {start}-{end} kHz")
+            for rule in partial:
+                print(f"    only for {_name(rule)}")
+    overlaps = find_overlaps(rules)
+    print("Overlaps:" + ("" if overlaps else " none"))
+    for winner, other, start, end, conflict in overlaps:
+        if conflict:
+            conflicts += 1
+            print(f"  {start}-{end} kHz: {_name(winner)} and {_name(other)} conflict; the app rejects these rules")
+        else:
+            print(f"  {start}-{end} kHz: {_name(winner)} takes precedence over {_name(other)}")
+    return conflicts
+
+
+def report_trace(trace: Trace, rules: list[AntennaRule], config: SwitchPolicyConfig, source: str) -> None:
+    print(f"\nTrace {source}: {len(trace)} samples", end="")
+    if not len(trace):
+        print()
+        return
+    print(f", {_local(trace.t[0])} to {_local(trace.t[-1])}")
+    started = time.perf_counter()
+    rule_ids = lookup(rules, trace)
+    lookup_s = time.perf_counter() - started
+    hits = np.bincount(rule_ids[rule_ids >= 0], minlength=len(rules))
+    for code, rig in enumerate(RIGS):
+        on_rig = trace.rig == code
+        samples = int(on_rig.sum())
+        if not samples:
+            continue
+        missed = trace.freq[on_rig & (rule_ids < 0)]
+        print(f"  rig {rig.value}: {samples} samples, {len(missed)} in no rule ({len(missed) / samples:.1%})")
+        if len(missed):
+            values, counts = np.unique(missed.astype(np.int64), return_counts=True)
+            top = np.argsort(-counts, kind="stable")[:5]
+            print("    most often: " + ", ".join(f"{values[i]} kHz ({counts[i]})" for i in top))
+    for rule in rules:
+        print(f"  {_name(rule)}: {hits[rule.position]} samples")
+
+    started = time.perf_counter()
+    columns = [
+        ("policy off", *predict(trace, rule_ids, rules, SwitchPolicyConfig())),
+        (
+            f"hysteresis {config.hysteresis_khz:g} kHz, settle {config.settle_ms} ms, "
+            f"{config.max_commands_per_minute or 'unlimited'}/min",
+            *predict(trace, rule_ids, rules, config),
+        ),
+    ]
+    predict_s = time.perf_counter() - started
+    print("\nPredicted commands:")
+    for label, prediction, _ in columns:
+        stats = prediction.stats
+        commands = ", ".join(f"rig {rig.value} {count}" for rig, count in prediction.commands.items())
+        print(f"  {label}: {commands}")
+        print(
+            f"    secondary antenna {prediction.secondary}, same antenna as the other rig {prediction.shared}, "
+            f"held by hysteresis {stats.held_by_hysteresis}, by settle time {stats.held_by_settle}, "
+            f"rate-limited {stats.rate_limited}"
+        )
+    print(
+        f"\nLookup {lookup_s * 1000:.0f} ms, prediction {predict_s * 1000:.0f} ms "
+        f"({columns[0][2]} and {columns[1][2]} change points)"
+    )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--config", type=Path, default=UI_DIR / "config.json", help="config with the rules")
+    parser.add_argument(
+        "--band", action="append", type=_band, help="range to check for gaps, kHz `min-max` (default 160-6 m)"
+    )
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument("--journal", type=Path, help="event journal directory to take the frequencies from")
+    source.add_argument("--trace", type=Path, help="CSV with time, rig, freq (kHz) and optional mode, station")
+    parser.add_argument("--from", dest="start", type=_time, help="first time (ISO local time or epoch seconds)")
+    parser.add_argument("--to", dest="end", type=_time, help="end time, exclusive")
+    parser.add_argument("--station", default="", help="N1MM station name of the samples without one")
+    parser.add_argument("--hysteresis", type=float, help="override autoSwitch.hysteresisKhz")
+    parser.add_argument("--settle-ms", type=int, help="override autoSwitch.settleMs")
+    parser.add_argument("--max-per-minute", type=int, help="override autoSwitch.maxCommandsPerMinute")
+    args = parser.parse_args()
+
+    if np is None:
+        print("rule_coverage.py needs NumPy: pip install numpy", file=sys.stderr)
+        return 1
+    settings = load_settings(args.config)
+    try:
+        rules = parse_rules(settings.auto_rules)
+    except RuleError as exc:
+        print(exc, file=sys.stderr)
+        return 1
+    print(f"{len(rules)} rules from {args.config}")
+    conflicts = report_rules(rules, args.band or list(DEFAULT_BANDS))
+
+    if args.journal or args.trace:
+        config = SwitchPolicyConfig(
+            hysteresis_khz=settings.auto_hysteresis_khz if args.hysteresis is None else args.hysteresis,
+            settle_ms=settings.auto_settle_ms if args.settle_ms is None else args.settle_ms,
+            max_commands_per_minute=(
+                settings.auto_max_commands_per_minute if args.max_per_minute is None else args.max_per_minute
+            ),
+            command_burst=settings.auto_command_burst,
+        )
+        if args.journal:
+            if not args.journal.is_dir():
+                print(f"no journal directory {args.journal}", file=sys.stderr)
+                return 1
+            trace = load_journal(args.journal, args.start, args.end, args.station)
+        else:
+            trace = load_csv(args.trace, args.start, args.end, args.station)
+        report_trace(trace, rules, config, str(args.journal or args.trace))
+    return 1 if conflicts else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,72 @@
+"""Splits traced antenna switches into Python-side time and bridge round trip.
+
+Usage: python tools/trace_summary.py logs/trace.json
+
+Reads a trace written with `tracing.file` and, for every event that ended in
+a confirmed command, reports the time from datagram to WebSocket send (Python
+side), the bridge round trip (bridge, LoRa link, relays) and the total.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+from collections import defaultdict
+from pathlib import Path
+
+
+def _percentiles(values: list[float]) -> str:
+    ordered = sorted(values)
+    p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+    return f"p50={statistics.median(ordered):8.2f} ms  p95={p95:8.2f} ms  max={ordered[-1]:8.2f} ms"
+
+
+def summarize(trace: dict) -> dict[str, list[float]]:
+    begins: dict[tuple[str, int], int] = {}
+    spans: dict[str, dict[int, float]] = defaultdict(dict)
+    first_ts: dict[int, int] = {}
+    send_end: dict[int, int] = {}
+    for entry in trace.get("traceEvents", []):
+        phase = entry.get("ph")
+        if phase == "b":
+            begins[(entry["name"], entry["id"])] = entry["ts"]
+        elif phase == "e":
+            start = begins.pop((entry["name"], entry["id"]), None)
+            if start is not None:
+                spans[entry["name"]][entry["id"]] = (entry["ts"] - start) / 1000
+        elif phase == "X":
+            event = entry.get("args", {}).get("event")
+            if not event:
+                continue
+            first_ts[event] = min(first_ts.get(event, entry["ts"]), entry["ts"])
+            if entry["name"] == "ws send" and event not in send_end:
+                send_end[event] = entry["ts"] + entry["dur"]
+
+    result: dict[str, list[float]] = {"python": [], "bridge round trip": [], "total": []}
+    for event, total in spans["switch"].items():
+        if event in send_end:
+            result["python"].append((send_end[event] - first_ts[event]) / 1000)
+        if event in spans["bridge round trip"]:
+            result["bridge round trip"].append(spans["bridge round trip"][event])
+        result["total"].append(total)
+    return result
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("trace", type=Path)
+    args = parser.parse_args()
+
+    result = summarize(json.loads(args.trace.read_text(encoding="utf-8")))
+    if not result["total"]:
+        print("no confirmed switches in trace")
+        return 1
+    print(f"{len(result['total'])} confirmed switches")
+    for name, values in result.items():
+        if values:
+            print(f"  {name:<18} {_percentiles(values)}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())